@@ -1,269 +1,33 @@
-import sys
-from timeit import default_timer as timer
+from maze_solver import solve
+from maze_solver.render import display_maze, display_path, render_text
 
-class Node:
+def main()->None:
     """
-    This is a class designed to hold the data for each of the nodes in the graph
-
-    Atributes:
-        self.x_coord - x coordinate of the node
-        self.y_coord - y coordinate of the node
-        self.neighbours - a list of node objects
-        self.visited - holds whether or not the node has been visited
-    """
-
-    def __init__(self, x_coord:int, y_coord:int):
-        """
-        Method used to initialise a node
-
-        Parameters:
-            self - the current node
-            x_coord - the x_coordinate of the node to add to neighbours
-            y_coord - the y_coordinate of the node to add to neighbours
-
-        Returns:
-            No return values
-        """
-        self.x_coord = x_coord
-        self.y_coord = y_coord
-        self.neighbours = []
-        self.visited = False
-
-    def add_neighbour(self, other)->None:
-        """
-        Method used to add a node to the neighbours
+        Method used to ask for a maze file and solve it using dfs
 
         Parameters:
-            self - the current node
-            other - the node to be added to neighbours of the current node
+            No parameters
 
         Returns:
             No return values
-        """
-        if not self.is_neighbour(other):
-            self.neighbours.append(other)
-
-    def is_neighbour(self, other)->bool:
-        """
-        Method used to check if a given node is a neighbour of a current node
-
-        Parameters:
-            self - the current node
-            other - the node we wish to check for in neighbours
-
-        Returns:
-            Whether or not a node is a neighbour of the node
-        """
-        for node in self.neighbours:
-            if node.x_coord == other.x_coord and node.y_coord == other.y_coord:
-                return True
-        return False
-
-    def is_visited(self)->bool:
-        """
-        Method used to check if a current node has been visited
-
-        Parameters:
-            self - the current node
-
-        Returns:
-            Whether or not the current node has been visited
-        """
-        return self.visited
-
-class Graph:
     """
-    This is a class designed to hold the graph for the maze
-
-    Atributes:
-        self.nodes - a dictionary linking a tuple containing x, y coordinates to the node for the given x, y position
-    """
-    
-    def __init__(self):
-        """
-        Method used to initialise a graph
-
-        Parameters:
-            self - the current node
-
-        Returns:
-            No return values
-        """
-        self.nodes = {}
-
-    def add_new_node(self, coords:tuple)->Node:
-        """
-        Method used tp create and add a new node to the graph
-
-        Parameters:
-            self - the current node
-            coords - a tuple containing the x, y coordinates of the node
-
-        Returns:
-            The node added to the graph
-        """
-        node = Node(coords[0], coords[1])
-        self.nodes[coords] = node
-        return node
-
-    def get_node(self, coords:tuple)->Node:
-        """
-        Method used to returns the instance of node with given coordinates
-
-        Parameters:
-            self - the current node
-            coords - a tuple containing the x, y coordinates of the node
-
-        Returns:
-            The node for the given coordinates
-        """
-        return self.nodes[coords]
-
-file_name = input("Enter the file name of the maze you wish to solve: ")
-try:
-    #open a file and read the maze into a 2D array
-    with open(file_name, "r") as maze_file:
-        maze_matrix = []        #stores the maze as a 2D array
-        lines = maze_file.readlines()
-        for line in lines:
-            if not line.find("#"):      #removes any lines that contain just newlines
-                maze_matrix.append(line.rstrip("\n").rstrip(" ").split(" "))        #generates the 2D array
-
-    #used to increase the recursion limit to the prevent program from being incorrectly terminated by maximum recursion depth exceeded error
-    sys.setrecursionlimit(len(maze_matrix) * len(maze_matrix[0]))
-
-
-    maze_graph = Graph()
-    display_matrix = []
-    for line in maze_matrix:
-        display_matrix.append(line.copy())
-except:
-    print("The maze file entered was not valid")
-    quit()
-
-def create_graph(maze_matrix:list)->None:
-    """
-        Method used to fill a graph object with nodes
-        Parameters:
-            maze_matrix - represents the maze as a 2D array
-
-        Returns:
-            No return values
-    """
-    maze_width = len(maze_matrix[0])
-    maze_height = len(maze_matrix)
-
-    for y in range(maze_width):
-        if maze_matrix[0][y] == '-':
-            display_matrix[0][y] = "S"
-            start_node = maze_graph.add_new_node((0,y))
-            
-    for x in range(1, maze_height-1):
-        for y in range(1,maze_width-1):
-            if maze_matrix[x][y] == '-':
-                maze_graph.add_new_node((x,y))
-
-    for y in range(maze_width):
-        if maze_matrix[maze_height-1][y] == '-':
-            display_matrix[maze_height-1][y] = "E"
-            end_node = maze_graph.add_new_node((maze_height-1,y))
-    
-    for node in maze_graph.nodes.values():
-        add_neighbours(node)
-
-    return start_node, end_node
-
-def add_neighbours(node:Node)->None:
-    """
-        Method used to find and add the neighours for the given node to the graph
-
-        Parameters:
-            node - the current node
-
-        Returns:
-            No return values
-    """
-    try:
-        node.add_neighbour(maze_graph.get_node((node.x_coord-1, node.y_coord)))
-    except:
-        pass
+    file_name = input("Enter the file name of the maze you wish to solve: ")
     try:
-        node.add_neighbour(maze_graph.get_node((node.x_coord+1, node.y_coord)))
-    except:
-        pass
-    try:
-        node.add_neighbour(maze_graph.get_node((node.x_coord, node.y_coord-1)))
-    except:
-        pass
-    try:
-        node.add_neighbour(maze_graph.get_node((node.x_coord, node.y_coord+1)))
-    except:
-        pass
-
-def display_maze(maze:list)->None:
-    """
-        Method used to display a maze
-
-        Parameters:
-            maze - 2D array representing the maze to be displayed
-
-        Returns:
-            No return values
-    """
-    for line in maze:
-        print(" ".join(line))
-
-def dfs_travesal(current_node:Node, goal_node:Node, nodes_explored:int)->list:
-    """
-        Method used to run dfs on the maze from the current node
-
-        Parameters:
-            current_node - the node the algorithm is currently at
-            goal_node - the goal node of the dfs algorithm
-            nodes_explored - the number of nodes explored by the algorithm
-
-        Returns:
-            The path of previous nodes
-            nodes_explored - the number of nodes explored by the algorithm
-    """
-    #caluclating the total number of nodes explored
-    nodes_explored += 1
-    #setting current node as visited
-    current_node.visited = True
-    #checking if current node is the goal node and returning itself as path if it is
-    if current_node == goal_node:
-        return [current_node], nodes_explored
-    else:
-        #visit neighbours in order
-        for neighbour in current_node.neighbours:
-            if not neighbour.is_visited():
-                dfs_path, nodes_explored = dfs_travesal(neighbour, goal_node, nodes_explored)
-                if dfs_path != []:   
-                    return [current_node] + dfs_path, nodes_explored
-        return [], nodes_explored
-
-start = timer()
-start_node, end_node = create_graph(maze_matrix)
-path, nodes_explored = dfs_travesal(start_node, end_node, 0)
-end = timer()
-
-#To show path highlighted in green and visited nodes in red
-for node in maze_graph.nodes.values():
-    if node.is_visited():
-        display_matrix[node.x_coord][node.y_coord] = "\033[1;91m-\033[0m"
-display_matrix[path[0].x_coord][path[0].y_coord] = "\033[1;32mS\033[0m"
-for node in path[1:-1]:
-    display_matrix[node.x_coord][node.y_coord] = "\033[1;32mP\033[0m"
-display_matrix[path[-1].x_coord][path[-1].y_coord] = "\033[1;32mE\033[0m"
-    
-display_maze(display_matrix)
-print("\n==========================\n")
-print("Node (%d, %d)" %(start_node.x_coord, start_node.y_coord), end="->")
-#Displaying the path
-for node in path[1:-1]:
-    print("Node (%d, %d)" %(node.x_coord, node.y_coord), end="->")
-print("Node (%d, %d)" %(end_node.x_coord, end_node.y_coord))
-print("\n==========================\n")
-print("Nodes explored: %d " %nodes_explored)
-print("Time of execution: %f" %(end-start))
-print("Path length: %d" %len(path))
+        result = solve(file_name, algorithm="dfs")
+    except (OSError, ValueError):
+        print("The maze file entered was not valid")
+        return
+
+    #To show path highlighted in green and visited nodes in red
+    display_maze(render_text(result.grid, result.path, result.visited()))
+    print("\n==========================\n")
+    #Displaying the path
+    display_path(result.grid, result.path)
+    print("\n==========================\n")
+    print("Nodes explored: %d " %result.nodes_explored)
+    print("Time of search: %f" %result.timings["search"])
+    print("Path length: %d" %len(result.path))
+    print("Memory usage: %d bytes" %result.memory_usage())
+
+if __name__ == "__main__":
+    main()
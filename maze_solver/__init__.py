@@ -0,0 +1,51 @@
+"""
+Package for solving mazes stored as rows of space separated # and - characters, with digits for open cells
+that cost more than 1 to step onto
+
+Usage:
+    from maze_solver import MazeQueries, solve
+    result = solve("maze-Large.txt", algorithm="astar", heuristic="manhattan")
+    paths = MazeQueries("maze-Large.txt").query_many([((1, 1), (10, 10)), ((5, 5), (21, 1))])
+
+    python -m maze_solver maze-Large.txt --algorithm dfs --no-render
+    python -m maze_solver maze-VLarge.txt --heuristic alt --no-render
+    python -m maze_solver maze-VLarge.txt --algorithm bfs --no-render
+    python -m maze_solver weighted-maze.txt --algorithm cost-astar --no-render
+    python -m maze_solver maze-Large.txt --heuristic alt --query 1,1:10,10 --query 5,5:21,1
+    python -m maze_solver maze-VLarge.txt --no-render --image solved.png --scale 2 --path-file path.txt
+    python -m maze_solver maze-Large.txt --all-openings --no-render
+    python -m maze_solver maze-Large.txt --all-pairs --format json
+    python -m maze_solver maze-VLarge.txt --check-reachable --workers 0 --no-render
+    python -m maze_solver maze-Large.txt --toggle 5,9 --toggle 12,3 --no-render
+    python -m maze_solver huge-maze.txt --packed-file huge-maze.bits --no-render
+    python -m maze_solver maze-VLarge.txt --no-render --profile vlarge --profiler sample
+    python -m maze_solver.profiling easy.json large.json vlarge.json
+    python -m maze_solver.batch mazes/ "more/*.txt" --workers 8 > results.jsonl
+    python -m maze_solver.service --port 8765 --workers 4
+    python -m maze_solver.loadtest maze-Large.txt maze-VLarge.txt --spawn 2 --requests 500
+    python -m maze_solver.generate maze-10k.txt 10001 --algorithm kruskal --loops 0.2 --seed 7
+    python -m maze_solver.generate maze-100k.txt 100001 2001 --algorithm eller --seed 7
+    python -m maze_solver.benchmark --repeat 10 --output bench.json --compare previous.json
+    python -m maze_solver.benchmark --replan maze-Large.txt maze-VLarge.txt --edits 20
+    python -m maze_solver.benchmark --native maze-Large.txt maze-VLarge.txt --repeat 5
+    python -m maze_solver.benchmark --open-set maze-Large.txt maze-VLarge.txt --repeat 5
+    python -m maze_solver.benchmark --rss maze-VLarge.txt huge-maze.txt --rss-algorithm astar
+"""
+from .grid import Grid, QueryState, SearchState, load_maze, parse_maze
+from .dfs import dfs_search
+from .bfs import bfs_search
+from .dijkstra import dijkstra_search
+from .a_star import A_star_search, HEURISTICS
+from .bidirectional import bidirectional_A_star_search, bidirectional_bfs_search
+from .jps import jump_point_search
+from .contract import JunctionGraph, contracted_search
+from .metrics import SearchMetrics
+from .open_set import BucketOpenSet, HeapOpenSet
+from .landmarks import LandmarkIndex
+from .components import Components, label_components
+from .multi import all_pairs_paths, multi_source_search
+from .replan import DStarLite
+from .packed import PackedGrid, load_packed
+from .cache import MazeCache
+from .query import MazeQueries, QUERY_ALGORITHMS
+from .solver import ALGORITHMS, SolveResult, solve
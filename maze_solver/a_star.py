@@ -0,0 +1,131 @@
+from math import sqrt
+from .grid import Grid, SearchState
+from .landmarks import landmark_index
+from .metrics import SearchMetrics
+from .open_set import HeapOpenSet
+
+#the heuristics that can be used by the A* search, alt uses the landmark index of the grid
+HEURISTICS = ("manhattan", "euclidean", "alt")
+
+def A_star_search(grid:Grid, start_cell:int, goal_cell:int, heuristic_choice:str, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run the A* search algorithm
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            heuristic_choice - the heuristic to use (manhattan/euclidean/alt)
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state holding the g values, parents and visited cells
+    """
+    nodes_explored, state = A_star_explore(grid, start_cell, goal_cell, heuristic_choice, metrics)
+    if not state.visited[goal_cell]:
+        return [], nodes_explored, state
+    return state.path_to(goal_cell), nodes_explored, state
+
+def A_star_explore(grid:Grid, start_cell:int, goal_cell:int, heuristic_choice:str, metrics:SearchMetrics=None, state=None, open_set=None)->tuple:
+    """
+        Method used to run the A* search algorithm without building the path
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            heuristic_choice - the heuristic to use (manhattan/euclidean/alt)
+            metrics - the metrics the work of the search is added to, None to skip counting
+            state - the SearchState or QueryState to search on, it is reset first, a new SearchState if None
+            open_set - the open set to reuse, it is cleared first, a new one is made if None
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the goal cell is visited in its generation if a path was found
+    """
+    heuristic_choice = heuristic_choice.lower()
+    if state is None:
+        state = SearchState(grid.size)
+    generation = state.reset()
+    #the g values are stored with base added, so the values left by an older search on a QueryState read as unreached
+    base = state.base
+    g_values = state.g
+    parent = state.parent
+    visited = state.visited
+    goal_x, goal_y = grid.coords(goal_cell)
+    g_values[start_cell] = base
+    parent[start_cell] = -1
+    if open_set is None:
+        #the bucket queue only takes whole number keys and is no faster than the heap when A* is replayed on both
+        open_set = HeapOpenSet(grid.size)
+    else:
+        open_set.clear()
+    push = open_set.push
+    pop = open_set.pop
+    push(start_cell, 0, 0)
+    nodes_explored = 0
+    reparents = 0
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+    #stale entries left behind by lowered keys are skipped inside the open set, which gives -1 once it is empty
+    current_cell = pop()
+    while current_cell != -1:
+        #calculating the total nodes explored and setting current cell as visited
+        nodes_explored += 1
+        visited[current_cell] = generation
+        if metrics is not None:
+            metrics.expanded(current_cell, g_values[current_cell] - base, len(open_set) + 1)
+        if current_cell == goal_cell:
+            break
+        #checking all unvisited neighbours and updating their g values, which are compared with base still added
+        new_g = g_values[current_cell] + 1
+        for neighbour in grid.neighbours(current_cell):
+            if visited[neighbour] == generation:
+                continue
+            neighbour_g = g_values[neighbour]
+            if neighbour_g >= base:
+                if new_g >= neighbour_g:
+                    continue
+                reparents += 1
+            #adding the neighbour to the open set, or lowering its key if it is already there
+            g_values[neighbour] = new_g
+            parent[neighbour] = current_cell
+            new_h = calculate_heuristic(grid, neighbour, goal_x, goal_y, heuristic_choice)
+            new_f = new_g - base + new_h
+            push(neighbour, new_f, new_h)
+            if on_enqueue is not None:
+                on_enqueue(neighbour, new_f)
+        current_cell = pop()
+    if metrics is not None:
+        stale = open_set.stale
+        metrics.record(nodes_explored, nodes_explored + stale + open_set.entries(), nodes_explored + stale, stale, reparents)
+    return nodes_explored, state
+
+def calculate_heuristic(grid:Grid, cell:int, goal_x:int, goal_y:int, heuristic_choice:str):
+    """
+        Method used to caluclate the heuristic for a given cell
+
+        Parameters:
+            grid - the grid of the maze
+            cell - the current cell
+            goal_x - the row of the goal cell
+            goal_y - the column of the goal cell
+            heuristic_choice - the lower case name of the heuristic to use
+
+        Returns:
+            The h value of the cell
+    """
+    x, y = grid.coords(cell)
+    if heuristic_choice == "manhattan":
+        #calculating the manhattan distance
+        return abs(x - goal_x) + abs(y - goal_y)
+    
+    elif heuristic_choice == "euclidean":
+        #calculating the euclidean distance
+        return sqrt((x - goal_x)**2 + (y - goal_y)**2)
+
+    elif heuristic_choice == "alt":
+        #calculating the landmark lower bound, the index is built the first time it is used
+        landmarks = grid.landmarks if grid.landmarks is not None else landmark_index(grid)
+        return landmarks.estimate(cell, goal_x * grid.width + goal_y)
@@ -0,0 +1,124 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from timeit import default_timer as timer
+from .a_star import HEURISTICS
+from .solver import ALGORITHMS, solve
+
+def find_maze_files(patterns:list)->list:
+    """
+        Method used to find the maze files to solve
+
+        Parameters:
+            patterns - a list of directories, file names or glob patterns
+
+        Returns:
+            The sorted list of maze file names, with directories expanded to the .txt files inside them
+    """
+    file_names = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            file_names.update(glob.glob(os.path.join(pattern, "*.txt")))
+        else:
+            file_names.update(glob.glob(pattern))
+    return sorted(file_names)
+
+def solve_file(file_name:str, algorithm:str, heuristic:str)->dict:
+    """
+        Method used to solve a single maze file inside a worker process
+
+        Parameters:
+            file_name - the file name of the maze
+            algorithm - the search algorithm to use
+            heuristic - the heuristic used by the A* search
+
+        Returns:
+            A dictionary holding the summary of the solve, or the error if the maze was not valid
+    """
+    try:
+        result = solve(file_name, algorithm=algorithm, heuristic=heuristic)
+    except (OSError, ValueError) as error:
+        return {"file": file_name, "error": str(error)}
+    summary = {
+        "file": file_name,
+        "found": result.found(),
+        "path_length": len(result.path),
+        "nodes_explored": result.nodes_explored,
+        "parse_time": result.timings["parse"],
+        "search_time": result.timings["search"],
+    }
+    summary.update(result.stats)
+    return summary
+
+def run_batch(file_names:list, algorithm:str="astar", heuristic:str="manhattan", workers:int=None, output=None)->dict:
+    """
+        Method used to solve many maze files across a pool of worker processes
+
+        Each result is written to the output as a line of JSON as soon as its maze is solved
+
+        Parameters:
+            file_names - the list of maze file names to solve
+            algorithm - the search algorithm to use
+            heuristic - the heuristic used by the A* search
+            workers - the number of worker processes, the number of cores if None
+            output - the file the JSON lines are written to, standard output if None
+
+        Returns:
+            A dictionary holding the number of mazes solved, failed, the seconds taken and the mazes per second
+    """
+    if output is None:
+        output = sys.stdout
+    workers = workers or os.cpu_count() or 1
+    solved = 0
+    failed = 0
+    start = timer()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(solve_file, file_name, algorithm, heuristic) for file_name in file_names]
+        for future in as_completed(futures):
+            result = future.result()
+            if "error" in result:
+                failed += 1
+            else:
+                solved += 1
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    seconds = timer() - start
+    return {
+        "mazes": solved,
+        "failed": failed,
+        "workers": workers,
+        "seconds": seconds,
+        "mazes_per_second": (solved + failed) / seconds if seconds > 0 else 0.0,
+    }
+
+def main(argv:list=None)->int:
+    """
+        Method used to run the batch solver from the command line
+
+        Parameters:
+            argv - the command line arguments, the arguments of the process are used if None
+
+        Returns:
+            The exit status, 0 if every maze was valid and 1 otherwise
+    """
+    parser = argparse.ArgumentParser(prog="maze_solver.batch", description="Solve many maze files in parallel and write the results as JSON lines.")
+    parser.add_argument("mazes", nargs="+", help="directories, file names or glob patterns of the mazes to solve")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="astar", help="the search algorithm to use (default: astar)")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default="manhattan", help="the heuristic used by the A*, jump point, contracted and cost-astar searches (default: manhattan)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="the number of worker processes (default: number of cores)")
+    args = parser.parse_args(argv)
+
+    file_names = find_maze_files(args.mazes)
+    if not file_names:
+        print("No maze files found", file=sys.stderr)
+        return 1
+    summary = run_batch(file_names, args.algorithm, args.heuristic, args.workers)
+    print("Solved %d mazes (%d failed) in %f seconds using %d workers: %f mazes/second"
+          %(summary["mazes"], summary["failed"], summary["seconds"], summary["workers"], summary["mazes_per_second"]), file=sys.stderr)
+    return 0 if summary["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,683 @@
+import argparse
+import json
+import os
+import platform
+import queue
+import random
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from heapq import heappush, heappop
+from timeit import default_timer as timer
+from .grid import Grid, load_maze, read_walls
+from .dfs import dfs_explore
+from .bfs import bfs_explore
+from .a_star import A_star_explore, HEURISTICS, calculate_heuristic
+from .contract import JunctionGraph, contracted_search
+from .generate import maze_to_text, recursive_backtracker
+from .landmarks import LandmarkIndex
+from .metrics import SearchMetrics
+from .open_set import BucketOpenSet, HeapOpenSet
+from .native import AVAILABLE, A_star_explore_native, bfs_explore_native, dfs_explore_native, prepare_kernels
+from .packed import load_packed
+from .query import MazeQueries
+from .replan import DStarLite
+from .solver import solve
+
+#the shipped mazes and the solvers that are benchmarked by default
+MAZE_FILES = ("maze-Easy.txt", "maze-Medium.txt", "maze-Large.txt", "maze-VLarge.txt")
+SOLVERS = ("dfs", "astar-manhattan", "astar-euclidean", "astar-alt", "contracted-manhattan", "contracted-euclidean")
+SYNTHETIC_SIZES = (101, 201, 401, 801)
+PHASES = ("parse", "build", "search", "path")
+#the kinds of edits made when comparing repaired paths against full solves
+REPLAN_SCENARIOS = ("path", "random")
+#the solvers that have a compiled kernel, compared against their Python versions
+NATIVE_SOLVERS = ("dfs", "bfs", "astar-manhattan", "astar-euclidean")
+#the open sets compared by replaying the pushes and pops of A*, the bucket queue only takes whole number keys
+OPEN_SETS = ("priority-queue", "heapq", "heap-open-set", "bucket-open-set")
+#the loaders compared by peak resident memory, none only starts the interpreter and imports the package
+LOADERS = ("none", "bytes", "packed")
+
+def run_phases(data:bytes, solver:str)->tuple:
+    """
+        Method used to solve a maze once, timing each phase separately
+
+        The contracted solvers build the junction graph in the build phase and fill in the corridors in the search phase.
+        The alt solvers build the landmark index in the build phase
+
+        Parameters:
+            data - the raw bytes of the maze file
+            solver - the name of the solver, such as dfs, astar-manhattan or contracted-euclidean
+
+        Returns:
+            times - a dictionary linking each phase to the seconds it took
+            path_length - the number of cells in the path
+            nodes_explored - the number of nodes explored by the search
+            extra - a dictionary of solver specific results such as the compression ratio
+    """
+    start = timer()
+    width, height, walls = read_walls(data)
+    parsed = timer()
+    grid = Grid(width, height, walls)
+    extra = {}
+    if solver.startswith("contracted"):
+        graph = JunctionGraph(grid, (grid.start, grid.end))
+        extra["compression_ratio"] = graph.compression_ratio()
+    if solver.endswith("-alt"):
+        grid.landmarks = LandmarkIndex(grid)
+    built = timer()
+    if solver == "dfs":
+        nodes_explored, state = dfs_explore(grid, grid.start, grid.end)
+        searched = timer()
+        path = state.path_to(grid.end) if state.visited[grid.end] else []
+        finished = timer()
+    elif solver.startswith("contracted"):
+        path, nodes_explored, state = contracted_search(graph, grid.start, grid.end, solver.split("-", 1)[1])
+        searched = finished = timer()
+    else:
+        nodes_explored, state = A_star_explore(grid, grid.start, grid.end, solver.split("-", 1)[1])
+        searched = timer()
+        path = state.path_to(grid.end) if state.visited[grid.end] else []
+        finished = timer()
+    times = {
+        "parse": parsed - start,
+        "build": built - parsed,
+        "search": searched - built,
+        "path": finished - searched,
+    }
+    return times, len(path), nodes_explored, extra
+
+def peak_memory(data:bytes, solver:str)->int:
+    """
+        Method used to measure the peak memory allocated while solving a maze
+
+        Parameters:
+            data - the raw bytes of the maze file
+            solver - the name of the solver
+
+        Returns:
+            The peak number of bytes allocated by Python during the solve
+    """
+    tracemalloc.start()
+    try:
+        run_phases(data, solver)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def summarise(samples:list)->dict:
+    """
+        Method used to summarise repeated timings of a phase
+
+        Parameters:
+            samples - the list of timings in seconds
+
+        Returns:
+            A dictionary holding the minimum, median and 95th percentile of the samples
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+    middle = count // 2
+    median = ordered[middle] if count % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    #nearest rank percentile
+    p95 = ordered[max(0, -(-95 * count // 100) - 1)]
+    return {"min": ordered[0], "median": median, "p95": p95}
+
+def benchmark_maze(name:str, data:bytes, solvers:list, repeat:int)->list:
+    """
+        Method used to benchmark every solver on a single maze
+
+        Parameters:
+            name - the name the maze is reported under
+            data - the raw bytes of the maze file
+            solvers - the names of the solvers to benchmark
+            repeat - the number of timed runs of each solver
+
+        Returns:
+            A list of dictionaries holding the results for each solver
+    """
+    results = []
+    for solver in solvers:
+        samples = {phase: [] for phase in PHASES}
+        for _ in range(repeat):
+            times, path_length, nodes_explored, extra = run_phases(data, solver)
+            for phase in PHASES:
+                samples[phase].append(times[phase])
+        totals = [sum(times) for times in zip(*(samples[phase] for phase in PHASES))]
+        width, height, _ = read_walls(data)
+        result = {
+            "maze": name,
+            "width": width,
+            "height": height,
+            "solver": solver,
+            "path_length": path_length,
+            "nodes_explored": nodes_explored,
+            "phases": {phase: summarise(samples[phase]) for phase in PHASES},
+            "total": summarise(totals),
+            "peak_memory": peak_memory(data, solver),
+        }
+        result.update(extra)
+        results.append(result)
+    return results
+
+def contraction_speedups(results:list)->list:
+    """
+        Method used to compare the contracted solvers against A* with the same heuristic on each maze
+
+        Parameters:
+            results - the list of results for a single maze
+
+        Returns:
+            A list of (solver, compression ratio, search speedup, total speedup) tuples
+    """
+    by_solver = {result["solver"]: result for result in results}
+    rows = []
+    for result in results:
+        if not result["solver"].startswith("contracted"):
+            continue
+        baseline = by_solver.get("astar-" + result["solver"].split("-", 1)[1])
+        if baseline is None:
+            continue
+        search = result["phases"]["search"]["median"]
+        total = result["total"]["median"]
+        rows.append((result["solver"], result["compression_ratio"],
+                     baseline["phases"]["search"]["median"] / search if search else float("inf"),
+                     baseline["total"]["median"] / total if total else float("inf")))
+    return rows
+
+def heuristic_comparison(data:bytes, queries:int, seed:int)->list:
+    """
+        Method used to compare the nodes explored by A* with each heuristic over random queries on one maze
+
+        Every heuristic answers the same queries, the landmark index is built once before the alt queries
+
+        Parameters:
+            data - the raw bytes of the maze file
+            queries - the number of random start and goal pairs
+            seed - the seed used to choose the queries
+
+        Returns:
+            A list of dictionaries holding the nodes explored and search times for each heuristic
+    """
+    width, height, walls = read_walls(data)
+    grid = Grid(width, height, walls)
+    rng = random.Random(seed)
+    pairs = []
+    if walls.find(0) != -1:
+        while len(pairs) < queries:
+            start_cell = rng.randrange(grid.size)
+            goal_cell = rng.randrange(grid.size)
+            if not walls[start_cell] and not walls[goal_cell]:
+                pairs.append((start_cell, goal_cell))
+    results = []
+    for heuristic in HEURISTICS:
+        start = timer()
+        solver = MazeQueries(grid, "astar", heuristic)
+        if heuristic == "alt":
+            grid.landmarks = LandmarkIndex(grid)
+        built = timer()
+        explored = []
+        for start_cell, goal_cell in pairs:
+            explored.append(solver.query(start_cell, goal_cell)[1])
+        finished = timer()
+        count = max(len(pairs), 1)
+        results.append({
+            "heuristic": heuristic,
+            "queries": len(pairs),
+            "mean_nodes_explored": sum(explored) / count,
+            "median_nodes_explored": summarise(explored)["median"] if explored else 0,
+            "mean_search": (finished - built) / count,
+            "index": built - start,
+        })
+    return results
+
+def replan_comparison(data:bytes, rounds:int, seed:int, scenario:str="path")->dict:
+    """
+        Method used to compare repairing a path with D* Lite against solving again with A* as the maze is edited
+
+        Each round moves the agent a few cells along its path before editing the maze. In the path scenario the cell
+        closed in the round before is reopened, a cell further along the path is closed and a random wall between two
+        open cells is opened. In the random scenario a few random cells inside the maze are toggled. Both planners see
+        the same edits, and their path lengths are checked against each other after every round
+
+        Parameters:
+            data - the raw bytes of the maze file
+            rounds - the number of rounds of edits
+            seed - the seed used to choose the edits
+            scenario - the kind of edits made (path/random)
+
+        Returns:
+            A dictionary holding the timings and nodes explored of the initial plan, the repairs and the full solves
+    """
+    width, height, walls = read_walls(data)
+    grid = Grid(width, height, walls)
+    reference = Grid(width, height, bytearray(walls))
+    rng = random.Random(seed)
+    start = timer()
+    planner = DStarLite(grid, grid.start, grid.end)
+    path = planner.plan()
+    initial = timer() - start
+    initial_explored = planner.nodes_explored
+    repairs = []
+    solves = []
+    repair_explored = []
+    solve_explored = []
+    mismatches = 0
+    reopen = []
+    #walls inside the maze with open cells on either side, opening one joins two corridors
+    shortcuts = [cell for cell in range(width, grid.size - width)
+                 if walls[cell] and 0 < cell % width < width - 1
+                 and ((not walls[cell - 1] and not walls[cell + 1]) or (not walls[cell - width] and not walls[cell + width]))]
+    for _ in range(rounds):
+        if len(path) > 4:
+            planner.move_to(path[rng.randint(1, 3)])
+        if scenario == "random":
+            cells = {rng.randrange(width + 1, grid.size - width - 1) for _ in range(rng.randint(1, 3))}
+            cells = [cell for cell in cells if 0 < cell % width < width - 1 and cell not in (planner.start, planner.goal)]
+        else:
+            cells = reopen
+            reopen = []
+            if len(path) > 8:
+                reopen.append(path[rng.randint(5, len(path) - 2)])
+                cells.append(reopen[0])
+            if shortcuts:
+                cells.append(shortcuts.pop(rng.randrange(len(shortcuts))))
+        for cell in cells:
+            reference.set_wall(cell, not reference.walls[cell])
+        start = timer()
+        path = planner.update_cells(cells)
+        repairs.append(timer() - start)
+        repair_explored.append(planner.nodes_explored)
+        start = timer()
+        nodes_explored, state = A_star_explore(reference, planner.start, planner.goal, "manhattan")
+        solved = state.path_to(planner.goal) if state.visited[planner.goal] else []
+        solves.append(timer() - start)
+        solve_explored.append(nodes_explored)
+        if len(solved) != len(path):
+            mismatches += 1
+    count = max(len(repairs), 1)
+    repair = summarise(repairs)["median"] if repairs else 0.0
+    full = summarise(solves)["median"] if solves else 0.0
+    return {
+        "scenario": scenario,
+        "rounds": len(repairs),
+        "initial_plan": initial,
+        "initial_nodes_explored": initial_explored,
+        "median_repair": repair,
+        "median_full_solve": full,
+        "mean_repair_nodes_explored": sum(repair_explored) / count,
+        "mean_full_solve_nodes_explored": sum(solve_explored) / count,
+        "speedup": full / repair if repair else float("inf"),
+        "mismatches": mismatches,
+    }
+
+def native_comparison(data:bytes, repeat:int)->list:
+    """
+        Method used to compare the compiled search kernels against the Python searches on one maze
+
+        The kernels are compiled before any timing, and the parents left by both searches are checked to be the same
+
+        Parameters:
+            data - the raw bytes of the maze file
+            repeat - the number of timed runs of each search
+
+        Returns:
+            A list of dictionaries holding the median search times, the speedup and whether the searches matched
+    """
+    width, height, walls = read_walls(data)
+    grid = Grid(width, height, walls)
+    prepare_kernels()
+    rows = []
+    for solver in NATIVE_SOLVERS:
+        heuristic = solver.partition("-")[2]
+        if solver == "dfs":
+            searches = (lambda: dfs_explore(grid, grid.start, grid.end), lambda: dfs_explore_native(grid, grid.start, grid.end))
+        elif solver == "bfs":
+            searches = (lambda: bfs_explore(grid, grid.start, grid.end), lambda: bfs_explore_native(grid, grid.start, grid.end))
+        else:
+            searches = (lambda: A_star_explore(grid, grid.start, grid.end, heuristic),
+                        lambda: A_star_explore_native(grid, grid.start, grid.end, heuristic))
+        samples = ([], [])
+        results = []
+        for timings, search in zip(samples, searches):
+            for _ in range(repeat):
+                start = timer()
+                nodes_explored, state = search()
+                timings.append(timer() - start)
+            results.append((nodes_explored, state.parent, state.visited))
+        python = summarise(samples[0])["median"]
+        native = summarise(samples[1])["median"]
+        rows.append({
+            "solver": solver,
+            "nodes_explored": results[0][0],
+            "python": python,
+            "native": native,
+            "speedup": python / native if native else float("inf"),
+            "identical": results[0] == results[1],
+        })
+    return rows
+
+def open_set_trace(grid:Grid, heuristic_choice:str)->list:
+    """
+        Method used to record the pushes and pops made on the open set by an A* search
+
+        Parameters:
+            grid - the grid of the maze
+            heuristic_choice - the heuristic used by the search
+
+        Returns:
+            A list holding a (cell, f, h) tuple for each push and None for each pop, in the order they were made
+    """
+    goal_x, goal_y = grid.coords(grid.end)
+    start_h = calculate_heuristic(grid, grid.start, goal_x, goal_y, heuristic_choice)
+    trace = [(grid.start, start_h, start_h)]
+    metrics = SearchMetrics(on_expand=lambda cell, g_value: trace.append(None),
+                            on_enqueue=lambda cell, f: trace.append((cell, f, calculate_heuristic(grid, cell, goal_x, goal_y, heuristic_choice))))
+    A_star_explore(grid, grid.start, grid.end, heuristic_choice, metrics)
+    return trace
+
+def replay_open_set(trace:list, size:int, kind:str)->list:
+    """
+        Method used to replay the pushes and pops of a search on one kind of open set
+
+        The priority queue and the plain heap skip stale entries by checking a closed set, as A* did before it had an
+        open set of its own. The open sets skip them by their keys
+
+        Parameters:
+            trace - the list of pushes and pops made by open_set_trace
+            size - the number of cells in the maze
+            kind - the open set to replay the trace on (priority-queue/heapq/heap-open-set/bucket-open-set)
+
+        Returns:
+            The list of cells in the order they were popped
+    """
+    popped = []
+    add_cell = popped.append
+    if kind in ("heap-open-set", "bucket-open-set"):
+        open_set = HeapOpenSet(size) if kind == "heap-open-set" else BucketOpenSet(size)
+        push = open_set.push
+        pop = open_set.pop
+        for entry in trace:
+            if entry is None:
+                add_cell(pop())
+            else:
+                push(*entry)
+        return popped
+    closed = bytearray(size)
+    if kind == "priority-queue":
+        open_set = queue.PriorityQueue()
+        push = lambda entry: open_set.put(entry)
+        pop = open_set.get
+    else:
+        open_set = []
+        push = lambda entry: heappush(open_set, entry)
+        pop = lambda: heappop(open_set)
+    for entry in trace:
+        if entry is None:
+            cell = pop()[2]
+            while closed[cell]:
+                cell = pop()[2]
+            closed[cell] = 1
+            add_cell(cell)
+        else:
+            push((entry[1], entry[2], entry[0]))
+    return popped
+
+def open_set_comparison(data:bytes, repeat:int)->list:
+    """
+        Method used to compare the open sets on the pushes and pops made by A* on one maze
+
+        Every open set replays the same trace, so the time spent by the rest of the search is left out. The order the
+        cells are popped in is checked against the priority queue
+
+        Parameters:
+            data - the raw bytes of the maze file
+            repeat - the number of timed replays on each open set
+
+        Returns:
+            A list of dictionaries holding the median replay times and the speedup over the priority queue
+    """
+    width, height, walls = read_walls(data)
+    grid = Grid(width, height, walls)
+    rows = []
+    for heuristic in HEURISTICS[:2]:
+        trace = open_set_trace(grid, heuristic)
+        baseline = None
+        expected = None
+        for kind in OPEN_SETS:
+            #euclidean keys are not whole numbers
+            if kind == "bucket-open-set" and heuristic == "euclidean":
+                continue
+            samples = []
+            for _ in range(repeat):
+                start = timer()
+                popped = replay_open_set(trace, grid.size, kind)
+                samples.append(timer() - start)
+            median = summarise(samples)["median"]
+            if baseline is None:
+                baseline = median
+                expected = popped
+            rows.append({
+                "heuristic": heuristic,
+                "open_set": kind,
+                "operations": len(trace),
+                "median": median,
+                "speedup": baseline / median if median else float("inf"),
+                "identical": popped == expected,
+            })
+    return rows
+
+def peak_rss()->int:
+    """
+        Method used to find the peak resident memory of the current process
+
+        Parameters:
+            No parameters
+
+        Returns:
+            The peak resident set size in bytes
+    """
+    #resource is only available on unix, so it is imported when the memory is measured
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #linux reports kilobytes and macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def measure_loader(file_name:str, loader:str, algorithm:str=None, packed_file:str=None)->int:
+    """
+        Method used to find the peak resident memory of loading, and optionally solving, a maze in a fresh process
+
+        Parameters:
+            file_name - the name of the maze file
+            loader - the loader to measure (none/bytes/packed)
+            algorithm - the search algorithm run after loading, the maze is only loaded if None
+            packed_file - the file the packed loader memory maps, the bits are kept in memory if None
+
+        Returns:
+            The peak resident set size of the process in bytes
+    """
+    command = [sys.executable, "-m", "maze_solver.benchmark", "--measure-rss", loader, "--rss", file_name]
+    if algorithm:
+        command += ["--rss-algorithm", algorithm]
+    if packed_file:
+        command += ["--packed-file", packed_file]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return int(output.split()[-1])
+
+def report_rss(loader:str, file_name:str, algorithm:str=None, packed_file:str=None)->int:
+    """
+        Method used to load and optionally solve a maze, then print the peak resident memory of the process
+
+        Parameters:
+            loader - the loader to use (none/bytes/packed)
+            file_name - the name of the maze file
+            algorithm - the search algorithm run after loading, the maze is only loaded if None
+            packed_file - the file the packed loader memory maps, the bits are kept in memory if None
+
+        Returns:
+            The exit status
+    """
+    if loader != "none":
+        grid = load_maze(file_name) if loader == "bytes" else load_packed(file_name, packed_file)
+        if algorithm:
+            solve(grid, algorithm=algorithm)
+    print(peak_rss())
+    return 0
+
+def load_cases(maze_dir:str, sizes:list, seed:int)->list:
+    """
+        Method used to gather the mazes to benchmark
+
+        Parameters:
+            maze_dir - the directory holding the shipped maze files
+            sizes - the side lengths of the synthetic mazes to generate
+            seed - the seed used to generate the synthetic mazes
+
+        Returns:
+            A list of (name, data) tuples
+    """
+    cases = []
+    for file_name in MAZE_FILES:
+        path = os.path.join(maze_dir, file_name)
+        if os.path.exists(path):
+            with open(path, "rb") as maze_file:
+                cases.append((file_name, maze_file.read()))
+    for size in sizes:
+        walls = recursive_backtracker(size, size, seed)
+        cases.append(("synthetic-%dx%d" %(size, size), maze_to_text(size, size, walls)))
+    return cases
+
+def compare(old:dict, new:dict)->list:
+    """
+        Method used to compare two benchmark reports
+
+        Parameters:
+            old - the earlier benchmark report
+            new - the later benchmark report
+
+        Returns:
+            A list of (maze, solver, old median, new median, ratio) tuples for the results in both reports
+    """
+    earlier = {(result["maze"], result["solver"]): result for result in old["results"]}
+    rows = []
+    for result in new["results"]:
+        previous = earlier.get((result["maze"], result["solver"]))
+        if previous is not None:
+            before = previous["total"]["median"]
+            after = result["total"]["median"]
+            rows.append((result["maze"], result["solver"], before, after, after / before if before else float("inf")))
+    return rows
+
+def main(argv:list=None)->int:
+    """
+        Method used to run the benchmarks from the command line
+
+        Parameters:
+            argv - the command line arguments, the arguments of the process are used if None
+
+        Returns:
+            The exit status
+    """
+    parser = argparse.ArgumentParser(prog="maze_solver.benchmark", description="Time each phase of the solvers on the shipped and generated mazes.")
+    parser.add_argument("--maze-dir", default=".", help="the directory holding the shipped maze files (default: .)")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(SYNTHETIC_SIZES), help="side lengths of generated mazes")
+    parser.add_argument("--seed", type=int, default=2423, help="the seed for the generated mazes")
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS), help="the solvers to benchmark")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="timed runs of each solver on each maze (default: 5)")
+    parser.add_argument("--queries", type=int, default=20, help="random queries per maze used to compare the nodes explored by each heuristic, 0 to skip (default: 20)")
+    parser.add_argument("--rss", nargs="+", metavar="MAZE", help="only compare the peak resident memory of the byte per cell and packed loaders on these maze files")
+    parser.add_argument("--rss-algorithm", help="also solve each maze with this algorithm when measuring peak resident memory")
+    parser.add_argument("--packed-file", help="memory map the packed bits from this file when measuring peak resident memory")
+    parser.add_argument("--replan", nargs="+", metavar="MAZE", help="only compare repairing the path with D* Lite against a full A* solve as these maze files are edited")
+    parser.add_argument("--edits", type=int, default=20, help="rounds of edits made to each maze by --replan (default: %(default)s)")
+    parser.add_argument("--native", nargs="+", metavar="MAZE", help="only compare the compiled dfs, bfs and A* kernels against the Python searches on these maze files, needs numba")
+    parser.add_argument("--open-set", nargs="+", metavar="MAZE", help="only compare the open sets by replaying the pushes and pops of A* on these maze files")
+    parser.add_argument("--measure-rss", choices=LOADERS, help=argparse.SUPPRESS)
+    parser.add_argument("-o", "--output", help="the JSON file the report is written to")
+    parser.add_argument("--compare", help="an earlier JSON report to compare the median totals against")
+    args = parser.parse_args(argv)
+    if args.measure_rss:
+        #running inside the fresh process started by measure_loader
+        return report_rss(args.measure_rss, args.rss[0], args.rss_algorithm, args.packed_file)
+    if args.rss:
+        baseline = measure_loader(args.rss[0], "none")
+        print("%-24s %-8s %14s %14s" %("maze", "loader", "peak rss", "above python"))
+        for file_name in args.rss:
+            for loader in LOADERS[1:]:
+                peak = measure_loader(file_name, loader, args.rss_algorithm, args.packed_file if loader == "packed" else None)
+                print("%-24s %-8s %14d %14d" %(os.path.basename(file_name), loader, peak, peak - baseline))
+        return 0
+    if args.replan:
+        print("%-24s %-8s %8s %12s %12s %12s %14s %14s %9s %10s" %("maze", "edits", "rounds", "initial", "repair", "full solve", "repair nodes", "solve nodes", "speedup", "mismatches"))
+        for file_name in args.replan:
+            with open(file_name, "rb") as maze_file:
+                data = maze_file.read()
+            for scenario in REPLAN_SCENARIOS:
+                row = replan_comparison(data, args.edits, args.seed, scenario)
+                print("%-24s %-8s %8d %12.6f %12.6f %12.6f %14.1f %14.1f %8.2fx %10d" %(os.path.basename(file_name), scenario, row["rounds"], row["initial_plan"],
+                      row["median_repair"], row["median_full_solve"], row["mean_repair_nodes_explored"], row["mean_full_solve_nodes_explored"],
+                      row["speedup"], row["mismatches"]))
+        return 0
+
+    if args.native:
+        if not AVAILABLE:
+            print("The compiled kernels need numba and numpy, which are not installed", file=sys.stderr)
+            return 1
+        print("%-24s %-20s %14s %12s %12s %9s %10s" %("maze", "solver", "nodes", "python", "native", "speedup", "identical"))
+        for file_name in args.native:
+            with open(file_name, "rb") as maze_file:
+                data = maze_file.read()
+            for row in native_comparison(data, args.repeat):
+                print("%-24s %-20s %14d %12.6f %12.6f %8.2fx %10s" %(os.path.basename(file_name), row["solver"], row["nodes_explored"],
+                      row["python"], row["native"], row["speedup"], row["identical"]))
+        return 0
+
+    if args.open_set:
+        print("%-24s %-10s %-16s %12s %12s %9s %10s" %("maze", "heuristic", "open set", "operations", "median", "speedup", "identical"))
+        for file_name in args.open_set:
+            with open(file_name, "rb") as maze_file:
+                data = maze_file.read()
+            for row in open_set_comparison(data, args.repeat):
+                print("%-24s %-10s %-16s %12d %12.6f %8.2fx %10s" %(os.path.basename(file_name), row["heuristic"], row["open_set"], row["operations"],
+                      row["median"], row["speedup"], row["identical"]))
+        return 0
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+        "heuristics": [],
+    }
+    print("%-24s %-20s %10s %10s %10s %10s %10s %12s" %("maze", "solver", "parse", "build", "search", "path", "p95 total", "peak memory"))
+    for name, data in load_cases(args.maze_dir, args.sizes, args.seed):
+        results = benchmark_maze(name, data, args.solvers, args.repeat)
+        for result in results:
+            report["results"].append(result)
+            phases = result["phases"]
+            print("%-24s %-20s %10.6f %10.6f %10.6f %10.6f %10.6f %12d" %(name, result["solver"], phases["parse"]["median"], phases["build"]["median"],
+                  phases["search"]["median"], phases["path"]["median"], result["total"]["p95"], result["peak_memory"]))
+        for solver, ratio, search_speedup, total_speedup in contraction_speedups(results):
+            print("%-24s %-20s compression %.2f, search speedup %.2fx, total speedup %.2fx" %(name, solver, ratio, search_speedup, total_speedup))
+        if args.queries > 0:
+            for row in heuristic_comparison(data, args.queries, args.seed):
+                row["maze"] = name
+                report["heuristics"].append(row)
+                print("%-24s %-20s %d queries, mean nodes explored %.1f, median %.1f, mean search %.6f, index %.6f" %(name, "heuristic-" + row["heuristic"],
+                      row["queries"], row["mean_nodes_explored"], row["median_nodes_explored"], row["mean_search"], row["index"]))
+
+    if args.output:
+        with open(args.output, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+    if args.compare:
+        with open(args.compare) as report_file:
+            old = json.load(report_file)
+        print("\n%-24s %-20s %12s %12s %8s" %("maze", "solver", "old median", "new median", "ratio"))
+        for row in compare(old, report):
+            print("%-24s %-20s %12.6f %12.6f %8.3f" %row)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+from .grid import Grid, SearchState, UP, DOWN, LEFT, RIGHT
+from .metrics import SearchMetrics
+
+def bfs_search(grid:Grid, start_cell:int, goal_cell:int, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run a breadth first search on the maze from the start cell to the goal cell
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state holding the distances, parents and visited cells
+    """
+    nodes_explored, state = bfs_explore(grid, start_cell, goal_cell, metrics)
+    if not state.visited[goal_cell]:
+        return [], nodes_explored, state
+    return state.path_to(goal_cell), nodes_explored, state
+
+def bfs_explore(grid:Grid, start_cell:int, goal_cell:int, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run a breadth first search without building the path
+
+        Every move costs the same, so the cells are expanded one layer of equal distance at a time from a plain list
+        and the cells they reach are added to the list for the next layer, with no heap or queue. The first time the
+        goal is reached it is at its shortest distance, so the path is optimal and the search stops straight away
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the goal cell is visited if a path was found
+    """
+    masks = grid.masks
+    width = grid.width
+    #the moves leading out of a cell for every neighbour mask, in the order up, down, left, right
+    moves = [tuple(step for direction, step in ((UP, -width), (DOWN, width), (LEFT, -1), (RIGHT, 1)) if mask & direction)
+             for mask in range(16)]
+    state = SearchState(grid.size)
+    g_values = state.g
+    parent = state.parent
+    visited = state.visited
+    g_values[start_cell] = 0
+    layer = [start_cell] if start_cell != goal_cell else []
+    distance = 0
+    nodes_explored = 0
+    pushes = 1
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+    while layer:
+        distance += 1
+        next_layer = []
+        add_cell = next_layer.append
+        for cell in layer:
+            visited[cell] = 1
+            nodes_explored += 1
+            if metrics is not None:
+                metrics.expanded(cell, distance - 1, len(layer))
+            for step in moves[masks[cell]]:
+                neighbour = cell + step
+                if g_values[neighbour] == -1:
+                    g_values[neighbour] = distance
+                    parent[neighbour] = cell
+                    add_cell(neighbour)
+                    if on_enqueue is not None:
+                        on_enqueue(neighbour, distance)
+            if g_values[goal_cell] != -1:
+                break
+        pushes += len(next_layer)
+        if g_values[goal_cell] != -1:
+            break
+        layer = next_layer
+    if g_values[goal_cell] != -1:
+        #the goal is counted as explored once it is reached, as dfs does
+        visited[goal_cell] = 1
+        nodes_explored += 1
+        if metrics is not None:
+            metrics.expanded(goal_cell, g_values[goal_cell], 1)
+    if metrics is not None:
+        metrics.record(nodes_explored, pushes, nodes_explored)
+    return nodes_explored, state
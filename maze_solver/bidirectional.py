@@ -0,0 +1,203 @@
+from collections import deque
+from heapq import heappush, heappop
+from .grid import Grid, SearchState
+from .a_star import calculate_heuristic
+from .metrics import SearchMetrics
+
+def bidirectional_A_star_search(grid:Grid, start_cell:int, goal_cell:int, heuristic_choice:str, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run A* search from the start and the goal at the same time
+
+        Both sides share the balanced potential p(cell) = (h_goal(cell) - h_start(cell)) / 2, added to g by the forward
+        side and taken away by the backward side, so each side is a Dijkstra search over the same non negative reduced
+        costs. Every edge relaxed onto a cell already reached by the other side gives a candidate path and the search
+        stops once the two smallest keys add up to at least the best candidate, which keeps the path optimal for
+        consistent heuristics such as manhattan, euclidean and alt. Keys are doubled to keep manhattan keys whole numbers
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            heuristic_choice - the heuristic to use (manhattan/euclidean/alt)
+            metrics - the metrics the work of both sides is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - a tuple of the nodes explored from the start and from the goal
+            states - a tuple of the forward and backward search states
+    """
+    heuristic_choice = heuristic_choice.lower()
+    forward = SearchState(grid.size)
+    backward = SearchState(grid.size)
+    forward.g[start_cell] = 0
+    backward.g[goal_cell] = 0
+    start_x, start_y = grid.coords(start_cell)
+    goal_x, goal_y = grid.coords(goal_cell)
+
+    def potential(cell:int):
+        return (calculate_heuristic(grid, cell, goal_x, goal_y, heuristic_choice)
+                - calculate_heuristic(grid, cell, start_x, start_y, heuristic_choice))
+
+    #each side is [state, open set, sign of the potential, other state]
+    sides = (
+        [forward, [(potential(start_cell), start_cell)], 1, backward],
+        [backward, [(-potential(goal_cell), goal_cell)], -1, forward],
+    )
+    explored = [0, 0]
+    best_length = float("inf")
+    meeting = None
+    pushes = 2
+    stale = 0
+    reparents = 0
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+
+    while True:
+        #removing stale entries so the top of each open set holds its true smallest key
+        for state, open_set, _, _ in sides:
+            while open_set and state.visited[open_set[0][1]]:
+                heappop(open_set)
+                stale += 1
+        forward_open = sides[0][1]
+        backward_open = sides[1][1]
+        if not forward_open or not backward_open:
+            break
+        if forward_open[0][0] + backward_open[0][0] >= 2 * best_length:
+            break
+
+        direction = 0 if len(forward_open) <= len(backward_open) else 1
+        state, open_set, sign, other = sides[direction]
+        g_values = state.g
+        other_g = other.g
+        visited = state.visited
+        if metrics is not None:
+            metrics.open_size(len(forward_open) + len(backward_open))
+        current_key, current_cell = heappop(open_set)
+        explored[direction] += 1
+        visited[current_cell] = 1
+        if metrics is not None:
+            metrics.expanded(current_cell, g_values[current_cell], len(forward_open) + len(backward_open) + 1)
+        new_g = g_values[current_cell] + 1
+        for neighbour in grid.neighbours(current_cell):
+            if other_g[neighbour] != -1 and new_g + other_g[neighbour] < best_length:
+                best_length = new_g + other_g[neighbour]
+                meeting = (direction, current_cell, neighbour)
+            if visited[neighbour]:
+                continue
+            neighbour_g = g_values[neighbour]
+            if neighbour_g != -1:
+                if new_g >= neighbour_g:
+                    continue
+                reparents += 1
+            g_values[neighbour] = new_g
+            state.parent[neighbour] = current_cell
+            key = 2 * new_g + sign * potential(neighbour)
+            heappush(open_set, (key, neighbour))
+            pushes += 1
+            if on_enqueue is not None:
+                on_enqueue(neighbour, key)
+
+    if metrics is not None:
+        pops = sum(explored) + stale
+        metrics.record(sum(explored), pushes, pops, stale, reparents)
+    if start_cell == goal_cell:
+        return [start_cell], tuple(explored), (forward, backward)
+    return join_paths(forward, backward, meeting), tuple(explored), (forward, backward)
+
+def bidirectional_bfs_search(grid:Grid, start_cell:int, goal_cell:int, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run breadth first search from the start and the goal at the same time
+
+        Whole layers are expanded at a time from the side with the smaller frontier. Once a layer reaches a cell
+        labelled by the other side the rest of that layer is still expanded and the shortest candidate is kept,
+        which gives the shortest path in the unit cost maze
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            metrics - the metrics the work of both sides is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - a tuple of the nodes explored from the start and from the goal
+            states - a tuple of the forward and backward search states
+    """
+    forward = SearchState(grid.size)
+    backward = SearchState(grid.size)
+    forward.g[start_cell] = 0
+    backward.g[goal_cell] = 0
+    if start_cell == goal_cell:
+        forward.visited[start_cell] = 1
+        if metrics is not None:
+            metrics.expanded(start_cell, 0, 1)
+            metrics.record(1, 1, 1)
+        return [start_cell], (1, 0), (forward, backward)
+    frontiers = [deque([start_cell]), deque([goal_cell])]
+    states = (forward, backward)
+    explored = [0, 0]
+    best_length = float("inf")
+    meeting = None
+    pushes = 2
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+
+    while frontiers[0] and frontiers[1] and meeting is None:
+        if metrics is not None:
+            metrics.open_size(len(frontiers[0]) + len(frontiers[1]))
+        direction = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        state = states[direction]
+        other_g = states[1 - direction].g
+        g_values = state.g
+        parent = state.parent
+        visited = state.visited
+        frontier = frontiers[direction]
+        next_frontier = deque()
+        for current_cell in frontier:
+            explored[direction] += 1
+            visited[current_cell] = 1
+            if metrics is not None:
+                metrics.expanded(current_cell, g_values[current_cell], len(frontiers[0]) + len(frontiers[1]) + len(next_frontier))
+            new_g = g_values[current_cell] + 1
+            for neighbour in grid.neighbours(current_cell):
+                if other_g[neighbour] != -1:
+                    if new_g + other_g[neighbour] < best_length:
+                        best_length = new_g + other_g[neighbour]
+                        meeting = (direction, current_cell, neighbour)
+                elif g_values[neighbour] == -1:
+                    g_values[neighbour] = new_g
+                    parent[neighbour] = current_cell
+                    next_frontier.append(neighbour)
+                    if on_enqueue is not None:
+                        on_enqueue(neighbour, new_g)
+        pushes += len(next_frontier)
+        frontiers[direction] = next_frontier
+
+    if metrics is not None:
+        metrics.record(sum(explored), pushes, sum(explored))
+    return join_paths(forward, backward, meeting), tuple(explored), (forward, backward)
+
+def join_paths(forward:SearchState, backward:SearchState, meeting:tuple)->list:
+    """
+        Method used to join the two halves of a bidirectional search at the edge where they met
+
+        Parameters:
+            forward - the search state of the search from the start
+            backward - the search state of the search from the goal
+            meeting - a tuple of the direction that found the edge and the two cells of the edge, None if they never met
+
+        Returns:
+            The list of cells from the start cell to the goal cell, empty if there is no path
+    """
+    if meeting is None:
+        return []
+    direction, current_cell, neighbour = meeting
+    if direction == 0:
+        forward_cell, backward_cell = current_cell, neighbour
+    else:
+        forward_cell, backward_cell = neighbour, current_cell
+    path = forward.path_to(forward_cell)
+    cell = backward_cell
+    parent = backward.parent
+    while cell != -1:
+        path.append(cell)
+        cell = parent[cell]
+    return path
@@ -0,0 +1,330 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from .grid import Grid, cells_to_walls, read_cells, read_costs
+from .contract import JunctionGraph
+
+#layout of the start of every cache file: magic, version, byte order, has graph, has costs, width, height, start, end,
+#length of the source file name
+HEADER = struct.Struct("<4sHBBBiiqqI")
+MAGIC = b"MAZC"
+VERSION = 2
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+SUFFIX = ".maze"
+#the default limit on the total size of the cache directory
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+def default_cache_dir()->str:
+    """
+        Method used to find the directory the cache is kept in when none is given
+
+        Parameters:
+            No parameters
+
+        Returns:
+            The value of MAZE_SOLVER_CACHE if it is set, otherwise ~/.cache/maze_solver
+    """
+    return os.environ.get("MAZE_SOLVER_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "maze_solver")
+
+def content_key(data:bytes)->str:
+    """
+        Method used to find the cache key of the contents of a maze file
+
+        Parameters:
+            data - the raw bytes of the maze file
+
+        Returns:
+            The hex SHA-256 digest of the contents
+    """
+    return hashlib.sha256(data).hexdigest()
+
+class MazeCache:
+    """
+    This is a class designed to keep parsed and preprocessed mazes on disk between runs
+
+    Every entry is a single binary file named after the SHA-256 of the maze file contents, so an edited maze file
+    misses the cache and its old entry is removed when the new one is stored. Entries hold the wall and neighbour
+    mask buffers, the start and end, the cell costs of weighted mazes and optionally the junction graph. They are
+    read back through a copy on write memory map that the grid keeps views of, so a hit does not copy the cells and
+    changing a cell never changes the entry on disk.
+    The modification time of an entry is updated whenever it is used, and the least recently used entries are
+    removed once the directory grows past its size limit
+
+    Atributes:
+        self.directory - the directory the entries are kept in
+        self.max_bytes - the largest total size of the entries before old ones are removed
+        self.hits - the number of loads answered from the cache
+        self.misses - the number of loads that had to parse the maze file
+    """
+
+    def __init__(self, directory:str=None, max_bytes:int=DEFAULT_MAX_BYTES)->None:
+        """
+        Method used to initialise a cache
+
+        Parameters:
+            self - the current cache
+            directory - the directory the entries are kept in, default_cache_dir() if None
+            max_bytes - the largest total size of the entries before old ones are removed
+
+        Returns:
+            No return values
+        """
+        self.directory = directory if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def entry_path(self, key:str)->str:
+        """
+        Method used to find the file an entry is stored in
+
+        Parameters:
+            self - the current cache
+            key - the cache key of the entry
+
+        Returns:
+            The path of the entry file
+        """
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, file_name:str, with_graph:bool=False)->tuple:
+        """
+        Method used to load a maze file through the cache
+
+        Parameters:
+            self - the current cache
+            file_name - the name of the maze file
+            with_graph - whether the junction graph of the start and end is also needed
+
+        Returns:
+            grid - the grid for the maze
+            graph - the junction graph of the maze, None if it was not asked for
+            hit - whether or not the entry was found in the cache
+        """
+        with open(file_name, "rb") as maze_file:
+            data = maze_file.read()
+        key = content_key(data)
+        entry = self.get(key, with_graph)
+        if entry is not None:
+            self.hits += 1
+            return entry[0], entry[1], True
+
+        self.misses += 1
+        width, height, cells = read_cells(data)
+        grid = Grid(width, height, cells_to_walls(width, height, cells), costs=read_costs(cells))
+        graph = JunctionGraph(grid, (grid.start, grid.end)) if with_graph else None
+        self.put(key, grid, graph, os.path.abspath(file_name))
+        return grid, graph, False
+
+    def get(self, key:str, with_graph:bool=False):
+        """
+        Method used to read an entry from the cache
+
+        Parameters:
+            self - the current cache
+            key - the cache key of the entry
+            with_graph - whether the entry must hold a junction graph
+
+        Returns:
+            A tuple of the grid and the junction graph (None if it was not asked for), or None if there is no usable entry
+        """
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                buffer = mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_COPY)
+            #the map stays open for as long as the grid holds views of it
+            entry = read_entry(buffer, with_graph)
+        except (OSError, ValueError, struct.error):
+            return None
+        if entry is None:
+            return None
+        #touching the entry so it counts as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key:str, grid:Grid, graph:JunctionGraph=None, source:str="")->None:
+        """
+        Method used to store an entry, replacing any older entry for the same source file
+
+        Parameters:
+            self - the current cache
+            key - the cache key of the entry
+            grid - the grid for the maze
+            graph - the junction graph of the start and end, None if it is not stored
+            source - the absolute path of the maze file the entry was made from
+
+        Returns:
+            No return values
+        """
+        path = self.entry_path(key)
+        temporary = "%s.%d.tmp" %(path, os.getpid())
+        with open(temporary, "wb") as entry_file:
+            write_entry(entry_file, grid, graph, source)
+        os.replace(temporary, path)
+        if source:
+            for other in self.entries():
+                if other != path and entry_source(other) == source:
+                    remove_file(other)
+        self.evict()
+
+    def entries(self)->list:
+        """
+        Method used to list the entry files of the cache
+
+        Parameters:
+            self - the current cache
+
+        Returns:
+            The list of paths of the entry files
+        """
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(SUFFIX)]
+
+    def evict(self)->None:
+        """
+        Method used to remove the least recently used entries until the cache fits within its size limit
+
+        Parameters:
+            self - the current cache
+
+        Returns:
+            No return values
+        """
+        entries = []
+        for path in self.entries():
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            remove_file(path)
+            total -= size
+
+    def clear(self)->None:
+        """
+        Method used to remove every entry from the cache
+
+        Parameters:
+            self - the current cache
+
+        Returns:
+            No return values
+        """
+        for path in self.entries():
+            remove_file(path)
+
+def write_entry(entry_file, grid:Grid, graph:JunctionGraph, source:str)->None:
+    """
+        Method used to write a grid and its junction graph in the cache file format
+
+        Parameters:
+            entry_file - the binary file to write to
+            grid - the grid for the maze
+            graph - the junction graph, None if it is not stored
+            source - the path of the maze file the entry was made from
+
+        Returns:
+            No return values
+    """
+    source_bytes = source.encode("utf-8")
+    entry_file.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER, graph is not None, grid.costs is not None, grid.width,
+                                 grid.height, grid.start, grid.end, len(source_bytes)))
+    entry_file.write(source_bytes)
+    entry_file.write(grid.walls)
+    entry_file.write(grid.masks)
+    if grid.costs is not None:
+        entry_file.write(grid.costs)
+    if graph is not None:
+        for name in JunctionGraph.BUFFERS:
+            buffer = getattr(graph, name)
+            entry_file.write(struct.pack("<Q", len(buffer)))
+            buffer.tofile(entry_file)
+
+def read_entry(buffer, with_graph:bool):
+    """
+        Method used to read a grid and its junction graph back from the cache file format
+
+        The walls and masks of the grid are views of the buffer rather than copies, the walls are writable if the
+        buffer is. The junction graph is only decoded when it is asked for
+
+        Parameters:
+            buffer - the memory mapped contents of the entry file
+            with_graph - whether the junction graph is needed
+
+        Returns:
+            A tuple of the grid and the junction graph (None if it was not asked for), or None if the entry cannot be used
+    """
+    magic, version, byte_order, has_graph, has_costs, width, height, start, end, source_length = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION or byte_order != BYTE_ORDER or (with_graph and not has_graph):
+        return None
+    size = width * height
+    offset = HEADER.size + source_length
+    cells_end = offset + (3 if has_costs else 2) * size
+    if len(buffer) < cells_end:
+        raise ValueError("the cache entry is truncated")
+    view = memoryview(buffer)
+    walls = view[offset:offset + size]
+    masks = view[offset + size:offset + 2 * size].toreadonly()
+    costs = bytearray(view[offset + 2 * size:cells_end]) if has_costs else None
+    grid = Grid(width, height, walls, masks, costs)
+    if grid.start != start or grid.end != end:
+        raise ValueError("the cache entry does not match its header")
+    if not with_graph:
+        return grid, None
+
+    offset = cells_end
+    buffers = {}
+    for name in JunctionGraph.BUFFERS:
+        (length,) = struct.unpack_from("<Q", buffer, offset)
+        offset += 8
+        values = array("i")
+        values.frombytes(view[offset:offset + length * values.itemsize])
+        if len(values) != length:
+            raise ValueError("the cache entry is truncated")
+        offset += length * values.itemsize
+        buffers[name] = values
+    return grid, JunctionGraph.from_buffers(grid, buffers)
+
+def entry_source(path:str)->str:
+    """
+        Method used to read the source file name recorded in an entry
+
+        Parameters:
+            path - the path of the entry file
+
+        Returns:
+            The path of the maze file the entry was made from, an empty string if it cannot be read
+    """
+    try:
+        with open(path, "rb") as entry_file:
+            header = entry_file.read(HEADER.size)
+            source_length = HEADER.unpack(header)[-1]
+            return entry_file.read(source_length).decode("utf-8")
+    except (OSError, ValueError, struct.error):
+        return ""
+
+def remove_file(path:str)->None:
+    """
+        Method used to remove a file that may already have been removed by another process
+
+        Parameters:
+            path - the path of the file
+
+        Returns:
+            No return values
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,379 @@
+import argparse
+import json
+import sys
+from timeit import default_timer as timer
+from .a_star import HEURISTICS
+from .cache import DEFAULT_MAX_BYTES, MazeCache
+from .render import display_maze, display_path, render_text, write_image, write_path_file
+from .grid import Grid, load_maze
+from .metrics import SearchMetrics
+from .multi import MAX_SEARCHES, all_pairs_paths
+from .replan import DStarLite
+from .packed import load_packed
+from .profiling import PROFILERS, profile_call, write_summary
+from .query import MazeQueries
+from .solver import ALGORITHMS, solve
+
+def parse_query(text:str)->tuple:
+    """
+        Method used to read a query given on the command line
+
+        Parameters:
+            text - the query written as row,col:row,col
+
+        Returns:
+            A tuple of the start and goal, each a tuple of the row and column
+    """
+    try:
+        start, goal = text.split(":")
+        start_x, start_y = start.split(",")
+        goal_x, goal_y = goal.split(",")
+        return (int(start_x), int(start_y)), (int(goal_x), int(goal_y))
+    except ValueError:
+        raise argparse.ArgumentTypeError("queries are written as row,col:row,col, not %r" %text)
+
+def parse_cell(text:str)->tuple:
+    """
+        Method used to read a cell given on the command line
+
+        Parameters:
+            text - the cell written as row,col
+
+        Returns:
+            A tuple of the row and column
+    """
+    try:
+        x_coord, y_coord = text.split(",")
+        return int(x_coord), int(y_coord)
+    except ValueError:
+        raise argparse.ArgumentTypeError("cells are written as row,col, not %r" %text)
+
+def build_parser()->argparse.ArgumentParser:
+    """
+        Method used to build the command line argument parser
+
+        Parameters:
+            No parameters
+
+        Returns:
+            The argument parser for the solver
+    """
+    parser = argparse.ArgumentParser(prog="maze_solver", description="Solve a maze file using DFS, A*, bidirectional, jump point or contracted graph search.")
+    parser.add_argument("maze", help="the file name of the maze to solve")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="astar", help="the search algorithm to use (default: astar)")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default="manhattan", help="the heuristic used by the A*, jump point, contracted and cost-astar searches (default: manhattan)")
+    parser.add_argument("-f", "--format", choices=("text", "json"), default="text", help="the output format (default: text)")
+    parser.add_argument("--no-render", action="store_true", help="skip drawing the solved maze and listing the cells of the path")
+    parser.add_argument("--image", help="also write the solved maze to a PNG or PPM image, chosen by the file extension")
+    parser.add_argument("--scale", type=int, default=1, help="the number of pixels along each side of a cell in the image (default: %(default)s)")
+    parser.add_argument("--path-file", help="also write the path to a text file, one row and column pair per line")
+    parser.add_argument("-q", "--query", type=parse_query, action="append", help="find the path between two cells written as row,col:row,col instead of from the start to the end, may be repeated to answer many queries on the same maze (astar and dfs only)")
+    parser.add_argument("--all-openings", action="store_true", help="search from every opening on the top row at once and stop at the nearest opening on the bottom row (astar only)")
+    parser.add_argument("--all-pairs", action="store_true", help="find the shortest path between every opening on the top row and every opening on the bottom row")
+    parser.add_argument("--max-searches", type=int, default=MAX_SEARCHES, help="the largest number of searches --all-pairs runs on a maze with loops, 0 for no limit (default: %(default)s)")
+    parser.add_argument("--toggle", type=parse_cell, action="append", metavar="ROW,COL", help="plan with D* Lite, then toggle these cells between wall and open and repair the path rather than solving again, may be repeated")
+    parser.add_argument("--check-reachable", action="store_true", help="label the connected regions of the maze before searching, report their sizes and stop early if the end cannot be reached")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="the number of processes used to label the regions of large mazes, 0 for the number of cores (default: %(default)s)")
+    parser.add_argument("--no-native", action="store_true", help="run dfs, bfs and astar in Python even when numba is installed")
+    parser.add_argument("--metrics", metavar="FILE", help="count expansions, open set pushes and pops, stale entries, reparented cells and the largest open set, and write them with the phase timings to a JSON file (- for stdout)")
+    parser.add_argument("--profile", metavar="PREFIX", help="run under a profiler and write PREFIX.collapsed stacks for flame graphs, PREFIX.pstats (cprofile only) and a PREFIX.json summary of the phase timings and busiest functions")
+    parser.add_argument("--profiler", choices=PROFILERS, default="cprofile", help="the profiler used by --profile, sample takes the stack every millisecond of processor time and slows the solve far less (default: %(default)s)")
+    parser.add_argument("--packed", action="store_true", help="read the maze row by row into one bit per cell, for mazes too large for memory (not for contracted)")
+    parser.add_argument("--packed-file", help="memory map the packed maze from this file, which is overwritten, implies --packed")
+    parser.add_argument("--cache", action="store_true", help="load the maze through the on-disk cache")
+    parser.add_argument("--cache-dir", help="the cache directory, implies --cache (default: $MAZE_SOLVER_CACHE or ~/.cache/maze_solver)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help="the size limit of the cache in MB (default: %(default)s)")
+    return parser
+
+def main(argv:list=None)->int:
+    """
+        Method used to run the solver from the command line
+
+        Parameters:
+            argv - the command line arguments, the arguments of the process are used if None
+
+        Returns:
+            The exit status, 0 if a path was found, 1 if the maze was not valid and 2 if there is no path
+    """
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        return run_profiled(args)
+    return run(args)
+
+def run_profiled(args:argparse.Namespace)->int:
+    """
+        Method used to solve the maze under a profiler, then write and print what it found
+
+        Parameters:
+            args - the parsed command line arguments
+
+        Returns:
+            The exit status of the solve, or 1 if the profile could not be written
+    """
+    report = {"maze": args.maze, "algorithm": args.algorithm, "heuristic": args.heuristic, "phases": {}}
+    try:
+        status, summary = profile_call(args.profile, args.profiler, run, args, report)
+        report.update(summary)
+        #the queries, all pairs and toggle modes only give the time of the whole call
+        report["phases"]["total"] = summary["wall_time"]
+        write_summary(args.profile, report)
+    except (OSError, ValueError) as error:
+        print("The profile could not be written: %s" %error, file=sys.stderr)
+        return 1
+    #the solve may have printed JSON to stdout, so the profile is reported on stderr
+    files = [args.profile + ".collapsed", args.profile + ".json"] + ([args.profile + ".pstats"] if args.profiler == "cprofile" else [])
+    print("Profile written to %s" %", ".join(files), file=sys.stderr)
+    print("Phase times: %s" %", ".join("%s %f" %item for item in report["phases"].items()), file=sys.stderr)
+    print("Busiest functions:", file=sys.stderr)
+    for entry in report["top"][:5]:
+        print("    %10.6f %10.6f  %s" %(entry["time"], entry["cumulative_time"], entry["function"]), file=sys.stderr)
+    return status
+
+def run(args:argparse.Namespace, report:dict=None)->int:
+    """
+        Method used to load and solve the maze given on the command line and print the results
+
+        Parameters:
+            args - the parsed command line arguments
+            report - a dictionary the size of the maze and the time of each phase are added to, None to skip them
+
+        Returns:
+            The exit status, 0 if a path was found, 1 if the maze was not valid and 2 if there is no path
+    """
+    phases = report["phases"] if report is not None else {}
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = MazeCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    try:
+        start = timer()
+        maze = load_packed(args.maze, args.packed_file) if args.packed or args.packed_file else args.maze
+        if maze is not args.maze:
+            phases["load"] = timer() - start
+    except (OSError, ValueError) as error:
+        print("The maze file entered was not valid: %s" %error, file=sys.stderr)
+        return 1
+    if args.query:
+        return run_queries(args, maze, cache)
+    if args.all_pairs:
+        return run_all_pairs(args, maze, cache)
+    if args.toggle:
+        return run_replan(args, maze, cache)
+    try:
+        metrics = SearchMetrics() if args.metrics else None
+        result = solve(maze, algorithm=args.algorithm, heuristic=args.heuristic, cache=cache, metrics=metrics,
+                       all_openings=args.all_openings, check_reachable=args.check_reachable, workers=args.workers or None,
+                       native=not args.no_native)
+    except (OSError, ValueError) as error:
+        print("The maze file entered was not valid: %s" %error, file=sys.stderr)
+        return 1
+    phases.update(result.timings)
+    if report is not None:
+        report.update(width=result.grid.width, height=result.grid.height, nodes_explored=result.nodes_explored, path_length=len(result.path))
+
+    try:
+        start = timer()
+        if args.image:
+            write_image(args.image, result.grid, result.path, result.visited(), max(args.scale, 1))
+        if args.path_file:
+            write_path_file(args.path_file, result.grid, result.path)
+        if args.metrics and args.metrics != "-":
+            with open(args.metrics, "w") as metrics_file:
+                json.dump(metrics_report(result), metrics_file, indent=2)
+        if args.image or args.path_file or args.metrics:
+            phases["output"] = timer() - start
+    except (OSError, ValueError) as error:
+        print("The output file could not be written: %s" %error, file=sys.stderr)
+        return 1
+
+    start = timer()
+    if args.format == "json":
+        print(json.dumps(result.to_dict()))
+    else:
+        if not args.no_render:
+            display_maze(render_text(result.grid, result.path, result.visited()))
+            print("\n==========================\n")
+            display_path(result.grid, result.path)
+            print("\n==========================\n")
+        print("Nodes explored: %d " %result.nodes_explored)
+        if "nodes_explored_forward" in result.stats:
+            print("Nodes explored from start: %d, from end: %d" %(result.stats["nodes_explored_forward"], result.stats["nodes_explored_backward"]))
+        if "compression_ratio" in result.stats:
+            print("Junction nodes: %d (%.2f open cells per node)" %(result.stats["junction_nodes"], result.stats["compression_ratio"]))
+            if "contract" in result.timings:
+                print("Time of contraction: %f" %result.timings["contract"])
+        if "components" in result.stats:
+            print("Components: %d (largest %s), %d open cells unreachable from the start" %(result.stats["components"], ", ".join(map(str, result.stats["component_sizes"])), result.stats["unreachable_cells"]))
+            print("Time of reachability check: %f" %result.timings["components"])
+            if not result.stats["reachable"]:
+                print("No path: the start and end are in different components, so no search was run")
+        if "entrances" in result.stats:
+            print("Openings searched: %d on the top row, %d on the bottom row" %(result.stats["entrances"], result.stats["exits"]))
+        if "landmarks" in result.stats:
+            print("Landmarks: %d (%d bytes)" %(result.stats["landmarks"], result.stats["landmark_memory"]))
+            if "landmarks" in result.timings:
+                print("Time of landmark index: %f" %result.timings["landmarks"])
+        if "compile" in result.timings:
+            print("Time of loading the compiled kernels: %f" %result.timings["compile"])
+        #only the search is timed here, loading the maze and the other phases are given under their own names
+        print("Time of search: %f%s" %(result.timings["search"], " (compiled kernel)" if result.stats.get("native") else ""))
+        if "cache" in result.stats:
+            print("Cache %s, loaded in %f" %(result.stats["cache"], result.timings["parse"]))
+        print("Path length: %d" %len(result.path))
+        if "path_cost" in result.stats:
+            print("Path cost: %d" %result.stats["path_cost"])
+        print("Memory usage: %d bytes" %result.memory_usage())
+        if result.metrics is not None:
+            print("Expansions: %(expansions)d, pushes: %(pushes)d, pops: %(pops)d, stale entries: %(stale)d, reparented: %(reparents)d, largest open set: %(max_open)d" %result.metrics.to_dict())
+            print("Phase times: %s" %", ".join("%s %f" %item for item in result.timings.items()))
+    if args.metrics == "-":
+        print(json.dumps(metrics_report(result)))
+    phases["render"] = timer() - start
+    return 0 if result.found() else 2
+
+def metrics_report(result)->dict:
+    """
+        Method used to gather the metrics and phase timings of a solve for writing as JSON
+
+        Parameters:
+            result - the SolveResult of a search run with metrics
+
+        Returns:
+            A dictionary holding the algorithm, heuristic, phase timings and search metrics
+    """
+    return {
+        "algorithm": result.algorithm,
+        "heuristic": result.heuristic,
+        "timings": result.timings,
+        "metrics": result.metrics.to_dict(),
+    }
+
+def run_queries(args:argparse.Namespace, maze, cache)->int:
+    """
+        Method used to answer the queries given on the command line
+
+        Parameters:
+            args - the parsed command line arguments
+            maze - either a packed grid or the file name of the maze
+            cache - the MazeCache used to load the maze, None if the maze is parsed
+
+        Returns:
+            The exit status, 0 if every query found a path, 1 if the maze or a query was not valid and 2 otherwise
+    """
+    try:
+        queries = MazeQueries(maze, algorithm=args.algorithm, heuristic=args.heuristic, cache=cache)
+        results = queries.query_many(args.query)
+    except (OSError, ValueError) as error:
+        print("The maze file or query entered was not valid: %s" %error, file=sys.stderr)
+        return 1
+
+    grid = queries.grid
+    lines = []
+    for (start, goal), (path, nodes_explored) in zip(args.query, results):
+        if args.format == "json":
+            lines.append(json.dumps({"start": list(start), "goal": list(goal), "found": len(path) > 0,
+                                     "path_length": len(path), "nodes_explored": nodes_explored,
+                                     "path": [list(grid.coords(cell)) for cell in path]}))
+        else:
+            lines.append("Query %s -> %s: path length %d, nodes explored %d" %(start, goal, len(path), nodes_explored))
+    print("\n".join(lines))
+    return 0 if all(path for path, _ in results) else 2
+
+def run_all_pairs(args:argparse.Namespace, maze, cache)->int:
+    """
+        Method used to print the shortest path between every opening on the top row and every opening on the bottom row
+
+        Parameters:
+            args - the parsed command line arguments
+            maze - either a packed grid or the file name of the maze
+            cache - the MazeCache used to load the maze, None if the maze is parsed
+
+        Returns:
+            The exit status, 0 if every pair is joined by a path, 1 if the maze was not valid or needs too many searches
+            and 2 otherwise
+    """
+    try:
+        if isinstance(maze, Grid):
+            grid = maze
+        elif cache is not None:
+            grid = cache.load(maze)[0]
+        else:
+            grid = load_maze(maze)
+    except (OSError, ValueError) as error:
+        print("The maze file entered was not valid: %s" %error, file=sys.stderr)
+        return 1
+    try:
+        paths, nodes_explored, searches = all_pairs_paths(grid, max_searches=args.max_searches or None)
+    except ValueError as error:
+        print("The paths were not searched for: %s, raise --max-searches to allow more" %error, file=sys.stderr)
+        return 1
+    if not paths:
+        print("The maze file entered was not valid: the maze needs an opening on its top and bottom rows", file=sys.stderr)
+        return 1
+
+    lines = []
+    for (entrance, exit_cell), path in sorted(paths.items()):
+        start, goal = grid.coords(entrance), grid.coords(exit_cell)
+        if args.format == "json":
+            lines.append(json.dumps({"start": list(start), "goal": list(goal), "found": len(path) > 0,
+                                     "path_length": len(path), "path": [list(grid.coords(cell)) for cell in path]}))
+        else:
+            lines.append("Opening %s -> %s: path length %d" %(start, goal, len(path)))
+    if args.format != "json":
+        lines.append("Nodes explored: %d in %d searches" %(nodes_explored, searches))
+    print("\n".join(lines))
+    return 0 if all(paths.values()) else 2
+
+def run_replan(args:argparse.Namespace, maze, cache)->int:
+    """
+        Method used to plan a path, toggle the cells given on the command line and repair the path
+
+        Parameters:
+            args - the parsed command line arguments
+            maze - either a packed grid or the file name of the maze
+            cache - the MazeCache used to load the maze, None if the maze is parsed
+
+        Returns:
+            The exit status, 0 if the repaired path reaches the end, 1 if the maze or a cell was not valid and 2 otherwise
+    """
+    try:
+        if isinstance(maze, Grid):
+            grid = maze
+        elif cache is not None:
+            grid = cache.load(maze)[0]
+        else:
+            grid = load_maze(maze)
+        if grid.start == -1 or grid.end == -1:
+            raise ValueError("the maze needs an opening on its top and bottom rows")
+        cells = []
+        for x_coord, y_coord in args.toggle:
+            if not (0 <= x_coord < grid.height and 0 <= y_coord < grid.width):
+                raise ValueError("the cell %s is outside the maze" %((x_coord, y_coord),))
+            cells.append(grid.cell_index(x_coord, y_coord))
+        if grid.start in cells or grid.end in cells:
+            raise ValueError("the start and end cannot be toggled")
+        planner = DStarLite(grid, grid.start, grid.end)
+        start = timer()
+        path = planner.plan()
+        planned = timer() - start
+        explored = planner.nodes_explored
+        start = timer()
+        repaired = planner.update_cells(cells)
+        repair_time = timer() - start
+    except (OSError, ValueError) as error:
+        print("The maze file or cell entered was not valid: %s" %error, file=sys.stderr)
+        return 1
+
+    if args.format == "json":
+        print(json.dumps({"path_length": len(path), "nodes_explored": explored, "plan_time": planned,
+                          "toggled": [list(cell) for cell in args.toggle], "found": len(repaired) > 0,
+                          "repaired_path_length": len(repaired), "repair_nodes_explored": planner.nodes_explored,
+                          "repair_time": repair_time, "path": [list(grid.coords(cell)) for cell in repaired]}))
+    else:
+        if not args.no_render:
+            display_maze(render_text(grid, repaired, bytearray(grid.size)))
+            print("\n==========================\n")
+            display_path(grid, repaired)
+            print("\n==========================\n")
+        print("Initial plan: path length %d, nodes explored %d, time %f" %(len(path), explored, planned))
+        print("After toggling %d cells: path length %d, nodes explored %d, time %f" %(len(cells), len(repaired), planner.nodes_explored, repair_time))
+    return 0 if repaired else 2
@@ -0,0 +1,330 @@
+import os
+import re
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from .grid import Grid
+from .packed import PackedWalls
+
+#matches every run of open cells in a row of wall values
+OPEN_RUNS = re.compile(rb"\x00+")
+#the number of rows labelled together, which bounds the wall values unpacked at once
+BAND_ROWS = 1024
+#the smallest number of cells before the bands are labelled in worker processes
+PARALLEL_CELLS = 1 << 22
+
+class Components:
+    """
+    This is a class designed to hold the connected regions of open cells in a maze
+
+    The open cells of every row are split into runs, and each run is given the label of the region it belongs to,
+    so the labels take a few bytes per run rather than per cell
+
+    Atributes:
+        self.grid - the grid the components were found for
+        self.run_starts - the first cell of each run, in increasing order
+        self.run_ends - the cell after the last cell of each run
+        self.run_labels - the component of each run
+        self.sizes - the number of open cells in each component
+    """
+
+    def __init__(self, grid:Grid, run_starts:array, run_ends:array, run_labels:array, sizes:list)->None:
+        """
+        Method used to initialise the components
+
+        Parameters:
+            self - the current components
+            grid - the grid the components were found for
+            run_starts - the first cell of each run
+            run_ends - the cell after the last cell of each run
+            run_labels - the component of each run
+            sizes - the number of open cells in each component
+
+        Returns:
+            No return values
+        """
+        self.grid = grid
+        self.run_starts = run_starts
+        self.run_ends = run_ends
+        self.run_labels = run_labels
+        self.sizes = sizes
+
+    def count(self)->int:
+        """
+        Method used to find the number of components
+
+        Parameters:
+            self - the current components
+
+        Returns:
+            The number of separate regions of open cells
+        """
+        return len(self.sizes)
+
+    def component_of(self, cell:int)->int:
+        """
+        Method used to find the component a cell belongs to
+
+        Parameters:
+            self - the current components
+            cell - the index of the cell
+
+        Returns:
+            The label of the component, -1 if the cell is a wall
+        """
+        run = bisect_right(self.run_starts, cell) - 1
+        if run < 0 or cell >= self.run_ends[run]:
+            return -1
+        return self.run_labels[run]
+
+    def connected(self, first_cell:int, second_cell:int)->bool:
+        """
+        Method used to check if there is a path between two cells
+
+        Parameters:
+            self - the current components
+            first_cell - the index of the first cell
+            second_cell - the index of the second cell
+
+        Returns:
+            Whether or not both cells are open and in the same component
+        """
+        label = self.component_of(first_cell)
+        return label != -1 and label == self.component_of(second_cell)
+
+    def unreachable_from(self, cell:int)->int:
+        """
+        Method used to count the open cells that cannot be reached from a cell
+
+        Parameters:
+            self - the current components
+            cell - the index of the cell
+
+        Returns:
+            The number of open cells outside the component of the cell
+        """
+        label = self.component_of(cell)
+        return sum(self.sizes) - (self.sizes[label] if label != -1 else 0)
+
+    def largest(self, count:int)->list:
+        """
+        Method used to find the sizes of the largest components
+
+        Parameters:
+            self - the current components
+            count - the number of sizes to return
+
+        Returns:
+            The sizes of at most count components, largest first
+        """
+        return sorted(self.sizes, reverse=True)[:count]
+
+    def labels(self)->array:
+        """
+        Method used to find the component of every cell
+
+        Parameters:
+            self - the current components
+
+        Returns:
+            An array holding the component of every cell, -1 for walls
+        """
+        labels = array("i", [-1]) * self.grid.size
+        for start, end, label in zip(self.run_starts, self.run_ends, self.run_labels):
+            labels[start:end] = array("i", [label]) * (end - start)
+        return labels
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used by the run arrays
+
+        Parameters:
+            self - the current components
+
+        Returns:
+            The combined size of the run arrays in bytes
+        """
+        return sum(len(values) * values.itemsize for values in (self.run_starts, self.run_ends, self.run_labels))
+
+def find_root(parent:array, run:int)->int:
+    """
+        Method used to find the run at the root of a set, halving the path to it on the way
+
+        Parameters:
+            parent - the parent of each run
+            run - the run to start from
+
+        Returns:
+            The root run of the set
+    """
+    while parent[run] != run:
+        parent[run] = parent[parent[run]]
+        run = parent[run]
+    return run
+
+def join_runs(parent:array, upper:list, lower:list)->None:
+    """
+        Method used to join the runs of two neighbouring rows wherever they share a column
+
+        Roots are always the lowest run of their set, so parents never point forward
+
+        Parameters:
+            parent - the parent of each run
+            upper - the (first column, column after the last, run) of each run in the upper row, left to right
+            lower - the (first column, column after the last, run) of each run in the lower row, left to right
+
+        Returns:
+            No return values
+    """
+    upper_index = 0
+    lower_index = 0
+    upper_count = len(upper)
+    lower_count = len(lower)
+    while upper_index < upper_count and lower_index < lower_count:
+        upper_start, upper_end, upper_run = upper[upper_index]
+        lower_start, lower_end, lower_run = lower[lower_index]
+        if upper_start < lower_end and lower_start < upper_end:
+            upper_root = find_root(parent, upper_run)
+            lower_root = find_root(parent, lower_run)
+            if upper_root < lower_root:
+                parent[lower_root] = upper_root
+            elif lower_root < upper_root:
+                parent[upper_root] = lower_root
+        if upper_end < lower_end:
+            upper_index += 1
+        else:
+            lower_index += 1
+
+def row_runs(walls:bytes, offset:int, width:int, first_run:int)->list:
+    """
+        Method used to find the runs of open cells in a row
+
+        Parameters:
+            walls - the wall values of the rows
+            offset - the position of the row in the wall values
+            width - the number of columns in the maze
+            first_run - the number given to the first run of the row
+
+        Returns:
+            A list of the (first column, column after the last, run) of each run, left to right
+    """
+    return [(match.start() - offset, match.end() - offset, first_run + number)
+            for number, match in enumerate(OPEN_RUNS.finditer(walls, offset, offset + width))]
+
+def label_band(walls:bytes, width:int, first_cell:int)->tuple:
+    """
+        Method used to split a band of rows into runs and join the runs that touch
+
+        The regular expression finds the runs of each row in C, so only the runs are looked at in Python
+
+        Parameters:
+            walls - the wall values of the rows in the band
+            width - the number of columns in the maze
+            first_cell - the cell of the first wall value in the band
+
+        Returns:
+            run_starts - the first cell of each run
+            run_ends - the cell after the last cell of each run
+            parent - the root of each run within the band, numbered from 0
+    """
+    run_starts = array("i")
+    run_ends = array("i")
+    parent = array("i")
+    previous = []
+    for offset in range(0, len(walls), width):
+        current = row_runs(walls, offset, width, len(parent))
+        cell = first_cell + offset
+        for start, end, run in current:
+            run_starts.append(cell + start)
+            run_ends.append(cell + end)
+            parent.append(run)
+        join_runs(parent, previous, current)
+        previous = current
+    #the roots are the lowest run of their set, so one pass in order points every run at its root
+    for run in range(len(parent)):
+        parent[run] = parent[parent[run]]
+    return run_starts, run_ends, parent
+
+def band_walls(grid:Grid, first_row:int, last_row:int)->bytes:
+    """
+        Method used to find the wall values of a band of rows
+
+        Parameters:
+            grid - the grid of the maze
+            first_row - the first row of the band
+            last_row - the row after the last row of the band
+
+        Returns:
+            A bytes object holding 1 for every wall cell and 0 for every open cell in the band
+    """
+    start = first_row * grid.width
+    end = last_row * grid.width
+    if isinstance(grid.walls, PackedWalls):
+        return grid.walls.cells(start, end)
+    return bytes(grid.walls[start:end])
+
+def label_components(grid:Grid, workers:int=1)->Components:
+    """
+        Method used to find the connected regions of open cells in a maze
+
+        The rows are split into bands that are labelled on their own, in worker processes for large mazes, and the
+        runs on either side of each band boundary are joined afterwards
+
+        Parameters:
+            grid - the grid of the maze
+            workers - the number of worker processes, the number of cores if None, bands are labelled in this process
+                      if 1 or if the maze has fewer than PARALLEL_CELLS cells
+
+        Returns:
+            The components of the maze
+    """
+    workers = workers or os.cpu_count() or 1
+    width = grid.width
+    bands = [(first_row, min(first_row + BAND_ROWS, grid.height)) for first_row in range(0, grid.height, BAND_ROWS)]
+    if workers > 1 and len(bands) > 1 and grid.size >= PARALLEL_CELLS:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(label_band, band_walls(grid, first_row, last_row), width, first_row * width)
+                       for first_row, last_row in bands]
+            results = [future.result() for future in futures]
+    else:
+        results = [label_band(band_walls(grid, first_row, last_row), width, first_row * width)
+                   for first_row, last_row in bands]
+
+    run_starts = array("i")
+    run_ends = array("i")
+    parent = array("i")
+    previous = []
+    for band_starts, band_ends, band_parent in results:
+        first_run = len(parent)
+        run_starts.extend(band_starts)
+        run_ends.extend(band_ends)
+        parent.extend(array("i", [root + first_run for root in band_parent]))
+        if not band_starts:
+            previous = []
+            continue
+        #joining the last row of the previous band to the first row of this band
+        first_row_start = band_starts[0] - band_starts[0] % width
+        current = []
+        for run in range(first_run, len(parent)):
+            if run_starts[run] >= first_row_start + width:
+                break
+            current.append((run_starts[run] - first_row_start, run_ends[run] - first_row_start, run))
+        if previous and previous[0][3] == first_row_start - width:
+            join_runs(parent, [run[:3] for run in previous], current)
+        last_row_start = run_starts[-1] - run_starts[-1] % width
+        previous = [(run_starts[run] - last_row_start, run_ends[run] - last_row_start, run, last_row_start)
+                    for run in range(bisect_right(run_starts, last_row_start - 1), len(parent))]
+
+    #numbering the roots in order and adding up the size of each component
+    run_labels = array("i", [0]) * len(parent)
+    sizes = []
+    for run in range(len(parent)):
+        root = parent[parent[run]]
+        parent[run] = root
+        if root == run:
+            run_labels[run] = len(sizes)
+            sizes.append(0)
+        else:
+            run_labels[run] = run_labels[root]
+        sizes[run_labels[run]] += run_ends[run] - run_starts[run]
+    return Components(grid, run_starts, run_ends, run_labels, sizes)
@@ -0,0 +1,311 @@
+from array import array
+from heapq import heappush, heappop
+from math import sqrt
+from .grid import Grid, SearchState, UP, DOWN, LEFT, RIGHT, OPEN_VALUES
+from .landmarks import landmark_index
+from .metrics import SearchMetrics
+
+#the directions in the order neighbours are visited and the direction leading back the way a move came
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+REVERSE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+#maps a neighbour mask to 1 unless the cell has exactly two open neighbours
+NOT_CORRIDOR = bytes(0 if bin(mask).count("1") == 2 else 1 for mask in range(256))
+
+class JunctionGraph:
+    """
+    This is a class designed to hold a maze with its corridors collapsed into weighted edges
+
+    Every open cell that does not have exactly two open neighbours becomes a node, as do the terminals such as the
+    start and end. The chains of cells between two nodes become a single edge weighted by its number of moves.
+    Edges are stored in compressed rows, so the edges of node n are edge_offsets[n] to edge_offsets[n+1]
+
+    Atributes:
+        self.grid - the grid the graph was built from
+        self.nodes - the cell of each node
+        self.node_index - the node of each cell, -1 for cells that are not nodes
+        self.edge_offsets - the index of the first edge of each node, with one extra entry at the end
+        self.edge_targets - the node each edge leads to
+        self.edge_weights - the number of moves along each edge
+        self.edge_corridors - the corridor of each edge, stored as ~corridor when it is walked backwards
+        self.corridor_offsets - the index of the first cell of each corridor, with one extra entry at the end
+        self.corridor_cells - the cells inside every corridor in the order they were walked
+    """
+
+    def __init__(self, grid:Grid, terminals:tuple=())->None:
+        """
+        Method used to build the junction graph of a grid
+
+        Parameters:
+            self - the current graph
+            grid - the grid of the maze
+            terminals - cells that must be kept as nodes, such as the start and end
+
+        Returns:
+            No return values
+        """
+        self.grid = grid
+        masks = grid.masks
+        size = grid.size
+        width = grid.width
+        #lists indexed by direction bit, which are faster to look up than dictionaries in the corridor walk
+        steps = [0] * 9
+        steps[UP], steps[DOWN], steps[LEFT], steps[RIGHT] = -width, width, -1, 1
+        reverse = [0] * 9
+        for direction, opposite in REVERSE.items():
+            reverse[direction] = opposite
+
+        #finding every open cell that is not in the middle of a corridor using whole grid operations
+        flags = (int.from_bytes(bytes(masks).translate(NOT_CORRIDOR), "little")
+                 & int.from_bytes(bytes(grid.walls).translate(OPEN_VALUES), "little")).to_bytes(size, "little")
+        flags = bytearray(flags)
+        for cell in terminals:
+            if cell != -1:
+                flags[cell] = 1
+        self.nodes = nodes = array("i")
+        self.node_index = node_index = array("i", [-1]) * size
+        cell = flags.find(1)
+        while cell != -1:
+            node_index[cell] = len(nodes)
+            nodes.append(cell)
+            cell = flags.find(1, cell + 1)
+
+        #walking every corridor once, marking the cells at both of its ends so it is not walked again from the other end
+        sources = array("i")
+        targets = array("i")
+        weights = array("i")
+        self.corridor_offsets = corridor_offsets = array("i", [0])
+        self.corridor_cells = corridor_cells = array("i")
+        add_cell = corridor_cells.append
+        walked = bytearray(size)
+        for node, cell in enumerate(nodes):
+            mask = masks[cell]
+            for direction in DIRECTIONS:
+                if not mask & direction:
+                    continue
+                current = cell + steps[direction]
+                if node_index[current] == -1:
+                    if walked[current]:
+                        continue
+                    walked[current] = 1
+                #nodes next to each other are joined by an edge with no corridor, which is added from the smaller node
+                elif node_index[current] < node:
+                    continue
+                came_from = reverse[direction]
+                weight = 1
+                while node_index[current] == -1:
+                    add_cell(current)
+                    move = masks[current] & ~came_from
+                    current += steps[move]
+                    came_from = reverse[move]
+                    weight += 1
+                if weight > 1:
+                    walked[corridor_cells[-1]] = 1
+                target = node_index[current]
+                corridor = len(corridor_offsets) - 1
+                corridor_offsets.append(len(corridor_cells))
+                sources.append(node)
+                targets.append(target)
+                weights.append(weight)
+
+        #placing both directions of every corridor into compressed rows with a counting sort on their source node
+        counts = array("i", [0]) * (len(nodes) + 1)
+        for node in sources:
+            counts[node + 1] += 1
+        for node in targets:
+            counts[node + 1] += 1
+        for node in range(len(nodes)):
+            counts[node + 1] += counts[node]
+        self.edge_offsets = counts
+        position = counts[:-1]
+        edge_count = 2 * len(sources)
+        self.edge_targets = edge_targets = array("i", [0]) * edge_count
+        self.edge_weights = edge_weights = array("i", [0]) * edge_count
+        self.edge_corridors = edge_corridors = array("i", [0]) * edge_count
+        for corridor, node in enumerate(sources):
+            target = targets[corridor]
+            weight = weights[corridor]
+            slot = position[node]
+            position[node] = slot + 1
+            edge_targets[slot] = target
+            edge_weights[slot] = weight
+            edge_corridors[slot] = corridor
+            slot = position[target]
+            position[target] = slot + 1
+            edge_targets[slot] = node
+            edge_weights[slot] = weight
+            edge_corridors[slot] = ~corridor
+
+    #the names of the buffers that make up a graph, in the order they are saved
+    BUFFERS = ("nodes", "node_index", "edge_offsets", "edge_targets", "edge_weights", "edge_corridors",
+               "corridor_offsets", "corridor_cells")
+
+    @classmethod
+    def from_buffers(cls, grid:Grid, buffers:dict):
+        """
+        Method used to rebuild a graph from buffers that were saved earlier, without walking the corridors again
+
+        Parameters:
+            cls - the junction graph class
+            grid - the grid the graph was built from
+            buffers - a dictionary linking each name in BUFFERS to its array
+
+        Returns:
+            The junction graph
+        """
+        graph = cls.__new__(cls)
+        graph.grid = grid
+        for name in cls.BUFFERS:
+            setattr(graph, name, buffers[name])
+        return graph
+
+    def node_count(self)->int:
+        """
+        Method used to find the number of nodes in the graph
+
+        Parameters:
+            self - the current graph
+
+        Returns:
+            The number of nodes
+        """
+        return len(self.nodes)
+
+    def compression_ratio(self)->float:
+        """
+        Method used to find how many open cells there are for every node of the graph
+
+        Parameters:
+            self - the current graph
+
+        Returns:
+            The number of open cells divided by the number of nodes
+        """
+        open_cells = self.grid.size - bytes(self.grid.walls).count(1)
+        return open_cells / len(self.nodes) if self.nodes else 0.0
+
+    def corridor(self, corridor:int)->array:
+        """
+        Method used to find the cells inside a corridor in the order they are walked
+
+        Parameters:
+            self - the current graph
+            corridor - the corridor of an edge, ~corridor when the edge walks it backwards
+
+        Returns:
+            The cells between the two nodes of the edge
+        """
+        if corridor >= 0:
+            return self.corridor_cells[self.corridor_offsets[corridor]:self.corridor_offsets[corridor + 1]]
+        corridor = ~corridor
+        cells = self.corridor_cells[self.corridor_offsets[corridor]:self.corridor_offsets[corridor + 1]]
+        cells.reverse()
+        return cells
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used by the graph
+
+        Parameters:
+            self - the current graph
+
+        Returns:
+            The size of the node, edge and corridor buffers in bytes
+        """
+        buffers = [getattr(self, name) for name in self.BUFFERS]
+        return sum(len(buffer) * buffer.itemsize for buffer in buffers)
+
+def contracted_search(graph:JunctionGraph, start_cell:int, goal_cell:int, heuristic_choice:str, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run A* search over the junction graph and rebuild the full path from the corridors
+
+        Parameters:
+            graph - the junction graph of the maze, built with the start and goal cells as terminals
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            heuristic_choice - the heuristic to use (manhattan/euclidean/alt)
+            metrics - the metrics the work of the search is added to, callbacks are given the cell of each node
+
+        Returns:
+            path - the full list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - the number of junction nodes explored by the algorithm
+            state - the search state holding the g values, parents and visited flags of the junction nodes
+    """
+    heuristic_choice = heuristic_choice.lower()
+    start_node = graph.node_index[start_cell]
+    goal_node = graph.node_index[goal_cell]
+    if start_node == -1 or goal_node == -1:
+        raise ValueError("the start and goal cells must be nodes of the junction graph")
+    state = SearchState(graph.node_count())
+    g_values = state.g
+    parent = state.parent
+    visited = state.visited
+    #the corridor used to reach each node
+    via = array("i", [0]) * graph.node_count()
+    nodes = graph.nodes
+    edge_offsets = graph.edge_offsets
+    edge_targets = graph.edge_targets
+    edge_weights = graph.edge_weights
+    edge_corridors = graph.edge_corridors
+    width = graph.grid.width
+    goal_x, goal_y = divmod(goal_cell, width)
+    euclidean = heuristic_choice == "euclidean"
+    landmarks = landmark_index(graph.grid) if heuristic_choice == "alt" else None
+
+    g_values[start_node] = 0
+    open_set = [(0, 0, start_node)]
+    nodes_explored = 0
+    stale = 0
+    reparents = 0
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+    while open_set:
+        current_f, current_h, current_node = heappop(open_set)
+        if visited[current_node]:
+            stale += 1
+            if metrics is not None:
+                metrics.open_size(len(open_set) + 1)
+            continue
+        nodes_explored += 1
+        visited[current_node] = 1
+        if metrics is not None:
+            metrics.expanded(nodes[current_node], g_values[current_node], len(open_set) + 1)
+        if current_node == goal_node:
+            break
+        current_g = g_values[current_node]
+        for edge in range(edge_offsets[current_node], edge_offsets[current_node + 1]):
+            target = edge_targets[edge]
+            if visited[target]:
+                continue
+            new_g = current_g + edge_weights[edge]
+            target_g = g_values[target]
+            if target_g != -1:
+                if new_g >= target_g:
+                    continue
+                reparents += 1
+            g_values[target] = new_g
+            parent[target] = current_node
+            via[target] = edge_corridors[edge]
+            if landmarks is not None:
+                new_h = landmarks.estimate(nodes[target], goal_cell)
+            else:
+                x, y = divmod(nodes[target], width)
+                new_h = sqrt((x - goal_x)**2 + (y - goal_y)**2) if euclidean else abs(x - goal_x) + abs(y - goal_y)
+            heappush(open_set, (new_g + new_h, new_h, target))
+            if on_enqueue is not None:
+                on_enqueue(nodes[target], new_g + new_h)
+    if metrics is not None:
+        pops = nodes_explored + stale
+        metrics.record(nodes_explored, pops + len(open_set), pops, stale, reparents)
+    if not visited[goal_node]:
+        return [], nodes_explored, state
+
+    #following the parents back and filling in the corridors between the nodes
+    path = [goal_cell]
+    node = goal_node
+    while node != start_node:
+        cells = graph.corridor(via[node])
+        cells.reverse()
+        path.extend(cells)
+        node = parent[node]
+        path.append(nodes[node])
+    path.reverse()
+    return path, nodes_explored, state
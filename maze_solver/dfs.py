@@ -0,0 +1,93 @@
+from .grid import Grid, SearchState, UP, DOWN, LEFT, RIGHT
+from .metrics import SearchMetrics
+
+def dfs_search(grid:Grid, start_cell:int, goal_cell:int, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run dfs on the maze from the start cell to the goal cell
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the dfs algorithm
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state holding the parents and visited cells
+    """
+    nodes_explored, state = dfs_explore(grid, start_cell, goal_cell, metrics)
+    if not state.visited[goal_cell]:
+        return [], nodes_explored, state
+    return state.path_to(goal_cell), nodes_explored, state
+
+def dfs_explore(grid:Grid, start_cell:int, goal_cell:int, metrics:SearchMetrics=None, state=None)->tuple:
+    """
+        Method used to run dfs on the maze without building the path
+
+        An explicit stack replaces the recursion, holding each cell on the current branch alongside the directions it
+        still has to try. Directions are tried lowest bit first, which is the order up, down, left, right, so the cells
+        are explored in the same order as the recursive traversal
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the dfs algorithm
+            metrics - the metrics the work of the search is added to, None to skip counting
+            state - the SearchState or QueryState to search on, it is reset first, a new SearchState if None
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the goal cell is visited in its generation if a path was found
+    """
+    if state is None:
+        state = SearchState(grid.size)
+    generation = state.reset()
+    parent = state.parent
+    visited = state.visited
+    masks = grid.masks
+    steps = [0] * 9
+    steps[UP], steps[DOWN], steps[LEFT], steps[RIGHT] = -grid.width, grid.width, -1, 1
+
+    visited[start_cell] = generation
+    parent[start_cell] = -1
+    nodes_explored = 1
+    if metrics is not None:
+        metrics.expanded(start_cell, 0, 1)
+    if start_cell == goal_cell:
+        if metrics is not None:
+            metrics.record(1, 1, 1)
+        return nodes_explored, state
+    #the stack is the open set of dfs, so its pushes and pops are counted
+    backtracks = 0
+    cells = [start_cell]
+    remaining = [masks[start_cell]]
+    while cells:
+        directions = remaining[-1]
+        if not directions:
+            #every neighbour has been tried, so the search backtracks
+            cells.pop()
+            remaining.pop()
+            backtracks += 1
+            continue
+        direction = directions & -directions
+        remaining[-1] = directions ^ direction
+        current_cell = cells[-1]
+        neighbour = current_cell + steps[direction]
+        if visited[neighbour] == generation:
+            continue
+        #caluclating the total number of nodes explored and setting the neighbour as visited
+        nodes_explored += 1
+        visited[neighbour] = generation
+        parent[neighbour] = current_cell
+        if metrics is not None:
+            metrics.expanded(neighbour, len(cells), len(cells) + 1)
+        if neighbour == goal_cell:
+            break
+        cells.append(neighbour)
+        remaining.append(masks[neighbour])
+    if metrics is not None:
+        #the goal is expanded without being pushed, every other explored cell is pushed once
+        pushes = nodes_explored - (1 if visited[goal_cell] == generation else 0)
+        metrics.record(nodes_explored, pushes, backtracks)
+    return nodes_explored, state
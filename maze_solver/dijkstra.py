@@ -0,0 +1,119 @@
+from .grid import Grid, SearchState
+from .a_star import calculate_heuristic
+from .metrics import SearchMetrics
+
+def dijkstra_search(grid:Grid, start_cell:int, goal_cell:int, heuristic_choice:str=None, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to find the cheapest path through a maze where each cell has a cost to step onto
+
+        Parameters:
+            grid - the grid of the maze, every open cell costs 1 if its costs are None
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search
+            heuristic_choice - the heuristic used to run A* over the costs (manhattan/euclidean/alt), Dijkstra is run
+                               if None
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, g holds the cost of the cheapest path found to each cell
+    """
+    nodes_explored, state = dijkstra_explore(grid, start_cell, goal_cell, heuristic_choice, metrics)
+    if not state.visited[goal_cell]:
+        return [], nodes_explored, state
+    return state.path_to(goal_cell), nodes_explored, state
+
+def dijkstra_explore(grid:Grid, start_cell:int, goal_cell:int, heuristic_choice:str=None, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run Dijkstra, or A* over the cell costs, without building the path
+
+        The open set is a bucket queue. Keys are whole numbers, and with a consistent heuristic the key of every cell
+        pushed lies between the smallest key in the open set and that key plus the largest cell cost plus the largest
+        change of the heuristic between neighbours. So a ring of that many lists, one for each key, holds the whole
+        open set, and taking the next cell only moves forward through the ring. The heuristics bound the number of
+        moves, so they are scaled by the cheapest cell cost and rounded down, which keeps them consistent
+
+        Parameters:
+            grid - the grid of the maze, every open cell costs 1 if its costs are None
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search
+            heuristic_choice - the heuristic used to run A* over the costs (manhattan/euclidean/alt), Dijkstra is run
+                               if None
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the goal cell is visited if a path was found
+    """
+    costs = grid.costs if grid.costs is not None else b"\x01" * grid.size
+    #the cheapest and dearest costs of the open cells, walls cost 0
+    cheapest = next((cost for cost in range(1, 256) if cost in costs), 1)
+    dearest = max(costs) or 1
+    state = SearchState(grid.size)
+    g_values = state.g
+    parent = state.parent
+    visited = state.visited
+    goal_x, goal_y = grid.coords(goal_cell)
+    if heuristic_choice is not None:
+        heuristic_choice = heuristic_choice.lower()
+        span = dearest + cheapest + 2
+
+        def estimate(cell:int)->int:
+            return int(cheapest * calculate_heuristic(grid, cell, goal_x, goal_y, heuristic_choice))
+    else:
+        span = dearest + 1
+
+        def estimate(cell:int)->int:
+            return 0
+
+    buckets = [[] for _ in range(span)]
+    g_values[start_cell] = 0
+    key = estimate(start_cell)
+    buckets[key % span].append(start_cell)
+    queued = 1
+    pushes = 1
+    nodes_explored = 0
+    stale = 0
+    reparents = 0
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+    while queued:
+        bucket = buckets[key % span]
+        if not bucket:
+            key += 1
+            continue
+        current_cell = bucket.pop()
+        queued -= 1
+        #a cell pushed again with a smaller key is closed before its older entries are reached
+        if visited[current_cell]:
+            stale += 1
+            if metrics is not None:
+                metrics.open_size(queued + 1)
+            continue
+        nodes_explored += 1
+        visited[current_cell] = 1
+        if metrics is not None:
+            metrics.expanded(current_cell, g_values[current_cell], queued + 1)
+        if current_cell == goal_cell:
+            break
+        current_g = g_values[current_cell]
+        for neighbour in grid.neighbours(current_cell):
+            if visited[neighbour]:
+                continue
+            new_g = current_g + costs[neighbour]
+            neighbour_g = g_values[neighbour]
+            if neighbour_g != -1:
+                if new_g >= neighbour_g:
+                    continue
+                reparents += 1
+            g_values[neighbour] = new_g
+            parent[neighbour] = current_cell
+            new_key = new_g + estimate(neighbour)
+            buckets[new_key % span].append(neighbour)
+            queued += 1
+            pushes += 1
+            if on_enqueue is not None:
+                on_enqueue(neighbour, new_key)
+    if metrics is not None:
+        metrics.record(nodes_explored, pushes, nodes_explored + stale, stale, reparents)
+    return nodes_explored, state
@@ -0,0 +1,571 @@
+import argparse
+import random
+import sys
+from array import array
+from timeit import default_timer as timer
+from .grid import Grid, WALL_CHARS
+
+#the number of rows turned into text at once when a maze is written
+TEXT_ROWS = 512
+
+def recursive_backtracker(height:int, width:int, seed:int=None)->bytearray:
+    """
+        Method used to carve a perfect maze using a depth first recursive backtracker
+
+        Rooms sit on odd rows and columns and the walls between them are knocked down as the maze is carved,
+        then an opening is made on the top row for the start and on the bottom row for the end
+
+        Parameters:
+            height - the number of rows in the maze, at least 3
+            width - the number of columns in the maze, at least 3
+            seed - the seed for the random number generator, a random maze is made if None
+
+        Returns:
+            A bytearray of height*width cells holding 1 for walls and 0 for open cells
+    """
+    check_size(height, width)
+    rng = random.Random(seed)
+    room_rows = (height - 1) // 2
+    room_cols = (width - 1) // 2
+    walls = bytearray(b"\x01") * (height * width)
+    visited = bytearray(room_rows * room_cols)
+    last_row = room_rows - 1
+    last_col = room_cols - 1
+    randrange = rng.randrange
+
+    #the stack holds rooms, an array keeps a path through millions of rooms to 4 bytes a room
+    stack = array("i", [0])
+    visited[0] = 1
+    walls[width + 1] = 0
+    while stack:
+        room = stack[-1]
+        room_x, room_y = divmod(room, room_cols)
+        #each option is (next room, step from the room cell to the wall cell between the rooms)
+        options = []
+        if room_x and not visited[room - room_cols]:
+            options.append((room - room_cols, -width))
+        if room_x < last_row and not visited[room + room_cols]:
+            options.append((room + room_cols, width))
+        if room_y and not visited[room - 1]:
+            options.append((room - 1, -1))
+        if room_y < last_col and not visited[room + 1]:
+            options.append((room + 1, 1))
+        if not options:
+            stack.pop()
+            continue
+        next_room, step = options[randrange(len(options))]
+        visited[next_room] = 1
+        #opening the wall between the two rooms and the next room
+        wall = (2 * room_x + 1) * width + 2 * room_y + 1 + step
+        walls[wall] = 0
+        walls[wall + step] = 0
+        stack.append(next_room)
+
+    open_entrances(walls, height, width, room_rows, room_cols, rng)
+    return walls
+
+def kruskal(height:int, width:int, seed:int=None)->bytearray:
+    """
+        Method used to carve a perfect maze by knocking down the walls between rooms in a random order
+
+        A wall is only knocked down when the rooms on either side are not yet joined, which is tracked with a
+        union find over the rooms. This gives many short dead ends rather than the long corridors of the backtracker
+
+        Parameters:
+            height - the number of rows in the maze, at least 3
+            width - the number of columns in the maze, at least 3
+            seed - the seed for the random number generator, a random maze is made if None
+
+        Returns:
+            A bytearray of height*width cells holding 1 for walls and 0 for open cells
+    """
+    check_size(height, width)
+    rng = random.Random(seed)
+    room_rows = (height - 1) // 2
+    room_cols = (width - 1) // 2
+    rooms = room_rows * room_cols
+    walls = bytearray(b"\x01") * (height * width)
+    for x in range(room_rows):
+        row = (2 * x + 1) * width
+        walls[row + 1:row + 2 * room_cols:2] = bytes(room_cols)
+
+    #the edge to the right of a room has the number of the room, the edge below it has the number plus rooms
+    edges = array("i")
+    for x in range(room_rows):
+        edges.extend(range(x * room_cols, (x + 1) * room_cols - 1))
+    edges.extend(range(rooms, 2 * rooms - room_cols))
+    rng.shuffle(edges)
+
+    parent = array("i", range(rooms))
+    joins = rooms - 1
+    for edge in edges:
+        if edge >= rooms:
+            room = edge - rooms
+            other = room + room_cols
+        else:
+            room = edge
+            other = room + 1
+        #finding both roots with path halving
+        while parent[room] != room:
+            parent[room] = parent[parent[room]]
+            room = parent[room]
+        while parent[other] != other:
+            parent[other] = parent[parent[other]]
+            other = parent[other]
+        if room == other:
+            continue
+        parent[room] = other
+        room_x, room_y = divmod(edge % rooms, room_cols)
+        if edge >= rooms:
+            walls[(2 * room_x + 2) * width + 2 * room_y + 1] = 0
+        else:
+            walls[(2 * room_x + 1) * width + 2 * room_y + 2] = 0
+        joins -= 1
+        if not joins:
+            break
+
+    open_entrances(walls, height, width, room_rows, room_cols, rng)
+    return walls
+
+def eller_rows(height:int, width:int, seed:int=None):
+    """
+        Method used to carve a perfect maze one row at a time with Eller's algorithm
+
+        Each room only remembers which set of joined rooms it is in. Neighbouring rooms in different sets are joined
+        at random, then every set carries on into the next row through at least one room, and the last row joins
+        every set left. Only the sets of one row are held, so the rows can be written as they are finished and a maze
+        of any height needs memory for a few rows
+
+        Parameters:
+            height - the number of rows in the maze, at least 3
+            width - the number of columns in the maze, at least 3
+            seed - the seed for the random number generator, a random maze is made if None
+
+        Returns:
+            A generator of the wall values of each row, holding 1 for walls and 0 for open cells
+    """
+    rng = random.Random(seed)
+    randbytes = rng.randbytes
+    room_rows = (height - 1) // 2
+    room_cols = (width - 1) // 2
+    start_y = 2 * rng.randrange(room_cols) + 1
+    end_y = 2 * rng.randrange(room_cols) + 1
+    row = bytearray(b"\x01") * width
+    row[start_y] = 0
+    yield row
+    #the set of each room in the row, numbered from 0 so a union find over the numbers fits in room_cols entries
+    sets = array("i", range(room_cols))
+    for x in range(room_rows):
+        last = x == room_rows - 1
+        parent = array("i", range(room_cols))
+        row = bytearray(b"\x01") * width
+        row[1:2 * room_cols:2] = bytes(room_cols)
+        #one random byte for each wall between neighbouring rooms, the last row knocks down every wall it can
+        joins = b"\x01" * room_cols if last else randbytes(room_cols)
+        for y in range(room_cols - 1):
+            if not joins[y] & 1:
+                continue
+            left = sets[y]
+            while parent[left] != left:
+                parent[left] = parent[parent[left]]
+                left = parent[left]
+            right = sets[y + 1]
+            while parent[right] != right:
+                parent[right] = parent[parent[right]]
+                right = parent[right]
+            if left != right:
+                parent[left] = right
+                row[2 * y + 2] = 0
+        yield row
+        if last:
+            break
+
+        remaining = array("i", [0]) * room_cols
+        for y in range(room_cols):
+            room_set = sets[y]
+            while parent[room_set] != room_set:
+                room_set = parent[room_set]
+            sets[y] = room_set
+            remaining[room_set] += 1
+        #the rooms going down keep their set under a new number and the others start sets of their own
+        below = bytearray(b"\x01") * width
+        downs = randbytes(room_cols)
+        numbers = array("i", [-1]) * room_cols
+        count = 0
+        for y in range(room_cols):
+            room_set = sets[y]
+            remaining[room_set] -= 1
+            #a set that has not gone down by its last room would be cut off from the rest of the maze
+            if downs[y] & 1 or (not remaining[room_set] and numbers[room_set] == -1):
+                below[2 * y + 1] = 0
+                if numbers[room_set] == -1:
+                    numbers[room_set] = count
+                    count += 1
+                sets[y] = numbers[room_set]
+            else:
+                sets[y] = -1
+        for y in range(room_cols):
+            if sets[y] == -1:
+                sets[y] = count
+                count += 1
+        yield below
+
+    #when the height is even there is an extra wall row to cut through below the last rooms
+    for x in range(2 * room_rows, height):
+        row = bytearray(b"\x01") * width
+        row[end_y] = 0
+        yield row
+
+def eller(height:int, width:int, seed:int=None)->bytearray:
+    """
+        Method used to carve a perfect maze with Eller's algorithm and gather its rows
+
+        Parameters:
+            height - the number of rows in the maze, at least 3
+            width - the number of columns in the maze, at least 3
+            seed - the seed for the random number generator, a random maze is made if None
+
+        Returns:
+            A bytearray of height*width cells holding 1 for walls and 0 for open cells
+    """
+    check_size(height, width)
+    return bytearray().join(eller_rows(height, width, seed))
+
+def add_loops(walls:bytearray, height:int, width:int, density:float, seed:int=None)->int:
+    """
+        Method used to braid a carved maze by knocking a wall out of some of its dead ends
+
+        Each dead end room is opened into a random neighbouring room behind one of its walls, which joins two
+        corridors and makes a loop, so the maze no longer has a single path between its cells
+
+        Parameters:
+            walls - the wall values of the maze, changed in place
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            density - the chance of each dead end being opened, 0 leaves the maze perfect and 1 removes every dead end
+            seed - the seed for the random number generator
+
+        Returns:
+            The number of walls knocked down
+    """
+    if not 0 <= density <= 1:
+        raise ValueError("the loop density must be between 0 and 1")
+    if density == 0:
+        return 0
+    rng = random.Random(seed)
+    room_rows = (height - 1) // 2
+    room_cols = (width - 1) // 2
+    #views of the rows, so the walls knocked down are written straight into the maze
+    view = memoryview(walls)
+    opened = 0
+    for x in range(room_rows):
+        top = 2 * x * width
+        opened += open_dead_ends(view[top:top + width], view[top + width:top + 2 * width], view[top + 2 * width:top + 3 * width],
+                                 x, room_rows, room_cols, density, rng)
+    return opened
+
+def braid_rows(rows, height:int, width:int, density:float, seed:int=None):
+    """
+        Method used to braid a carved maze given row by row, as add_loops does for a whole maze
+
+        Only the rows above and below the room row being braided are held, and the same seed knocks down the same
+        walls as add_loops
+
+        Parameters:
+            rows - an iterator over the wall values of each row of the maze, each row is changed in place
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            density - the chance of each dead end being opened, between 0 and 1
+            seed - the seed for the random number generator
+
+        Returns:
+            A generator of the rows of the braided maze
+    """
+    rng = random.Random(seed)
+    room_rows = (height - 1) // 2
+    room_cols = (width - 1) // 2
+    rows = iter(rows)
+    above = next(rows)
+    for x in range(room_rows):
+        row = next(rows)
+        below = next(rows)
+        open_dead_ends(above, row, below, x, room_rows, room_cols, density, rng)
+        #the row below may still lose a wall to the next room row, so it is held back
+        yield above
+        yield row
+        above = below
+    yield above
+    yield from rows
+
+def open_dead_ends(above, row, below, x:int, room_rows:int, room_cols:int, density:float, rng:random.Random)->int:
+    """
+        Method used to open some of the dead ends in one row of rooms into a neighbouring room
+
+        Parameters:
+            above - the wall values of the row above the rooms
+            row - the wall values of the row of rooms
+            below - the wall values of the row below the rooms
+            x - the number of the row of rooms
+            room_rows - the number of rows of rooms
+            room_cols - the number of columns of rooms
+            density - the chance of each dead end being opened
+            rng - the random number generator
+
+        Returns:
+            The number of walls knocked down
+    """
+    random_value = rng.random
+    opened = 0
+    for y in range(room_cols):
+        cell = 2 * y + 1
+        #a dead end has three of its four sides closed
+        if above[cell] + below[cell] + row[cell - 1] + row[cell + 1] != 3:
+            continue
+        if density < 1 and random_value() >= density:
+            continue
+        #only walls with a room behind them, so the outer wall stays closed
+        options = []
+        if x and above[cell]:
+            options.append((above, cell))
+        if x < room_rows - 1 and below[cell]:
+            options.append((below, cell))
+        if y and row[cell - 1]:
+            options.append((row, cell - 1))
+        if y < room_cols - 1 and row[cell + 1]:
+            options.append((row, cell + 1))
+        if options:
+            side, wall = options[rng.randrange(len(options))]
+            side[wall] = 0
+            opened += 1
+    return opened
+
+def check_size(height:int, width:int)->None:
+    """
+        Method used to check that a maze is large enough to hold a room and its openings
+
+        Parameters:
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+
+        Returns:
+            No return values
+    """
+    if height < 3 or width < 3:
+        raise ValueError("a maze must be at least 3 by 3")
+
+def open_entrances(walls:bytearray, height:int, width:int, room_rows:int, room_cols:int, rng:random.Random)->None:
+    """
+        Method used to open the start on the top row and the end on the bottom row of a carved maze
+
+        Parameters:
+            walls - the wall values of the maze
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            room_rows - the number of rows of rooms
+            room_cols - the number of columns of rooms
+            rng - the random number generator
+
+        Returns:
+            No return values
+    """
+    walls[2 * rng.randrange(room_cols) + 1] = 0
+    end_y = 2 * rng.randrange(room_cols) + 1
+    #when the height is even there is an extra wall row to cut through below the last rooms
+    for x in range(2 * room_rows, height):
+        walls[x * width + end_y] = 0
+
+def maze_to_text(width:int, height:int, walls:bytearray)->bytes:
+    """
+        Method used to write wall values in the space separated # and - format of the maze files
+
+        Parameters:
+            width - the number of columns in the maze
+            height - the number of rows in the maze
+            walls - the wall values of the maze
+
+        Returns:
+            The contents of the maze file
+    """
+    #the cells are separated by spaces, so the characters are interleaved with spaces in one slice assignment
+    line_length = 2 * width
+    text = bytearray(b" ") * (line_length * height)
+    chars = walls.translate(WALL_CHARS)
+    for x in range(height):
+        offset = x * line_length
+        text[offset:offset + line_length - 1:2] = chars[x * width:(x + 1) * width]
+        text[offset + line_length - 1] = 10
+    return bytes(text)
+
+#the generators that carve a perfect maze, by the name used on the command line
+GENERATORS = {"backtracker": recursive_backtracker, "kruskal": kruskal, "eller": eller}
+#the generators that can give the maze row by row as it is carved
+ROW_GENERATORS = {"eller": eller_rows}
+
+def write_text(maze_file, width:int, height:int, walls:bytearray)->None:
+    """
+        Method used to write wall values to an open file in bands of rows
+
+        Only one band of text is held at a time, so a maze of hundreds of millions of cells does not need its whole
+        text built in memory before it is written
+
+        Parameters:
+            maze_file - the binary file to write to
+            width - the number of columns in the maze
+            height - the number of rows in the maze
+            walls - the wall values of the maze
+
+        Returns:
+            No return values
+    """
+    write_rows(maze_file, width, (walls[x * width:(x + 1) * width] for x in range(height)))
+
+def write_rows(maze_file, width:int, rows)->None:
+    """
+        Method used to write the rows of a maze to an open file in bands as they are given
+
+        Parameters:
+            maze_file - the binary file to write to
+            width - the number of columns in the maze
+            rows - an iterator over the wall values of each row of the maze
+
+        Returns:
+            No return values
+    """
+    band = bytearray()
+    count = 0
+    for row in rows:
+        band += row
+        count += 1
+        if count == TEXT_ROWS:
+            maze_file.write(maze_to_text(width, count, band))
+            band = bytearray()
+            count = 0
+    if count:
+        maze_file.write(maze_to_text(width, count, band))
+
+def carve(height:int, width:int, seed:int=None, algorithm:str="backtracker", loops:float=0.0)->bytearray:
+    """
+        Method used to carve a maze with one of the generators and braid it
+
+        Parameters:
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            seed - the seed for the random number generator, a random maze is made if None
+            algorithm - the name of the generator to use (backtracker/kruskal/eller)
+            loops - the chance of each dead end being opened into a loop, 0 for a perfect maze
+
+        Returns:
+            A bytearray of height*width cells holding 1 for walls and 0 for open cells
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError("unknown maze generator %r, expected one of %s" %(algorithm, ", ".join(GENERATORS)))
+    if not 0 <= loops <= 1:
+        raise ValueError("the loop density must be between 0 and 1")
+    walls = GENERATORS[algorithm](height, width, seed)
+    #the loops use their own generator, so the same seed carves the same maze whatever the loop density
+    add_loops(walls, height, width, loops, None if seed is None else seed + 1)
+    return walls
+
+def carve_rows(height:int, width:int, seed:int=None, algorithm:str="backtracker", loops:float=0.0):
+    """
+        Method used to carve a maze with one of the generators and braid it, giving it back row by row
+
+        The generators in ROW_GENERATORS give each row as soon as it is finished, so the maze is never held whole.
+        The others carve the whole maze first. The same arguments give the same maze as carve
+
+        Parameters:
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            seed - the seed for the random number generator, a random maze is made if None
+            algorithm - the name of the generator to use (backtracker/kruskal/eller)
+            loops - the chance of each dead end being opened into a loop, 0 for a perfect maze
+
+        Returns:
+            An iterator over the wall values of each row of the maze
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError("unknown maze generator %r, expected one of %s" %(algorithm, ", ".join(GENERATORS)))
+    if not 0 <= loops <= 1:
+        raise ValueError("the loop density must be between 0 and 1")
+    check_size(height, width)
+    if algorithm in ROW_GENERATORS:
+        rows = ROW_GENERATORS[algorithm](height, width, seed)
+    else:
+        walls = GENERATORS[algorithm](height, width, seed)
+        rows = (walls[x * width:(x + 1) * width] for x in range(height))
+    if loops:
+        rows = braid_rows(rows, height, width, loops, None if seed is None else seed + 1)
+    return rows
+
+def generate_maze(height:int, width:int, seed:int=None, algorithm:str="backtracker", loops:float=0.0)->Grid:
+    """
+        Method used to generate a random maze
+
+        Parameters:
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            seed - the seed for the random number generator
+            algorithm - the name of the generator to use (backtracker/kruskal/eller)
+            loops - the chance of each dead end being opened into a loop
+
+        Returns:
+            The grid for the maze
+    """
+    return Grid(width, height, carve(height, width, seed, algorithm, loops))
+
+def write_maze(file_name:str, height:int, width:int, seed:int=None, algorithm:str="backtracker", loops:float=0.0)->None:
+    """
+        Method used to generate a random maze and write it to a file
+
+        Parameters:
+            file_name - the name of the file to write
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            seed - the seed for the random number generator
+            algorithm - the name of the generator to use (backtracker/kruskal/eller)
+            loops - the chance of each dead end being opened into a loop
+
+        Returns:
+            No return values
+    """
+    rows = carve_rows(height, width, seed, algorithm, loops)
+    with open(file_name, "wb") as maze_file:
+        write_rows(maze_file, width, rows)
+
+def main(argv:list=None)->int:
+    """
+        Method used to generate maze files from the command line
+
+        Parameters:
+            argv - the command line arguments, the arguments of the process are used if None
+
+        Returns:
+            The exit status, 0 if the maze was written and 1 otherwise
+    """
+    parser = argparse.ArgumentParser(prog="maze_solver.generate", description="Generate a random maze file in the # and - format.")
+    parser.add_argument("output", help="the file to write the maze to, - for standard output")
+    parser.add_argument("height", type=int, help="the number of rows in the maze")
+    parser.add_argument("width", type=int, nargs="?", help="the number of columns in the maze (default: the height)")
+    parser.add_argument("-a", "--algorithm", choices=GENERATORS, default="backtracker", help="the generator to use, eller writes each row as it is carved and needs memory for only a few rows (default: %(default)s)")
+    parser.add_argument("--loops", type=float, default=0.0, help="the chance of each dead end being opened into a loop, from 0 for a perfect maze to 1 for no dead ends (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="the seed for the random number generator, the same seed gives the same maze")
+    args = parser.parse_args(argv)
+
+    width = args.height if args.width is None else args.width
+    start = timer()
+    try:
+        rows = carve_rows(args.height, width, args.seed, args.algorithm, args.loops)
+        if args.output == "-":
+            write_rows(sys.stdout.buffer, width, rows)
+        else:
+            with open(args.output, "wb") as maze_file:
+                write_rows(maze_file, width, rows)
+    except (OSError, ValueError) as error:
+        print("The maze could not be generated: %s" %error, file=sys.stderr)
+        return 1
+    #the rows of eller are written while the maze is carved, so only the time of both together is given
+    print("Generated and wrote a %dx%d maze in %f seconds" %(args.height, width, timer() - start), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,609 @@
+from array import array
+
+#direction bits stored for every cell in Grid.masks, in the order neighbours are visited
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+
+#the characters a maze row may hold, the digits are open cells that cost that much to step onto
+MAZE_CHARS = b"#-123456789"
+#translation tables mapping the maze characters to wall values and wall values back to characters
+WALL_VALUES = bytes.maketrans(MAZE_CHARS, b"\x01" + b"\x00" * 10)
+#translation table mapping the maze characters to the cost of stepping onto each cell, 0 for walls
+COST_VALUES = bytes.maketrans(MAZE_CHARS, b"\x00\x01" + bytes(range(1, 10)))
+OPEN_VALUES = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+WALL_CHARS = bytes.maketrans(b"\x00\x01", b"-#")
+
+class Grid:
+    """
+    This is a class designed to hold the maze as a flat array of cells
+
+    Cells are indexed by row*width+col, so the cell for row x and column y is x*width+y
+
+    Atributes:
+        self.width - the number of columns in the maze
+        self.height - the number of rows in the maze
+        self.size - the total number of cells in the maze
+        self.walls - a bytearray, or a writable memoryview of a cache entry, holding 1 for every wall cell and 0 for
+                     every open cell
+        self.masks - a bytes object or read only memoryview holding the UP, DOWN, LEFT and RIGHT bits of the open neighbours of every cell
+        self.costs - a bytearray holding the cost of stepping onto every cell, None if every open cell costs 1
+        self.start - the cell index of the start, -1 if the maze has no start
+        self.end - the cell index of the end, -1 if the maze has no end
+        self.landmarks - the LandmarkIndex used by the alt heuristic, None until it is first needed
+    """
+
+    def __init__(self, width:int, height:int, walls:bytearray, masks:bytes=None, costs:bytearray=None)->None:
+        """
+        Method used to initialise a grid
+
+        Parameters:
+            self - the current grid
+            width - the number of columns in the maze
+            height - the number of rows in the maze
+            walls - a bytearray or writable memoryview of width*height cells holding 1 for walls and 0 for open cells
+            masks - the neighbour masks of the cells if they are already known, they are built from the walls if None
+            costs - the cost of stepping onto every cell, None if every open cell costs 1
+
+        Returns:
+            No return values
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.walls = walls
+        self.masks = masks if masks is not None else build_masks(width, height, walls)
+        self.costs = costs
+        #the start and end are the last open cells on the top and bottom rows
+        self.start = last_open(walls, 0, width)
+        end = last_open(walls, self.size - width, self.size)
+        self.end = end if height > 1 else -1
+        self.landmarks = None
+
+    def entrances(self)->list:
+        """
+        Method used to find every opening on the top row of the maze
+
+        Parameters:
+            self - the current grid
+
+        Returns:
+            The list of open cells on the top row, the start is the last of them
+        """
+        walls = self.walls
+        return [cell for cell in range(self.width) if not walls[cell]]
+
+    def exits(self)->list:
+        """
+        Method used to find every opening on the bottom row of the maze
+
+        Parameters:
+            self - the current grid
+
+        Returns:
+            The list of open cells on the bottom row, the end is the last of them, empty if the maze has one row
+        """
+        if self.height < 2:
+            return []
+        walls = self.walls
+        return [cell for cell in range(self.size - self.width, self.size) if not walls[cell]]
+
+    def cell_index(self, x_coord:int, y_coord:int)->int:
+        """
+        Method used to find the cell index for the given coordinates
+
+        Parameters:
+            self - the current grid
+            x_coord - the row of the cell
+            y_coord - the column of the cell
+
+        Returns:
+            The index of the cell
+        """
+        return x_coord * self.width + y_coord
+
+    def coords(self, cell:int)->tuple:
+        """
+        Method used to find the coordinates of the given cell
+
+        Parameters:
+            self - the current grid
+            cell - the index of the cell
+
+        Returns:
+            A tuple containing the x, y coordinates of the cell
+        """
+        return divmod(cell, self.width)
+
+    def is_open(self, cell:int)->bool:
+        """
+        Method used to check if a cell can be walked through
+
+        Parameters:
+            self - the current grid
+            cell - the index of the cell
+
+        Returns:
+            Whether or not the cell is open
+        """
+        return not self.walls[cell]
+
+    def neighbours(self, cell:int)->list:
+        """
+        Method used to find the open neighbours of a cell
+
+        Parameters:
+            self - the current grid
+            cell - the index of the cell
+
+        Returns:
+            A list of the open neighbouring cells in the order up, down, left, right
+        """
+        mask = self.masks[cell]
+        neighbours = []
+        if mask & UP:
+            neighbours.append(cell - self.width)
+        if mask & DOWN:
+            neighbours.append(cell + self.width)
+        if mask & LEFT:
+            neighbours.append(cell - 1)
+        if mask & RIGHT:
+            neighbours.append(cell + 1)
+        return neighbours
+
+    def set_wall(self, cell:int, wall:bool)->None:
+        """
+        Method used to open or close a cell once the grid has been built
+
+        The neighbour masks of the cell and the cells around it are updated, the start and end are found again if the
+        cell is on the top or bottom row, and the landmark index is dropped since its distances no longer hold
+
+        Parameters:
+            self - the current grid
+            cell - the index of the cell
+            wall - whether the cell becomes a wall
+
+        Returns:
+            No return values
+        """
+        if not isinstance(self.masks, bytearray):
+            #the masks may be bytes or part of a memory map, so they are copied the first time a cell changes
+            self.masks = bytearray(self.masks)
+        self.walls[cell] = 1 if wall else 0
+        width = self.width
+        column = cell % width
+        masks = self.masks
+        masks[cell] = self.cell_mask(cell)
+        if cell >= width:
+            masks[cell - width] = self.cell_mask(cell - width)
+        if cell + width < self.size:
+            masks[cell + width] = self.cell_mask(cell + width)
+        if column:
+            masks[cell - 1] = self.cell_mask(cell - 1)
+        if column != width - 1:
+            masks[cell + 1] = self.cell_mask(cell + 1)
+        if cell < width:
+            self.start = last_open(self.walls, 0, width)
+        if cell >= self.size - width and self.height > 1:
+            self.end = last_open(self.walls, self.size - width, self.size)
+        self.landmarks = None
+
+    def cell_mask(self, cell:int)->int:
+        """
+        Method used to work out the neighbour mask of a single cell from the walls
+
+        Parameters:
+            self - the current grid
+            cell - the index of the cell
+
+        Returns:
+            The UP, DOWN, LEFT and RIGHT bits of the open neighbours, 0 for wall cells
+        """
+        walls = self.walls
+        if walls[cell]:
+            return 0
+        width = self.width
+        column = cell % width
+        mask = 0
+        if cell >= width and not walls[cell - width]:
+            mask |= UP
+        if cell + width < self.size and not walls[cell + width]:
+            mask |= DOWN
+        if column and not walls[cell - 1]:
+            mask |= LEFT
+        if column != width - 1 and not walls[cell + 1]:
+            mask |= RIGHT
+        return mask
+
+    def display_matrix(self)->list:
+        """
+        Method used to turn the grid back into a 2D array of characters for display
+
+        Parameters:
+            self - the current grid
+
+        Returns:
+            A 2D array of the maze with the start marked S and the end marked E
+        """
+        text = bytes(self.walls).translate(WALL_CHARS).decode("ascii")
+        width = self.width
+        matrix = [list(text[offset:offset + width]) for offset in range(0, self.size, width)]
+        if self.start != -1:
+            matrix[0][self.start % width] = "S"
+        if self.end != -1:
+            matrix[-1][self.end % width] = "E"
+        return matrix
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used to store the cells of the grid
+
+        Parameters:
+            self - the current grid
+
+        Returns:
+            The size of the wall and neighbour buffers in bytes
+        """
+        return len(self.walls) + len(self.masks)
+
+class SearchState:
+    """
+    This is a class designed to hold the per search data for every cell of a grid
+
+    It has the same buffers as QueryState, so the searches can run on either, but it holds a single search, which is
+    always generation 1 with g values stored as they are
+
+    Atributes:
+        self.g - the g value for each cell, -1 if the cell has not been reached
+        self.parent - the previous cell in the path for each cell, -1 if there is none
+        self.visited - holds 1 for every cell that has been visited
+        self.generation - 1 once a search has started on the state, 0 before
+        self.base - the amount added to the stored g values, always 0
+    """
+
+    def __init__(self, size:int)->None:
+        """
+        Method used to initialise the search state
+
+        Parameters:
+            self - the current search state
+            size - the number of cells in the grid
+
+        Returns:
+            No return values
+        """
+        self.g = array("i", [-1]) * size
+        self.parent = array("i", [-1]) * size
+        self.visited = bytearray(size)
+        self.generation = 0
+        self.base = 0
+
+    def reset(self)->int:
+        """
+        Method used to start a search on the state, clearing it if a search has already been run on it
+
+        Parameters:
+            self - the current search state
+
+        Returns:
+            The generation of the search, always 1
+        """
+        if self.generation:
+            size = len(self.visited)
+            self.g = array("i", [-1]) * size
+            self.parent = array("i", [-1]) * size
+            self.visited = bytearray(size)
+        self.generation = 1
+        return self.generation
+
+    def path_to(self, cell:int)->list:
+        """
+        Method used to follow the parent cells back from a cell
+
+        Parameters:
+            self - the current search state
+            cell - the cell the path ends at
+
+        Returns:
+            The list of cells from the first cell of the search to the given cell
+        """
+        path = []
+        parent = self.parent
+        while cell != -1:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used by the search state
+
+        Parameters:
+            self - the current search state
+
+        Returns:
+            The size of the search state buffers in bytes
+        """
+        return (len(self.g) * self.g.itemsize + len(self.parent) * self.parent.itemsize
+                + len(self.visited))
+
+class QueryState:
+    """
+    This is a class designed to hold per search data that is reused by many searches on the same grid
+
+    Rather than clearing the buffers before every search, each search gets a new generation number and the data for
+    a cell only counts if the cell is stamped with the current generation, so starting a search costs nothing. The g
+    values are stored with base added, and base grows by the number of cells each generation, so a g value left by
+    an older search is always below base and reads as not reached
+
+    Atributes:
+        self.g - the g value plus base for each cell, below base if the cell was not reached in the current generation
+        self.parent - the previous cell in the path for each cell, only valid if the cell was reached in the current generation
+        self.visited - the generation in which each cell was last visited
+        self.generation - the number of the current search
+        self.base - the amount added to the g values of the current search
+    """
+
+    #the largest generation that fits in the stamp array
+    MAX_GENERATION = 2**32 - 1
+    #the largest base that leaves room for the g values in the stored values
+    MAX_BASE = 2**62
+
+    def __init__(self, size:int)->None:
+        """
+        Method used to initialise the query state
+
+        Parameters:
+            self - the current query state
+            size - the number of cells in the grid
+
+        Returns:
+            No return values
+        """
+        self.g = array("q", [-1]) * size
+        self.parent = array("i", [-1]) * size
+        self.visited = array("I", [0]) * size
+        self.generation = 0
+        self.base = 0
+
+    def reset(self)->int:
+        """
+        Method used to start a new search, invalidating the data of every cell
+
+        Parameters:
+            self - the current query state
+
+        Returns:
+            The generation of the new search
+        """
+        size = len(self.visited)
+        if self.generation == self.MAX_GENERATION or self.base + size > self.MAX_BASE:
+            #the stamps only have to be cleared once every 2**32 searches
+            self.g = array("q", [-1]) * size
+            self.visited = array("I", [0]) * size
+            self.generation = 0
+        self.generation += 1
+        self.base = (self.generation - 1) * size
+        return self.generation
+
+    def path_to(self, cell:int)->list:
+        """
+        Method used to follow the parent cells of the current search back from a cell
+
+        Parameters:
+            self - the current query state
+            cell - the cell the path ends at, it must have been reached in the current generation
+
+        Returns:
+            The list of cells from the first cell of the search to the given cell
+        """
+        path = []
+        parent = self.parent
+        while cell != -1:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def visited_cells(self)->bytearray:
+        """
+        Method used to find the cells visited by the current search
+
+        Parameters:
+            self - the current query state
+
+        Returns:
+            A bytearray holding 1 for every cell visited in the current generation
+        """
+        generation = self.generation
+        return bytearray(stamp == generation for stamp in self.visited)
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used by the query state
+
+        Parameters:
+            self - the current query state
+
+        Returns:
+            The size of the query state buffers in bytes
+        """
+        return sum(len(values) * values.itemsize for values in (self.g, self.parent, self.visited))
+
+def point_cell(grid:Grid, point)->int:
+    """
+        Method used to find the open cell for a point given as a cell index or a row and column
+
+        Parameters:
+            grid - the grid of the maze
+            point - either a cell index or a tuple of the row and column of the cell
+
+        Returns:
+            The index of the cell
+    """
+    if isinstance(point, int):
+        cell = point
+        inside = 0 <= cell < grid.size
+    else:
+        x_coord, y_coord = point
+        inside = 0 <= x_coord < grid.height and 0 <= y_coord < grid.width
+        cell = grid.cell_index(x_coord, y_coord)
+    if not inside:
+        raise ValueError("the point %r is outside the maze" %(point,))
+    if not grid.is_open(cell):
+        raise ValueError("the point %r is a wall" %(point,))
+    return cell
+
+def last_open(walls, first:int, last:int)->int:
+    """
+        Method used to find the last open cell in a range of cells
+
+        Parameters:
+            walls - the wall values of the maze, a bytearray or a memoryview
+            first - the first cell of the range
+            last - the cell after the end of the range
+
+        Returns:
+            The index of the last open cell in the range, -1 if every cell is a wall
+    """
+    if isinstance(walls, memoryview):
+        #memoryviews cannot be searched, so only the range is copied
+        found = bytes(walls[first:last]).rfind(0)
+        return found + first if found != -1 else -1
+    return walls.rfind(0, first, last)
+
+def parse_maze(data:bytes)->Grid:
+    """
+        Method used to build a grid from the contents of a maze file
+
+        Parameters:
+            data - the raw bytes of the maze file
+
+        Returns:
+            The grid for the maze
+    """
+    maze_width, maze_height, cells = read_cells(data)
+    walls = cells_to_walls(maze_width, maze_height, cells)
+    return Grid(maze_width, maze_height, walls, costs=read_costs(cells))
+
+def read_walls(data:bytes)->tuple:
+    """
+        Method used to turn the contents of a maze file into wall values
+
+        Parameters:
+            data - the raw bytes of the maze file
+
+        Returns:
+            maze_width - the number of columns in the maze
+            maze_height - the number of rows in the maze
+            walls - a bytearray holding 1 for every wall cell and 0 for every open cell
+    """
+    maze_width, maze_height, cells = read_cells(data)
+    return maze_width, maze_height, cells_to_walls(maze_width, maze_height, cells)
+
+def read_cells(data:bytes)->tuple:
+    """
+        Method used to find the cell characters of the rows of a maze file
+
+        Every line starting with # is a row of the maze made of space separated # and - characters, or digits for
+        open cells with a cost
+
+        Parameters:
+            data - the raw bytes of the maze file
+
+        Returns:
+            maze_width - the number of columns in the maze
+            maze_height - the number of rows in the maze
+            cells - the characters of every row joined together
+    """
+    #removing the separators and carriage returns in one pass and dropping lines that are not part of the maze
+    rows = [line for line in data.translate(None, b" \r").split(b"\n") if line.startswith(b"#")]
+    if not rows:
+        raise ValueError("the maze file does not contain a maze")
+    maze_width = len(rows[0])
+    maze_height = len(rows)
+    for row in rows:
+        if len(row) != maze_width:
+            raise ValueError("the rows of the maze are not all the same length")
+    cells = b"".join(rows)
+    if cells.translate(None, MAZE_CHARS):
+        raise ValueError("the maze may only contain #, - and digit characters")
+    return maze_width, maze_height, cells
+
+def cells_to_walls(maze_width:int, maze_height:int, cells:bytes)->bytearray:
+    """
+        Method used to turn the cell characters of a maze into wall values
+
+        Parameters:
+            maze_width - the number of columns in the maze
+            maze_height - the number of rows in the maze
+            cells - the characters of every row joined together
+
+        Returns:
+            A bytearray holding 1 for every wall cell and 0 for every open cell
+    """
+    walls = bytearray(cells.translate(WALL_VALUES))
+
+    #only the top and bottom rows may have openings in the outer columns
+    if maze_height > 2:
+        size = maze_width * maze_height
+        walls[maze_width:size - maze_width:maze_width] = b"\x01" * (maze_height - 2)
+        walls[2 * maze_width - 1:size - maze_width:maze_width] = b"\x01" * (maze_height - 2)
+    return walls
+
+def read_costs(cells:bytes)->bytearray:
+    """
+        Method used to find the cost of stepping onto every cell of a maze
+
+        Parameters:
+            cells - the characters of every row joined together
+
+        Returns:
+            A bytearray holding the cost of every cell, 1 for - and the digit for the others, None if the maze has no
+            digits so every open cell costs 1
+    """
+    if not cells.translate(None, b"#-"):
+        return None
+    return bytearray(cells.translate(COST_VALUES))
+
+def load_maze(file_name:str)->Grid:
+    """
+        Method used to read a maze file into a grid
+
+        Parameters:
+            file_name - the name of the maze file
+
+        Returns:
+            The grid for the maze
+    """
+    with open(file_name, "rb") as maze_file:
+        return parse_maze(maze_file.read())
+
+def build_masks(width:int, height:int, walls:bytearray)->bytes:
+    """
+        Method used to find the open neighbours of every cell at once
+
+        The cells are packed one per byte into a single integer so each direction is a shift of the whole grid
+
+        Parameters:
+            width - the number of columns in the maze
+            height - the number of rows in the maze
+            walls - the wall values of the maze
+
+        Returns:
+            A bytes object holding the UP, DOWN, LEFT and RIGHT bits for every cell
+    """
+    size = width * height
+    open_cells = int.from_bytes(walls.translate(OPEN_VALUES), "little")
+    #cells in the first column have no left neighbour and cells in the last column have no right neighbour
+    not_first_column = int.from_bytes((b"\x00" + b"\x01" * (width - 1)) * height, "little")
+    not_last_column = int.from_bytes((b"\x01" * (width - 1) + b"\x00") * height, "little")
+
+    up = open_cells & (open_cells << (8 * width))
+    down = open_cells & (open_cells >> (8 * width))
+    left = open_cells & (open_cells << 8) & not_first_column
+    right = open_cells & (open_cells >> 8) & not_last_column
+    masks = up | (down << 1) | (left << 2) | (right << 3)
+    return masks.to_bytes(size, "little")
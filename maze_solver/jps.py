@@ -0,0 +1,133 @@
+from heapq import heappush, heappop
+from .grid import Grid, SearchState, UP, DOWN, LEFT, RIGHT
+from .a_star import calculate_heuristic
+from .metrics import SearchMetrics
+
+#the directions in the order neighbours are visited, with the bits of the directions that turn off each of them
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+TURNS = {UP: LEFT | RIGHT, DOWN: LEFT | RIGHT, LEFT: UP | DOWN, RIGHT: UP | DOWN}
+REVERSE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+def jump(grid:Grid, cell:int, direction:int, step:int, goal_cell:int)->int:
+    """
+        Method used to move in a straight line from a cell until something worth stopping at is reached
+
+        The jump stops at the goal or at any cell with an open neighbour to either side, since only there can a
+        shortest path turn. A jump that runs into a wall first is a dead end
+
+        Parameters:
+            grid - the grid of the maze
+            cell - the cell the jump starts from
+            direction - the direction bit of the jump
+            step - the change in cell index for one move in the direction
+            goal_cell - the goal cell of the search
+
+        Returns:
+            The cell the jump stops at, -1 if the jump runs into a wall
+    """
+    masks = grid.masks
+    turns = TURNS[direction]
+    while masks[cell] & direction:
+        cell += step
+        if cell == goal_cell or masks[cell] & turns:
+            return cell
+    return -1
+
+def jump_point_search(grid:Grid, start_cell:int, goal_cell:int, heuristic_choice:str, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run jump point search, A* search over the jump points of the uniform cost maze
+
+        Straight corridors are skipped by jumping, so only the cells where a path can turn are added to the open set.
+        A jump point reached moving in one direction does not jump back the way it came
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            heuristic_choice - the heuristic to use (manhattan/euclidean/alt)
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            path - the full list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - the number of jump points explored by the algorithm
+            state - the search state holding the g values and parents of the jump points
+    """
+    heuristic_choice = heuristic_choice.lower()
+    state = SearchState(grid.size)
+    g_values = state.g
+    parent = state.parent
+    visited = state.visited
+    #the direction each jump point was last reached in, 0 for the start
+    arrival = bytearray(grid.size)
+    width = grid.width
+    steps = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+    goal_x, goal_y = grid.coords(goal_cell)
+    g_values[start_cell] = 0
+    open_set = [(0, 0, start_cell)]
+    nodes_explored = 0
+    stale = 0
+    reparents = 0
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+    path = []
+    while open_set:
+        current_f, current_h, current_cell = heappop(open_set)
+        if visited[current_cell]:
+            stale += 1
+            if metrics is not None:
+                metrics.open_size(len(open_set) + 1)
+            continue
+        nodes_explored += 1
+        visited[current_cell] = 1
+        if metrics is not None:
+            metrics.expanded(current_cell, g_values[current_cell], len(open_set) + 1)
+        if current_cell == goal_cell:
+            path = expand_path(grid, state.path_to(goal_cell))
+            break
+        came_from = REVERSE.get(arrival[current_cell], 0)
+        current_g = g_values[current_cell]
+        for direction in DIRECTIONS:
+            if direction == came_from:
+                continue
+            step = steps[direction]
+            jump_point = jump(grid, current_cell, direction, step, goal_cell)
+            if jump_point == -1 or visited[jump_point]:
+                continue
+            new_g = current_g + (jump_point - current_cell) // step
+            jump_g = g_values[jump_point]
+            if jump_g != -1:
+                if new_g >= jump_g:
+                    continue
+                reparents += 1
+            g_values[jump_point] = new_g
+            parent[jump_point] = current_cell
+            arrival[jump_point] = direction
+            new_h = calculate_heuristic(grid, jump_point, goal_x, goal_y, heuristic_choice)
+            heappush(open_set, (new_g + new_h, new_h, jump_point))
+            if on_enqueue is not None:
+                on_enqueue(jump_point, new_g + new_h)
+    if metrics is not None:
+        pops = nodes_explored + stale
+        metrics.record(nodes_explored, pops + len(open_set), pops, stale, reparents)
+    return path, nodes_explored, state
+
+def expand_path(grid:Grid, jump_points:list)->list:
+    """
+        Method used to fill in the cells between consecutive jump points
+
+        Parameters:
+            grid - the grid of the maze
+            jump_points - the list of jump points from the start to the goal
+
+        Returns:
+            The full list of cells from the start to the goal
+    """
+    path = jump_points[:1]
+    width = grid.width
+    for previous_cell, cell in zip(jump_points, jump_points[1:]):
+        #consecutive jump points always share a row or a column
+        if cell // width == previous_cell // width:
+            step = 1 if cell > previous_cell else -1
+        else:
+            step = width if cell > previous_cell else -width
+        path.extend(range(previous_cell + step, cell + step, step))
+    return path
@@ -0,0 +1,174 @@
+import sys
+from array import array
+from .grid import Grid, UP, DOWN, LEFT, RIGHT
+
+#the number of landmarks used when none is given
+DEFAULT_LANDMARKS = 8
+
+def bfs_distances(grid:Grid, source:int, nearest:array=None)->array:
+    """
+        Method used to find the number of moves from a cell to every other cell of the maze
+
+        Parameters:
+            grid - the grid of the maze
+            source - the cell the distances are measured from
+            nearest - distances to other sources that are lowered wherever the new source is closer, ignored if None
+
+        Returns:
+            An array holding the distance of every cell, -1 for walls and cells that cannot be reached
+    """
+    masks = grid.masks
+    width = grid.width
+    #the moves leading out of a cell for every neighbour mask, so no direction has to be tested in the loop
+    moves = [tuple(step for direction, step in ((UP, -width), (DOWN, width), (LEFT, -1), (RIGHT, 1)) if mask & direction)
+             for mask in range(16)]
+    distances = array("i", [-1]) * grid.size
+    distances[source] = 0
+    if nearest is not None:
+        nearest[source] = 0
+    layer = [source]
+    distance = 0
+    #expanding one whole layer at a time, so every cell in a layer shares the same distance
+    while layer:
+        distance += 1
+        next_layer = []
+        add_cell = next_layer.append
+        for cell in layer:
+            for step in moves[masks[cell]]:
+                neighbour = cell + step
+                if distances[neighbour] == -1:
+                    distances[neighbour] = distance
+                    add_cell(neighbour)
+        if nearest is not None:
+            for cell in next_layer:
+                if distance < nearest[cell]:
+                    nearest[cell] = distance
+        layer = next_layer
+    return distances
+
+def narrow(distances:array)->array:
+    """
+        Method used to store distances in the smallest unsigned type that holds them
+
+        Cells that cannot be reached become the largest value of the type
+
+        Parameters:
+            distances - the distances from bfs_distances
+
+        Returns:
+            An array of type H if every distance fits in 16 bits, otherwise an array of type I
+    """
+    wide = array("I")
+    wide.frombytes(distances.tobytes())
+    if max(distances) >= 0xFFFF:
+        return wide
+    #keeping the low half of every value, so -1 becomes 0xFFFF
+    data = wide.tobytes()
+    low = bytearray(2 * len(wide))
+    first = 0 if sys.byteorder == "little" else 2
+    low[0::2] = data[first::4]
+    low[1::2] = data[first + 1::4]
+    compact = array("H")
+    compact.frombytes(bytes(low))
+    return compact
+
+class LandmarkIndex:
+    """
+    This is a class designed to hold the distances from a few landmark cells to every cell of a maze
+
+    For any landmark L the triangle inequality gives |d(L, goal) - d(L, cell)| <= d(cell, goal), so the largest of
+    these differences is a consistent heuristic for A* (the ALT heuristic). Unlike the manhattan and euclidean
+    distances it follows the corridors of the maze, which makes it far tighter in winding mazes. Landmarks are chosen
+    one at a time as the reachable cell furthest from every landmark chosen so far, which spreads them around the
+    edges of the maze
+
+    Atributes:
+        self.grid - the grid the index was built for
+        self.landmarks - the cell of each landmark
+        self.distances - a list holding the distance array of each landmark
+        self.unreachable - the value stored for cells a landmark cannot reach, one for each landmark
+    """
+
+    def __init__(self, grid:Grid, count:int=DEFAULT_LANDMARKS, seed_cell:int=None)->None:
+        """
+        Method used to choose the landmarks and find their distances
+
+        Parameters:
+            self - the current index
+            grid - the grid of the maze
+            count - the number of landmarks
+            seed_cell - the cell the first landmark is chosen to be furthest from, the start of the maze if None
+
+        Returns:
+            No return values
+        """
+        self.grid = grid
+        self.landmarks = array("i")
+        self.distances = []
+        self.unreachable = []
+        if seed_cell is None:
+            seed_cell = grid.start if grid.start != -1 else bytes(grid.walls).find(0)
+        if seed_cell == -1:
+            return
+        #the distance from every cell to its closest landmark, cells outside the seed's region stay at -1
+        nearest = bfs_distances(grid, seed_cell)
+        for _ in range(count):
+            furthest = max(nearest)
+            if furthest <= 0 and len(self.landmarks):
+                break
+            landmark = nearest.index(furthest)
+            distances = bfs_distances(grid, landmark, nearest)
+            self.landmarks.append(landmark)
+            compact = narrow(distances)
+            self.distances.append(compact)
+            self.unreachable.append(0xFFFF if compact.typecode == "H" else 0xFFFFFFFF)
+
+    def estimate(self, cell:int, goal_cell:int)->int:
+        """
+        Method used to find the ALT lower bound on the distance between two cells
+
+        Parameters:
+            self - the current index
+            cell - the current cell
+            goal_cell - the goal cell
+
+        Returns:
+            The largest landmark difference, 0 if no landmark reaches both cells
+        """
+        best = 0
+        for distances, unreachable in zip(self.distances, self.unreachable):
+            to_goal = distances[goal_cell]
+            to_cell = distances[cell]
+            if to_goal == unreachable or to_cell == unreachable:
+                continue
+            difference = to_goal - to_cell if to_goal > to_cell else to_cell - to_goal
+            if difference > best:
+                best = difference
+        return best
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used by the distance arrays
+
+        Parameters:
+            self - the current index
+
+        Returns:
+            The combined size of the landmark and distance arrays in bytes
+        """
+        return (len(self.landmarks) * self.landmarks.itemsize
+                + sum(len(distances) * distances.itemsize for distances in self.distances))
+
+def landmark_index(grid:Grid)->LandmarkIndex:
+    """
+        Method used to find the landmark index of a grid, building it the first time it is needed
+
+        Parameters:
+            grid - the grid of the maze
+
+        Returns:
+            The landmark index stored on the grid
+    """
+    if grid.landmarks is None:
+        grid.landmarks = LandmarkIndex(grid)
+    return grid.landmarks
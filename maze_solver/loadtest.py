@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+from timeit import default_timer as timer
+from .grid import load_maze
+from .service import DEFAULT_PORT, SolveService
+
+def build_requests(mazes:list, count:int, algorithm:str, heuristic:str, distinct:int, seed:int)->list:
+    """
+        Method used to build the requests sent by the load test
+
+        Requests are drawn from a fixed set of distinct solves, so the share of cache hits can be chosen
+
+        Parameters:
+            mazes - the file names of the mazes to solve
+            count - the number of requests
+            algorithm - the search algorithm to ask for
+            heuristic - the heuristic to ask for
+            distinct - the number of different random start and goal pairs on each maze, 0 to only solve from the start to the end
+            seed - the seed used to choose the pairs and the order of the requests
+
+        Returns:
+            A list of request dictionaries
+    """
+    rng = random.Random(seed)
+    solves = []
+    for file_name in mazes:
+        if distinct <= 0:
+            solves.append({"maze": file_name})
+            continue
+        grid = load_maze(file_name)
+        open_cells = [cell for cell in range(grid.size) if grid.is_open(cell)]
+        for _ in range(distinct):
+            start = grid.coords(rng.choice(open_cells))
+            goal = grid.coords(rng.choice(open_cells))
+            solves.append({"maze": file_name, "start": list(start), "goal": list(goal)})
+    requests = []
+    for number in range(count):
+        request = dict(rng.choice(solves))
+        request.update({"id": number, "algorithm": algorithm, "heuristic": heuristic, "path": False})
+        requests.append(request)
+    return requests
+
+async def run_client(host:str, port:int, requests:list, depth:int, results:list)->None:
+    """
+        Method used to send requests over one connection, keeping up to depth of them in flight
+
+        Parameters:
+            host - the address of the service
+            port - the port of the service
+            requests - the requests to send
+            depth - the number of requests sent before waiting for a response
+            results - the list each (latency, response) tuple is added to
+
+        Returns:
+            No return values
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = {}
+    in_flight = asyncio.Semaphore(depth)
+
+    async def receive()->None:
+        for _ in range(len(requests)):
+            line = await reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            results.append((timer() - sent.pop(response.get("id")), response))
+            in_flight.release()
+
+    receiver = asyncio.create_task(receive())
+    for request in requests:
+        await in_flight.acquire()
+        sent[request["id"]] = timer()
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+
+def percentile(ordered:list, percent:int)->float:
+    """
+        Method used to find a nearest rank percentile
+
+        Parameters:
+            ordered - the sorted samples
+            percent - the percentile to find
+
+        Returns:
+            The sample at the percentile, 0 if there are no samples
+    """
+    if not ordered:
+        return 0.0
+    return ordered[max(0, -(-percent * len(ordered) // 100) - 1)]
+
+async def load_test(host:str, port:int, requests:list, connections:int, depth:int, spawn_workers:int=None)->dict:
+    """
+        Method used to send the requests across several connections and summarise the responses
+
+        Parameters:
+            host - the address of the service
+            port - the port of the service
+            requests - the requests to send
+            connections - the number of connections the requests are spread over
+            depth - the number of requests each connection keeps in flight
+            spawn_workers - start a service in this process with this many workers rather than using a running one,
+                            ignored if None
+
+        Returns:
+            A dictionary holding the throughput, latency percentiles and counts of the responses
+    """
+    service = None
+    server = None
+    if spawn_workers is not None:
+        service = SolveService(spawn_workers)
+        server = await service.start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+    results = []
+    try:
+        began = timer()
+        await asyncio.gather(*(run_client(host, port, requests[number::connections], depth, results)
+                               for number in range(connections)))
+        seconds = timer() - began
+    finally:
+        if server is not None:
+            server.close()
+            #the clients have closed their connections, so the handlers finish once they read the end of the stream
+            await asyncio.gather(*service.connections, return_exceptions=True)
+            await server.wait_closed()
+            service.close()
+    latencies = sorted(latency for latency, _ in results)
+    answered = [response for _, response in results if response.get("ok")]
+    return {
+        "requests": len(results),
+        "ok": len(answered),
+        "busy": sum(1 for _, response in results if response.get("error") == "busy"),
+        "errors": sum(1 for _, response in results if not response.get("ok") and response.get("error") != "busy"),
+        "cached": sum(1 for response in answered if response.get("cached")),
+        "seconds": seconds,
+        "requests_per_second": len(results) / seconds if seconds > 0 else 0.0,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_max": latencies[-1] if latencies else 0.0,
+        "mean_solve": sum(response["timings"]["solve"] for response in answered) / max(len(answered), 1),
+    }
+
+def main(argv:list=None)->int:
+    """
+        Method used to run the load test from the command line
+
+        Parameters:
+            argv - the command line arguments, the arguments of the process are used if None
+
+        Returns:
+            The exit status, 0 if every request was answered without an error other than busy
+    """
+    parser = argparse.ArgumentParser(prog="maze_solver.loadtest", description="Send many solve requests to the maze service and report throughput and latency.")
+    parser.add_argument("mazes", nargs="+", help="the maze files to solve, read by the service")
+    parser.add_argument("--host", default="127.0.0.1", help="the address of the service (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="the port of the service (default: %(default)s)")
+    parser.add_argument("--spawn", type=int, metavar="WORKERS", help="start a service with this many workers inside the load test instead of using a running one")
+    parser.add_argument("-n", "--requests", type=int, default=500, help="the number of requests (default: %(default)s)")
+    parser.add_argument("-c", "--connections", type=int, default=8, help="the number of connections (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=4, help="the requests each connection keeps in flight (default: %(default)s)")
+    parser.add_argument("--distinct", type=int, default=50, help="different random start and goal pairs per maze, 0 to only solve from the start to the end (default: %(default)s)")
+    parser.add_argument("-a", "--algorithm", default="astar", help="the search algorithm to ask for (default: %(default)s)")
+    parser.add_argument("--heuristic", default="manhattan", help="the heuristic to ask for (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=2423, help="the seed for the requests")
+    args = parser.parse_args(argv)
+
+    requests = build_requests(args.mazes, args.requests, args.algorithm, args.heuristic, args.distinct, args.seed)
+    try:
+        summary = asyncio.run(load_test(args.host, args.port, requests, max(args.connections, 1), max(args.depth, 1), args.spawn))
+    except OSError as error:
+        print("Could not reach the service: %s" %error, file=sys.stderr)
+        return 1
+    print("%(requests)d requests in %(seconds)f seconds: %(requests_per_second).1f requests/second" %summary)
+    print("ok %(ok)d, cached %(cached)d, busy %(busy)d, errors %(errors)d" %summary)
+    print("latency p50 %(latency_p50)f, p95 %(latency_p95)f, max %(latency_max)f, mean solve %(mean_solve)f" %summary)
+    return 0 if summary["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#the counts kept by SearchMetrics, in the order they are reported
+COUNTERS = ("expansions", "pushes", "pops", "stale", "reparents", "max_open")
+
+class SearchMetrics:
+    """
+    This is a class designed to count the work done by the searches and to report their progress through callbacks
+
+    Searches keep their counts in local variables and add them here once they finish, so a search run without metrics
+    only pays for a few checks against None. The open set size and the callbacks are only looked at when metrics are
+    given. One SearchMetrics may be passed to several searches to add up their work
+
+    Atributes:
+        self.expansions - the number of cells or nodes taken from the open set and expanded
+        self.pushes - the number of entries added to the open set
+        self.pops - the number of entries taken from the open set, including stale ones
+        self.stale - the number of entries skipped because their cell had already been expanded
+        self.reparents - the number of times a cheaper path replaced the parent of a cell already in the open set
+        self.max_open - the largest number of entries in the open set at once
+        self.on_expand - called with the cell and its g value each time a cell is expanded, None to skip
+        self.on_enqueue - called with the cell and its priority each time a cell is added to the open set, None to skip
+    """
+
+    def __init__(self, on_expand=None, on_enqueue=None)->None:
+        """
+        Method used to initialise the metrics
+
+        Parameters:
+            self - the current metrics
+            on_expand - called with the cell and its g value each time a cell is expanded, None to skip
+            on_enqueue - called with the cell and its priority each time a cell is added to the open set, None to skip
+
+        Returns:
+            No return values
+        """
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+        self.stale = 0
+        self.reparents = 0
+        self.max_open = 0
+        self.on_expand = on_expand
+        self.on_enqueue = on_enqueue
+
+    def expanded(self, cell:int, g_value, open_size:int)->None:
+        """
+        Method used by the searches each time a cell is expanded
+
+        Parameters:
+            self - the current metrics
+            cell - the cell being expanded
+            g_value - the g value of the cell
+            open_size - the number of entries in the open set before the cell was taken from it
+
+        Returns:
+            No return values
+        """
+        if open_size > self.max_open:
+            self.max_open = open_size
+        if self.on_expand is not None:
+            self.on_expand(cell, g_value)
+
+    def open_size(self, open_size:int)->None:
+        """
+        Method used by the searches to report the size of the open set when no cell is expanded
+
+        Parameters:
+            self - the current metrics
+            open_size - the number of entries in the open set
+
+        Returns:
+            No return values
+        """
+        if open_size > self.max_open:
+            self.max_open = open_size
+
+    def record(self, expansions:int, pushes:int, pops:int, stale:int=0, reparents:int=0)->None:
+        """
+        Method used by the searches to add their counts once they finish
+
+        Parameters:
+            self - the current metrics
+            expansions - the number of cells expanded
+            pushes - the number of entries added to the open set
+            pops - the number of entries taken from the open set
+            stale - the number of stale entries skipped
+            reparents - the number of parents replaced by cheaper paths
+
+        Returns:
+            No return values
+        """
+        self.expansions += expansions
+        self.pushes += pushes
+        self.pops += pops
+        self.stale += stale
+        self.reparents += reparents
+
+    def to_dict(self)->dict:
+        """
+        Method used to turn the counts into a dictionary that can be written as JSON
+
+        Parameters:
+            self - the current metrics
+
+        Returns:
+            A dictionary linking the name of each count to its value
+        """
+        return {name: getattr(self, name) for name in COUNTERS}
@@ -0,0 +1,325 @@
+from heapq import heappush, heappop
+from array import array
+from itertools import compress
+from math import sqrt
+from .grid import Grid, SearchState, UP, DOWN, LEFT, RIGHT
+from .landmarks import landmark_index
+from .metrics import SearchMetrics
+
+def multi_source_search(grid:Grid, sources:list, targets:list, heuristic_choice:str="manhattan", metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run A* from several start cells at once and stop at the nearest of several goal cells
+
+        Every source goes into the open set with a g value of 0, which is the same as searching from a virtual cell
+        joined to every source. The heuristic from nearest_target_heuristic is a consistent lower bound on the
+        distance to the closest target, so the first target taken from the open set is the closest one to any source
+
+        Parameters:
+            grid - the grid of the maze
+            sources - the cells the search starts from
+            targets - the cells the search may end at
+            heuristic_choice - the heuristic to use (manhattan/euclidean/alt)
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the nearest source to the nearest target, empty if no target can be reached
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the parents of every source are -1
+    """
+    heuristic_choice = heuristic_choice.lower()
+    state = SearchState(grid.size)
+    g_values = state.g
+    visited = state.visited
+    parent = state.parent
+    is_target = bytearray(grid.size)
+    for cell in targets:
+        is_target[cell] = 1
+    if not targets:
+        return [], 0, state
+    estimate = nearest_target_heuristic(grid, targets, heuristic_choice)
+    open_set = []
+    for cell in sources:
+        if g_values[cell] == -1:
+            g_values[cell] = 0
+            new_h = estimate(cell)
+            heappush(open_set, (new_h, new_h, cell))
+    pushes = len(open_set)
+    nodes_explored = 0
+    stale = 0
+    reparents = 0
+    reached = -1
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+    while open_set:
+        current_f, current_h, current_cell = heappop(open_set)
+        if visited[current_cell]:
+            stale += 1
+            if metrics is not None:
+                metrics.open_size(len(open_set) + 1)
+            continue
+        nodes_explored += 1
+        visited[current_cell] = 1
+        if metrics is not None:
+            metrics.expanded(current_cell, g_values[current_cell], len(open_set) + 1)
+        if is_target[current_cell]:
+            reached = current_cell
+            break
+        new_g = g_values[current_cell] + 1
+        for neighbour in grid.neighbours(current_cell):
+            if visited[neighbour]:
+                continue
+            neighbour_g = g_values[neighbour]
+            if neighbour_g != -1:
+                if new_g >= neighbour_g:
+                    continue
+                reparents += 1
+            g_values[neighbour] = new_g
+            parent[neighbour] = current_cell
+            new_h = estimate(neighbour)
+            heappush(open_set, (new_g + new_h, new_h, neighbour))
+            pushes += 1
+            if on_enqueue is not None:
+                on_enqueue(neighbour, new_g + new_h)
+    if metrics is not None:
+        metrics.record(nodes_explored, pushes, nodes_explored + stale, stale, reparents)
+    if reached == -1:
+        return [], nodes_explored, state
+    return state.path_to(reached), nodes_explored, state
+
+def nearest_target_heuristic(grid:Grid, targets:list, heuristic_choice:str):
+    """
+        Method used to build a heuristic estimating the distance from a cell to the closest of several targets
+
+        Taking the smallest heuristic to each target costs a loop over the targets for every cell. Instead, for the
+        manhattan and euclidean distances the distance along each target row to the closest target column is found
+        once, so a cell only looks at each row holding targets. For alt the triangle inequality gives
+        d(cell, target) >= max(low - d(L, cell), d(L, cell) - high) where low and high are the smallest and largest
+        distances from the landmark L to any target, so only two numbers are kept for each landmark
+
+        Parameters:
+            grid - the grid of the maze
+            targets - the cells the search may end at
+            heuristic_choice - the lower case name of the heuristic to use (manhattan/euclidean/alt)
+
+        Returns:
+            A function taking a cell and returning its h value
+    """
+    width = grid.width
+    if heuristic_choice == "alt":
+        landmarks = landmark_index(grid)
+        bounds = []
+        for distances, unreachable in zip(landmarks.distances, landmarks.unreachable):
+            reached = [distances[cell] for cell in targets if distances[cell] != unreachable]
+            #a landmark that reaches no target says nothing about the cells it reaches
+            if reached:
+                bounds.append((distances, unreachable, min(reached), max(reached)))
+
+        def estimate(cell:int)->int:
+            best = 0
+            for distances, unreachable, low, high in bounds:
+                to_cell = distances[cell]
+                if to_cell == unreachable:
+                    continue
+                difference = low - to_cell if to_cell < low else to_cell - high
+                if difference > best:
+                    best = difference
+            return best
+        return estimate
+
+    #the distance along each row holding targets from every column to the closest target column
+    rows = {}
+    for cell in targets:
+        row, column = divmod(cell, width)
+        rows.setdefault(row, array("i", [width]) * width)[column] = 0
+    for gaps in rows.values():
+        for column in range(1, width):
+            if gaps[column - 1] + 1 < gaps[column]:
+                gaps[column] = gaps[column - 1] + 1
+        for column in range(width - 2, -1, -1):
+            if gaps[column + 1] + 1 < gaps[column]:
+                gaps[column] = gaps[column + 1] + 1
+    rows = list(rows.items())
+    euclidean = heuristic_choice == "euclidean"
+
+    def estimate(cell:int):
+        x, y = divmod(cell, width)
+        best = None
+        for row, gaps in rows:
+            if euclidean:
+                distance = sqrt((x - row)**2 + gaps[y]**2)
+            else:
+                distance = abs(x - row) + gaps[y]
+            if best is None or distance < best:
+                best = distance
+        return best
+    return estimate
+
+#the number of open neighbours of a cell for every neighbour mask
+DEGREES = bytes(bin(mask).count("1") for mask in range(256))
+#the largest number of searches all_pairs_paths runs before giving up on a maze with loops
+MAX_SEARCHES = 64
+
+def breadth_first_tree(grid:Grid, root:int, targets:list=None, metrics:SearchMetrics=None)->tuple:
+    """
+        Method used to run a breadth first search from a cell until every target has been reached
+
+        Parameters:
+            grid - the grid of the maze
+            root - the cell the search starts from
+            targets - the cells the search has to reach before it stops, None to reach every cell it can
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, following the parents from any reached cell leads back to the root
+    """
+    masks = grid.masks
+    width = grid.width
+    #the moves leading out of a cell for every neighbour mask, so no direction has to be tested in the loop
+    moves = [tuple(step for direction, step in ((UP, -width), (DOWN, width), (LEFT, -1), (RIGHT, 1)) if mask & direction)
+             for mask in range(16)]
+    state = SearchState(grid.size)
+    g_values = state.g
+    parent = state.parent
+    visited = state.visited
+    remaining = None if targets is None else set(targets)
+    if remaining is not None:
+        remaining.discard(root)
+    g_values[root] = 0
+    layer = [root]
+    distance = 0
+    nodes_explored = 0
+    pushes = 1
+    on_enqueue = metrics.on_enqueue if metrics is not None else None
+    #expanding one whole layer at a time and stopping after the layer that reaches the last target
+    while layer and (remaining is None or remaining):
+        distance += 1
+        next_layer = []
+        add_cell = next_layer.append
+        for cell in layer:
+            visited[cell] = 1
+            if metrics is not None:
+                metrics.expanded(cell, distance - 1, len(layer))
+            for step in moves[masks[cell]]:
+                neighbour = cell + step
+                if g_values[neighbour] == -1:
+                    g_values[neighbour] = distance
+                    parent[neighbour] = cell
+                    add_cell(neighbour)
+                    if on_enqueue is not None:
+                        on_enqueue(neighbour, distance)
+        nodes_explored += len(layer)
+        pushes += len(next_layer)
+        if remaining is not None:
+            remaining.difference_update(next_layer)
+        layer = next_layer
+    if metrics is not None:
+        metrics.record(nodes_explored, pushes, nodes_explored)
+    return nodes_explored, state
+
+def is_tree(grid:Grid, state:SearchState)->bool:
+    """
+        Method used to check if the part of the maze reached by a search that was not stopped early has no loops
+
+        Parameters:
+            grid - the grid of the maze
+            state - the state of a breadth first search run with no targets
+
+        Returns:
+            True if there is exactly one path without repeated cells between any two cells the search reached
+    """
+    cells = state.visited.count(1)
+    #each move between two reached cells is counted once from either end, and a tree has one move fewer than cells
+    return sum(compress(bytes(grid.masks).translate(DEGREES), state.visited)) == 2 * (cells - 1)
+
+def tree_path(state:SearchState, source:int, target:int)->list:
+    """
+        Method used to find the path between two cells of a maze with no loops from a search rooted at any cell
+
+        Parameters:
+            state - the state of a breadth first search that reached both cells
+            source - the cell the path starts at
+            target - the cell the path ends at
+
+        Returns:
+            The list of cells from the source to the target, found by climbing from both to the cell where their
+            parents meet
+    """
+    g_values = state.g
+    parent = state.parent
+    head = []
+    tail = []
+    while g_values[source] > g_values[target]:
+        head.append(source)
+        source = parent[source]
+    while g_values[target] > g_values[source]:
+        tail.append(target)
+        target = parent[target]
+    while source != target:
+        head.append(source)
+        tail.append(target)
+        source = parent[source]
+        target = parent[target]
+    head.append(source)
+    head.extend(reversed(tail))
+    return head
+
+def all_pairs_paths(grid:Grid, sources:list=None, targets:list=None, metrics:SearchMetrics=None, max_searches:int=MAX_SEARCHES)->tuple:
+    """
+        Method used to find the shortest path between every source and every target
+
+        The first search reaching a part of the maze floods all of it. If that part has no loops, as in a perfect
+        maze, the path between any two of its cells is the only one, so the paths of every source in it are read from
+        that one search. Otherwise one breadth first search is run from each cell on the smaller side, stopping once
+        it has reached every cell on the other side. Moves can be made in both directions, so a search rooted at a
+        target gives the path from every source to it by following the parents of the source. A maze with loops
+        costs up to min(sources, targets) searches of the whole maze, so past max_searches the call is refused
+
+        Parameters:
+            grid - the grid of the maze
+            sources - the cells the paths start from, the entrances of the maze if None
+            targets - the cells the paths end at, the exits of the maze if None
+            metrics - the metrics the work of the searches is added to, None to skip counting
+            max_searches - the largest number of searches to run, None for no limit
+
+        Returns:
+            paths - a dictionary linking every (source, target) pair to its list of cells, empty if there is no path
+            nodes_explored - the number of nodes explored by all of the searches
+            searches - the number of searches run
+    """
+    sources = grid.entrances() if sources is None else list(sources)
+    targets = grid.exits() if targets is None else list(targets)
+    paths = {}
+    nodes_explored = 0
+    searches = 0
+    from_targets = len(targets) < len(sources)
+    roots, others = (targets, sources) if from_targets else (sources, targets)
+    #the floods of the parts of the maze with no loops, and the roots lying in parts with loops
+    trees = []
+    looped = set()
+    for root in roots:
+        tree = next((state for state in trees if state.g[root] != -1), None)
+        if tree is None:
+            if max_searches is not None and searches >= max_searches:
+                raise ValueError("joining %d sources to %d targets through loops needs more than %d searches" %(len(sources), len(targets), max_searches))
+            if root in looped:
+                explored, state = breadth_first_tree(grid, root, others, metrics)
+            else:
+                explored, state = breadth_first_tree(grid, root, None, metrics)
+                if is_tree(grid, state):
+                    tree = state
+                    trees.append(state)
+                else:
+                    looped.update(cell for cell in roots if state.g[cell] != -1)
+            searches += 1
+            nodes_explored += explored
+        for other in others:
+            if tree is not None:
+                path = tree_path(tree, root, other) if tree.g[other] != -1 else []
+            else:
+                path = state.path_to(other) if state.g[other] != -1 else []
+            if from_targets:
+                #the path leads from the target the search started at to the source
+                paths[(other, root)] = path[::-1]
+            else:
+                paths[(root, other)] = path
+    return paths, nodes_explored, searches
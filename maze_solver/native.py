@@ -0,0 +1,385 @@
+from math import sqrt
+from .grid import Grid, SearchState, UP, DOWN, LEFT, RIGHT
+from .packed import PackedGrid
+
+#numba and numpy are optional, without them the searches run in Python
+try:
+    import numba
+    import numpy
+except ImportError:
+    numba = None
+    numpy = None
+
+#whether the compiled search kernels can be used
+AVAILABLE = numba is not None
+#the heuristics the compiled A* kernel can work out, alt reads the landmark index and always runs in Python
+NATIVE_HEURISTICS = ("manhattan", "euclidean")
+#the number of open set entries the A* kernel starts with, the heap doubles when it fills
+HEAP_CAPACITY = 1 << 16
+
+def dfs_kernel(masks, width:int, start_cell:int, goal_cell:int, parent, visited, cells, remaining)->int:
+    """
+        Method used to run dfs over the flat grid arrays, compiled by numba when it is installed
+
+        This follows dfs_explore step for step, trying the directions of each cell lowest bit first, so the cells are
+        explored in the same order and the parents are the same
+
+        Parameters:
+            masks - the neighbour mask of every cell
+            width - the number of columns in the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the dfs algorithm
+            parent - the parent of every cell, filled in by the search
+            visited - the visited flag of every cell, filled in by the search
+            cells - room for the cells on the current branch, one entry per cell of the grid
+            remaining - room for the directions each cell on the branch still has to try
+
+        Returns:
+            The number of nodes explored by the algorithm
+    """
+    visited[start_cell] = 1
+    if start_cell == goal_cell:
+        return 1
+    nodes_explored = 1
+    depth = 1
+    cells[0] = start_cell
+    remaining[0] = masks[start_cell]
+    while depth:
+        directions = remaining[depth - 1]
+        if directions == 0:
+            depth -= 1
+            continue
+        direction = directions & -directions
+        remaining[depth - 1] = directions ^ direction
+        current_cell = cells[depth - 1]
+        if direction == UP:
+            neighbour = current_cell - width
+        elif direction == DOWN:
+            neighbour = current_cell + width
+        elif direction == LEFT:
+            neighbour = current_cell - 1
+        else:
+            neighbour = current_cell + 1
+        if visited[neighbour]:
+            continue
+        nodes_explored += 1
+        visited[neighbour] = 1
+        parent[neighbour] = current_cell
+        if neighbour == goal_cell:
+            break
+        cells[depth] = neighbour
+        remaining[depth] = masks[neighbour]
+        depth += 1
+    return nodes_explored
+
+def bfs_kernel(masks, width:int, start_cell:int, goal_cell:int, g_values, parent, visited, queue)->int:
+    """
+        Method used to run a breadth first search over the flat grid arrays, compiled by numba when it is installed
+
+        The layers of bfs_explore are read from one queue array in the same order, so the same cells are expanded and
+        the parents are the same
+
+        Parameters:
+            masks - the neighbour mask of every cell
+            width - the number of columns in the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search
+            g_values - the distance of every cell, -1 for every cell before the search
+            parent - the parent of every cell, filled in by the search
+            visited - the visited flag of every cell, filled in by the search
+            queue - room for every cell of the grid
+
+        Returns:
+            The number of nodes explored by the algorithm
+    """
+    g_values[start_cell] = 0
+    if start_cell == goal_cell:
+        visited[start_cell] = 1
+        return 1
+    queue[0] = start_cell
+    head = 0
+    tail = 1
+    nodes_explored = 0
+    while head < tail:
+        cell = queue[head]
+        head += 1
+        visited[cell] = 1
+        nodes_explored += 1
+        mask = masks[cell]
+        distance = g_values[cell] + 1
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            if not mask & direction:
+                continue
+            if direction == UP:
+                neighbour = cell - width
+            elif direction == DOWN:
+                neighbour = cell + width
+            elif direction == LEFT:
+                neighbour = cell - 1
+            else:
+                neighbour = cell + 1
+            if g_values[neighbour] == -1:
+                g_values[neighbour] = distance
+                parent[neighbour] = cell
+                queue[tail] = neighbour
+                tail += 1
+        if g_values[goal_cell] != -1:
+            visited[goal_cell] = 1
+            nodes_explored += 1
+            break
+    return nodes_explored
+
+def heap_less(f_values, h_values, heap_cells, first:int, second:int)->bool:
+    """
+        Method used to compare two open set entries in the same order as the (f, h, cell) tuples used by heapq
+
+        Parameters:
+            f_values - the f value of each entry
+            h_values - the h value of each entry
+            heap_cells - the cell of each entry
+            first - the position of the first entry
+            second - the position of the second entry
+
+        Returns:
+            Whether or not the first entry comes before the second
+    """
+    if f_values[first] != f_values[second]:
+        return f_values[first] < f_values[second]
+    if h_values[first] != h_values[second]:
+        return h_values[first] < h_values[second]
+    return heap_cells[first] < heap_cells[second]
+
+def heap_swap(f_values, h_values, heap_cells, first:int, second:int)->None:
+    """
+        Method used to swap two open set entries
+
+        Parameters:
+            f_values - the f value of each entry
+            h_values - the h value of each entry
+            heap_cells - the cell of each entry
+            first - the position of the first entry
+            second - the position of the second entry
+
+        Returns:
+            No return values
+    """
+    f_values[first], f_values[second] = f_values[second], f_values[first]
+    h_values[first], h_values[second] = h_values[second], h_values[first]
+    heap_cells[first], heap_cells[second] = heap_cells[second], heap_cells[first]
+
+def A_star_kernel(masks, width:int, start_cell:int, goal_cell:int, euclidean:bool, g_values, parent, visited)->int:
+    """
+        Method used to run the A* search over the flat grid arrays, compiled by numba when it is installed
+
+        The open set is a binary heap kept in three parallel arrays. No two entries share an (f, h, cell) key, since a
+        cell is only pushed again with a smaller g value, so the entries leave the heap in the same order as they do
+        from heapq in A_star_explore and the paths are the same
+
+        Parameters:
+            masks - the neighbour mask of every cell
+            width - the number of columns in the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            euclidean - use the euclidean distance rather than the manhattan distance
+            g_values - the g value of every cell, -1 for every cell before the search
+            parent - the parent of every cell, filled in by the search
+            visited - the visited flag of every cell, filled in by the search
+
+        Returns:
+            The number of nodes explored by the algorithm
+    """
+    goal_x = goal_cell // width
+    goal_y = goal_cell % width
+    capacity = HEAP_CAPACITY
+    f_values = numpy.empty(capacity, numpy.float64)
+    h_values = numpy.empty(capacity, numpy.float64)
+    heap_cells = numpy.empty(capacity, numpy.int32)
+    g_values[start_cell] = 0
+    f_values[0] = 0.0
+    h_values[0] = 0.0
+    heap_cells[0] = start_cell
+    count = 1
+    nodes_explored = 0
+    while count:
+        current_cell = heap_cells[0]
+        #moving the last entry to the top and sifting it down
+        count -= 1
+        heap_swap(f_values, h_values, heap_cells, 0, count)
+        position = 0
+        while True:
+            child = 2 * position + 1
+            if child >= count:
+                break
+            if child + 1 < count and heap_less(f_values, h_values, heap_cells, child + 1, child):
+                child += 1
+            if not heap_less(f_values, h_values, heap_cells, child, position):
+                break
+            heap_swap(f_values, h_values, heap_cells, child, position)
+            position = child
+        if visited[current_cell]:
+            continue
+        nodes_explored += 1
+        visited[current_cell] = 1
+        if current_cell == goal_cell:
+            break
+        new_g = g_values[current_cell] + 1
+        mask = masks[current_cell]
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            if not mask & direction:
+                continue
+            if direction == UP:
+                neighbour = current_cell - width
+            elif direction == DOWN:
+                neighbour = current_cell + width
+            elif direction == LEFT:
+                neighbour = current_cell - 1
+            else:
+                neighbour = current_cell + 1
+            if visited[neighbour]:
+                continue
+            neighbour_g = g_values[neighbour]
+            if neighbour_g != -1 and new_g >= neighbour_g:
+                continue
+            g_values[neighbour] = new_g
+            parent[neighbour] = current_cell
+            x_distance = abs(neighbour // width - goal_x)
+            y_distance = abs(neighbour % width - goal_y)
+            if euclidean:
+                new_h = sqrt(x_distance * x_distance + y_distance * y_distance)
+            else:
+                new_h = float(x_distance + y_distance)
+            if count == capacity:
+                capacity *= 2
+                f_values = numpy.concatenate((f_values, numpy.empty(count, numpy.float64)))
+                h_values = numpy.concatenate((h_values, numpy.empty(count, numpy.float64)))
+                heap_cells = numpy.concatenate((heap_cells, numpy.empty(count, numpy.int32)))
+            #adding the entry at the bottom and sifting it up
+            f_values[count] = new_g + new_h
+            h_values[count] = new_h
+            heap_cells[count] = neighbour
+            position = count
+            count += 1
+            while position:
+                above = (position - 1) // 2
+                if not heap_less(f_values, h_values, heap_cells, position, above):
+                    break
+                heap_swap(f_values, h_values, heap_cells, position, above)
+                position = above
+    return nodes_explored
+
+if numba is not None:
+    #the helpers are compiled first, so the kernels call the compiled versions
+    heap_less = numba.njit(cache=True)(heap_less)
+    heap_swap = numba.njit(cache=True)(heap_swap)
+    dfs_kernel = numba.njit(cache=True)(dfs_kernel)
+    bfs_kernel = numba.njit(cache=True)(bfs_kernel)
+    A_star_kernel = numba.njit(cache=True)(A_star_kernel)
+
+def prepare_kernels()->bool:
+    """
+        Method used to compile the kernels, or load them from the numba cache, before they are first timed
+
+        Numba compiles a kernel on its first call, so each kernel is run once on a three by three maze with the same
+        argument types as a real search
+
+        Parameters:
+            No parameters
+
+        Returns:
+            Whether or not any kernel had to be compiled or loaded
+    """
+    if not AVAILABLE or (dfs_kernel.signatures and bfs_kernel.signatures and A_star_kernel.signatures):
+        return False
+    grid = Grid(3, 3, bytearray(b"\x01\x00\x01\x01\x00\x01\x01\x00\x01"))
+    dfs_explore_native(grid, 1, 7)
+    bfs_explore_native(grid, 1, 7)
+    A_star_explore_native(grid, 1, 7, "manhattan")
+    return True
+
+def native_supported(grid:Grid, heuristic_choice:str=None, metrics=None)->bool:
+    """
+        Method used to check if a search can use the compiled kernels
+
+        Parameters:
+            grid - the grid of the maze
+            heuristic_choice - the lower case name of the heuristic the search uses, None for dfs and bfs
+            metrics - the metrics the search would add to, the kernels cannot call the metric hooks
+
+        Returns:
+            Whether or not numba is installed and the search can run in a compiled kernel
+    """
+    return (AVAILABLE and metrics is None and (heuristic_choice is None or heuristic_choice in NATIVE_HEURISTICS)
+            and not isinstance(grid, PackedGrid))
+
+def state_arrays(grid:Grid, state:SearchState)->tuple:
+    """
+        Method used to view the grid and search state buffers as numpy arrays without copying them
+
+        Parameters:
+            grid - the grid of the maze
+            state - the search state the kernel fills in
+
+        Returns:
+            masks, g, parent, visited - numpy arrays sharing memory with the grid and search state
+    """
+    return (numpy.frombuffer(grid.masks, numpy.uint8), numpy.frombuffer(state.g, numpy.int32),
+            numpy.frombuffer(state.parent, numpy.int32), numpy.frombuffer(state.visited, numpy.uint8))
+
+def dfs_explore_native(grid:Grid, start_cell:int, goal_cell:int)->tuple:
+    """
+        Method used to run dfs in the compiled kernel without building the path
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the dfs algorithm
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the goal cell is visited if a path was found
+    """
+    state = SearchState(grid.size)
+    masks, _, parent, visited = state_arrays(grid, state)
+    cells = numpy.empty(grid.size, numpy.int32)
+    remaining = numpy.empty(grid.size, numpy.uint8)
+    nodes_explored = dfs_kernel(masks, grid.width, start_cell, goal_cell, parent, visited, cells, remaining)
+    return int(nodes_explored), state
+
+def bfs_explore_native(grid:Grid, start_cell:int, goal_cell:int)->tuple:
+    """
+        Method used to run a breadth first search in the compiled kernel without building the path
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the goal cell is visited if a path was found
+    """
+    state = SearchState(grid.size)
+    masks, g_values, parent, visited = state_arrays(grid, state)
+    queue = numpy.empty(grid.size, numpy.int32)
+    nodes_explored = bfs_kernel(masks, grid.width, start_cell, goal_cell, g_values, parent, visited, queue)
+    return int(nodes_explored), state
+
+def A_star_explore_native(grid:Grid, start_cell:int, goal_cell:int, heuristic_choice:str)->tuple:
+    """
+        Method used to run the A* search in the compiled kernel without building the path
+
+        Parameters:
+            grid - the grid of the maze
+            start_cell - the cell the search starts from
+            goal_cell - the goal cell of the search algorithm
+            heuristic_choice - the heuristic to use (manhattan/euclidean)
+
+        Returns:
+            nodes_explored - the number of nodes explored by the algorithm
+            state - the search state, the goal cell is visited if a path was found
+    """
+    state = SearchState(grid.size)
+    masks, g_values, parent, visited = state_arrays(grid, state)
+    euclidean = heuristic_choice.lower() == "euclidean"
+    nodes_explored = A_star_kernel(masks, grid.width, start_cell, goal_cell, euclidean, g_values, parent, visited)
+    return int(nodes_explored), state
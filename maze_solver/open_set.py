@@ -0,0 +1,327 @@
+from heapq import heappush, heappop
+
+class HeapOpenSet:
+    """
+    This is a class designed to hold the open set of a search as a binary heap of (f, h, cell) tuples
+
+    Each cell in the open set has one live entry. Lowering the key of a cell pushes a new entry and leaves the old one
+    in the heap, where it is skipped when it reaches the top because its f no longer matches the key kept for the cell.
+    This keeps every push and pop inside the C heapq functions, with no lock and no comparison methods written in
+    Python. Ties on f are broken by the smaller h and then the smaller cell, so the order does not depend on when a
+    cell was pushed
+
+    Atributes:
+        self.heap - the list of (f, h, cell) entries, including stale ones
+        self.keys - the f of the live entry of each cell, -1 if the cell is not in the open set
+        self.lowered - the number of times the key of a cell in the open set was lowered, each leaving a stale entry
+        self.stale - the number of stale entries skipped when popping
+    """
+
+    def __init__(self, size:int)->None:
+        """
+        Method used to initialise an empty open set
+
+        Parameters:
+            self - the current open set
+            size - the number of cells that may be added to the open set
+
+        Returns:
+            No return values
+        """
+        self.heap = []
+        self.keys = [-1] * size
+        self.lowered = 0
+        self.stale = 0
+
+    def __len__(self)->int:
+        """
+        Method used to find the number of cells in the open set
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            The number of cells in the open set, stale entries are not counted
+        """
+        #every lowered key left one stale entry behind, and the ones already skipped are no longer held
+        return self.entries() - self.lowered + self.stale
+
+    def entries(self)->int:
+        """
+        Method used to find the number of entries held by the open set
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            The number of entries, including the stale ones not yet skipped
+        """
+        return len(self.heap)
+
+    def contains(self, cell:int)->bool:
+        """
+        Method used to check if a cell is in the open set
+
+        Parameters:
+            self - the current open set
+            cell - the cell to check
+
+        Returns:
+            True if the cell is waiting in the open set
+        """
+        return self.keys[cell] != -1
+
+    __contains__ = contains
+
+    def key(self, cell:int):
+        """
+        Method used to find the f value of a cell in the open set
+
+        Parameters:
+            self - the current open set
+            cell - the cell to look up
+
+        Returns:
+            The f value of the cell, None if it is not in the open set
+        """
+        f = self.keys[cell]
+        return None if f == -1 else f
+
+    def clear(self)->None:
+        """
+        Method used to empty the open set so it can be used by another search
+
+        Only the cells still holding entries are reset, so clearing costs nothing for the cells already popped
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            No return values
+        """
+        keys = self.keys
+        for _, _, cell in self.heap:
+            keys[cell] = -1
+        self.heap = []
+        self.lowered = 0
+        self.stale = 0
+
+    def push(self, cell:int, f, h)->bool:
+        """
+        Method used to add a cell to the open set, or to lower its key if it is already there
+
+        Parameters:
+            self - the current open set
+            cell - the cell to add
+            f - the f value of the cell, never negative
+            h - the h value of the cell, used to break ties on f
+
+        Returns:
+            True if the cell was added or its key was lowered, False if it was already there with a key as small
+        """
+        keys = self.keys
+        current = keys[cell]
+        if current != -1:
+            if f >= current:
+                return False
+            self.lowered += 1
+        keys[cell] = f
+        heappush(self.heap, (f, h, cell))
+        return True
+
+    decrease_key = push
+
+    def pop(self)->int:
+        """
+        Method used to take the cell with the smallest key out of the open set
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            The cell with the smallest f, ties broken by the smallest h and then the smallest cell, -1 if the open
+            set is empty
+        """
+        heap = self.heap
+        keys = self.keys
+        while heap:
+            f, h, cell = heappop(heap)
+            if keys[cell] == f:
+                keys[cell] = -1
+                return cell
+            self.stale += 1
+        return -1
+
+class BucketOpenSet:
+    """
+    This is a class designed to hold an open set whose keys are whole numbers as a monotone bucket queue
+
+    There is one bucket for each f value, holding a small heap of (h, cell) tuples, so cells come out in the same
+    order as from HeapOpenSet while each heap only holds the cells with one f. With a consistent heuristic the f of
+    each cell pushed is never below the f of the last cell popped, so the smallest bucket only moves forward and the
+    emptied buckets are dropped as it passes them. A push below that bucket moves it back, so any keys still work
+
+    Atributes:
+        self.buckets - the list of heaps of (h, cell) entries indexed by f, None where no cell has been given that f
+        self.low - the smallest f that may still have a bucket with entries
+        self.keys - the f of the live entry of each cell, -1 if the cell is not in the open set
+        self.lowered - the number of times the key of a cell in the open set was lowered, each leaving a stale entry
+        self.stale - the number of stale entries skipped when popping
+    """
+
+    def __init__(self, size:int)->None:
+        """
+        Method used to initialise an empty open set
+
+        Parameters:
+            self - the current open set
+            size - the number of cells that may be added to the open set
+
+        Returns:
+            No return values
+        """
+        self.buckets = []
+        self.low = 0
+        self.keys = [-1] * size
+        self.lowered = 0
+        self.stale = 0
+
+    def __len__(self)->int:
+        """
+        Method used to find the number of cells in the open set
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            The number of cells in the open set, stale entries are not counted
+        """
+        #every lowered key left one stale entry behind, and the ones already skipped are no longer held
+        return self.entries() - self.lowered + self.stale
+
+    def entries(self)->int:
+        """
+        Method used to find the number of entries held by the open set
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            The number of entries, including the stale ones not yet skipped
+        """
+        return sum(len(bucket) for bucket in self.buckets[self.low:] if bucket)
+
+    def contains(self, cell:int)->bool:
+        """
+        Method used to check if a cell is in the open set
+
+        Parameters:
+            self - the current open set
+            cell - the cell to check
+
+        Returns:
+            True if the cell is waiting in the open set
+        """
+        return self.keys[cell] != -1
+
+    __contains__ = contains
+
+    def key(self, cell:int):
+        """
+        Method used to find the f value of a cell in the open set
+
+        Parameters:
+            self - the current open set
+            cell - the cell to look up
+
+        Returns:
+            The f value of the cell, None if it is not in the open set
+        """
+        f = self.keys[cell]
+        return None if f == -1 else f
+
+    def clear(self)->None:
+        """
+        Method used to empty the open set so it can be used by another search
+
+        Only the cells still holding entries are reset, so clearing costs nothing for the cells already popped
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            No return values
+        """
+        keys = self.keys
+        for bucket in self.buckets[self.low:]:
+            if bucket:
+                for _, cell in bucket:
+                    keys[cell] = -1
+        self.buckets = []
+        self.low = 0
+        self.lowered = 0
+        self.stale = 0
+
+    def push(self, cell:int, f:int, h:int)->bool:
+        """
+        Method used to add a cell to the open set, or to lower its key if it is already there
+
+        Parameters:
+            self - the current open set
+            cell - the cell to add
+            f - the f value of the cell, a whole number that is never negative
+            h - the h value of the cell, used to break ties on f
+
+        Returns:
+            True if the cell was added or its key was lowered, False if it was already there with a key as small
+        """
+        keys = self.keys
+        current = keys[cell]
+        if current != -1:
+            if f >= current:
+                return False
+            self.lowered += 1
+        keys[cell] = f
+        buckets = self.buckets
+        if f >= len(buckets):
+            buckets.extend([None] * (f + 1 - len(buckets)))
+        bucket = buckets[f]
+        if bucket is None:
+            buckets[f] = [(h, cell)]
+        else:
+            heappush(bucket, (h, cell))
+        if f < self.low:
+            self.low = f
+        return True
+
+    decrease_key = push
+
+    def pop(self)->int:
+        """
+        Method used to take the cell with the smallest key out of the open set
+
+        Parameters:
+            self - the current open set
+
+        Returns:
+            The cell with the smallest f, ties broken by the smallest h and then the smallest cell, -1 if the open
+            set is empty
+        """
+        buckets = self.buckets
+        keys = self.keys
+        low = self.low
+        while low < len(buckets):
+            bucket = buckets[low]
+            if not bucket:
+                #nothing is pushed below the smallest key, so the emptied bucket can be dropped
+                buckets[low] = None
+                low += 1
+                continue
+            h, cell = heappop(bucket)
+            if keys[cell] == low:
+                keys[cell] = -1
+                self.low = low
+                return cell
+            self.stale += 1
+        self.low = low
+        return -1
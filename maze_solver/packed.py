@@ -0,0 +1,378 @@
+import mmap
+from .grid import Grid, UP, DOWN, LEFT, RIGHT, MAZE_CHARS, WALL_VALUES, WALL_CHARS
+
+#translation tables between wall values and the binary digits used to pack a row into an integer
+BINARY_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+BINARY_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+#the number of packed bytes gathered before they are written out
+CHUNK_BYTES = 1 << 16
+
+class PackedWalls:
+    """
+    This is a class designed to read the wall value of every cell from a buffer holding one bit per cell
+
+    Cell n is bit n % 8 of byte n // 8, so the rows of the maze follow on from each other without padding
+
+    Atributes:
+        self.bits - the packed wall bits, a bytearray or a memory map of a file
+        self.size - the number of cells
+    """
+
+    def __init__(self, bits, size:int)->None:
+        """
+        Method used to initialise the walls
+
+        Parameters:
+            self - the current walls
+            bits - the packed wall bits
+            size - the number of cells
+
+        Returns:
+            No return values
+        """
+        self.bits = bits
+        self.size = size
+
+    def __len__(self)->int:
+        return self.size
+
+    def __getitem__(self, cell:int)->int:
+        return (self.bits[cell >> 3] >> (cell & 7)) & 1
+
+    def __bytes__(self)->bytes:
+        """
+        Method used to unpack the walls into one byte per cell
+
+        Parameters:
+            self - the current walls
+
+        Returns:
+            A bytes object holding 1 for every wall cell and 0 for every open cell
+        """
+        return self.cells(0, self.size)
+
+    def cells(self, start:int, end:int)->bytes:
+        """
+        Method used to unpack the walls of a range of cells into one byte per cell
+
+        Parameters:
+            self - the current walls
+            start - the first cell to unpack
+            end - the cell after the last one to unpack
+
+        Returns:
+            A bytes object holding 1 for every wall cell and 0 for every open cell in the range
+        """
+        end = min(end, self.size)
+        if start >= end:
+            return b""
+        first_byte = start >> 3
+        last_byte = (end + 7) >> 3
+        packed = int.from_bytes(self.bits[first_byte:last_byte], "little")
+        #the binary digits come out most significant first, so they are reversed into cell order
+        digits = format(packed, "b").zfill(8 * (last_byte - first_byte))[::-1]
+        offset = start - 8 * first_byte
+        return digits[offset:offset + end - start].encode("ascii").translate(BINARY_VALUES)
+
+    def find(self, value:int, start:int=0, end:int=None)->int:
+        """
+        Method used to find the first cell with the given wall value
+
+        Parameters:
+            self - the current walls
+            value - the wall value to look for
+            start - the first cell to look at
+            end - the cell after the last one to look at, the end of the maze if None
+
+        Returns:
+            The first matching cell, -1 if there is none
+        """
+        end = self.size if end is None else min(end, self.size)
+        for cell in range(start, end):
+            if self[cell] == value:
+                return cell
+        return -1
+
+    def rfind(self, value:int, start:int=0, end:int=None)->int:
+        """
+        Method used to find the last cell with the given wall value
+
+        Parameters:
+            self - the current walls
+            value - the wall value to look for
+            start - the first cell to look at
+            end - the cell after the last one to look at, the end of the maze if None
+
+        Returns:
+            The last matching cell, -1 if there is none
+        """
+        end = self.size if end is None else min(end, self.size)
+        for cell in range(end - 1, start - 1, -1):
+            if self[cell] == value:
+                return cell
+        return -1
+
+class PackedMasks:
+    """
+    This is a class designed to work out the neighbour mask of a cell from the packed wall bits when it is needed
+
+    Atributes:
+        self.bits - the packed wall bits
+        self.width - the number of columns in the maze
+        self.size - the number of cells
+    """
+
+    def __init__(self, bits, width:int, size:int)->None:
+        """
+        Method used to initialise the masks
+
+        Parameters:
+            self - the current masks
+            bits - the packed wall bits
+            width - the number of columns in the maze
+            size - the number of cells
+
+        Returns:
+            No return values
+        """
+        self.bits = bits
+        self.width = width
+        self.size = size
+
+    def __len__(self)->int:
+        return self.size
+
+    def __getitem__(self, cell:int)->int:
+        """
+        Method used to find the open neighbours of a cell
+
+        Parameters:
+            self - the current masks
+            cell - the index of the cell
+
+        Returns:
+            The UP, DOWN, LEFT and RIGHT bits of the open neighbours, 0 for wall cells
+        """
+        bits = self.bits
+        if (bits[cell >> 3] >> (cell & 7)) & 1:
+            return 0
+        width = self.width
+        column = cell % width
+        mask = 0
+        other = cell - width
+        if other >= 0 and not (bits[other >> 3] >> (other & 7)) & 1:
+            mask = UP
+        other = cell + width
+        if other < self.size and not (bits[other >> 3] >> (other & 7)) & 1:
+            mask |= DOWN
+        other = cell - 1
+        if column and not (bits[other >> 3] >> (other & 7)) & 1:
+            mask |= LEFT
+        other = cell + 1
+        if column != width - 1 and not (bits[other >> 3] >> (other & 7)) & 1:
+            mask |= RIGHT
+        return mask
+
+class PackedGrid(Grid):
+    """
+    This is a class designed to hold a maze with one bit per cell, for mazes too large to keep a byte per cell
+
+    The searches only use the walls, masks and neighbours of a grid, so they run unchanged on a packed grid. The masks
+    are worked out from the wall bits for each cell as it is looked at, trading search speed for memory. The bits may
+    be a memory map of a file, in which case the maze is paged in from disk as it is searched
+
+    Atributes:
+        self.bits - the packed wall bits, a bytearray or a memory map of a file
+        (the attributes of Grid, with walls and masks read from the bits, costs is always None since only one bit is
+        kept for each cell, so every open cell costs 1)
+    """
+
+    def __init__(self, width:int, height:int, bits, start:int=None, end:int=None)->None:
+        """
+        Method used to initialise a packed grid
+
+        Parameters:
+            self - the current grid
+            width - the number of columns in the maze
+            height - the number of rows in the maze
+            bits - the packed wall bits, at least (width*height+7)//8 bytes
+            start - the cell of the start if it is already known, it is found from the top row if None
+            end - the cell of the end if it is already known, it is found from the bottom row if None
+
+        Returns:
+            No return values
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.bits = bits
+        self.walls = PackedWalls(bits, self.size)
+        self.masks = PackedMasks(bits, width, self.size)
+        self.start = start if start is not None else self.walls.rfind(0, 0, width)
+        if end is None:
+            end = self.walls.rfind(0, self.size - width, self.size) if height > 1 else -1
+        self.end = end
+        self.costs = None
+        self.landmarks = None
+
+    def set_wall(self, cell:int, wall:bool)->None:
+        """
+        Method used to open or close a cell once the grid has been built
+
+        The masks are worked out from the bits as they are read, so only the bit of the cell changes
+
+        Parameters:
+            self - the current grid
+            cell - the index of the cell
+            wall - whether the cell becomes a wall
+
+        Returns:
+            No return values
+        """
+        if isinstance(self.bits, mmap.mmap):
+            raise ValueError("the cells of a memory mapped maze cannot be changed")
+        if wall:
+            self.bits[cell >> 3] |= 1 << (cell & 7)
+        else:
+            self.bits[cell >> 3] &= ~(1 << (cell & 7)) & 0xFF
+        width = self.width
+        if cell < width:
+            self.start = self.walls.rfind(0, 0, width)
+        if cell >= self.size - width and self.height > 1:
+            self.end = self.walls.rfind(0, self.size - width, self.size)
+        self.landmarks = None
+
+    def display_matrix(self)->list:
+        """
+        Method used to turn the grid back into a 2D array of characters for display
+
+        Parameters:
+            self - the current grid
+
+        Returns:
+            A 2D array of the maze with the start marked S and the end marked E
+        """
+        text = bytes(self.walls).translate(WALL_CHARS).decode("ascii")
+        width = self.width
+        matrix = [list(text[offset:offset + width]) for offset in range(0, self.size, width)]
+        if self.start != -1:
+            matrix[0][self.start % width] = "S"
+        if self.end != -1:
+            matrix[-1][self.end % width] = "E"
+        return matrix
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used to store the cells of the grid
+
+        Parameters:
+            self - the current grid
+
+        Returns:
+            The size of the packed wall bits in bytes, including pages of a memory map that are not loaded
+        """
+        return len(self.bits)
+
+    def close(self)->None:
+        """
+        Method used to release the memory map of the wall bits, if there is one
+
+        Parameters:
+            self - the current grid
+
+        Returns:
+            No return values
+        """
+        if isinstance(self.bits, mmap.mmap):
+            self.bits.close()
+
+def stream_rows(maze_file)->iter:
+    """
+        Method used to read the rows of a maze file one at a time
+
+        Parameters:
+            maze_file - the maze file opened in binary mode
+
+        Returns:
+            An iterator over the wall values of each row, as bytes holding 1 for walls and 0 for open cells
+    """
+    for line in maze_file:
+        cells = line.translate(None, b" \r\n")
+        if not cells.startswith(b"#"):
+            continue
+        if cells.translate(None, MAZE_CHARS):
+            raise ValueError("the maze may only contain #, - and digit characters")
+        yield cells.translate(WALL_VALUES)
+
+def pack_rows(rows:iter, output)->tuple:
+    """
+        Method used to pack rows of wall values into one bit per cell
+
+        Each row is turned into an integer through its binary digits, so packing a row costs a few passes in C.
+        The bits are written out every CHUNK_BYTES, so only one chunk and one row are held at a time
+
+        Parameters:
+            rows - an iterator over the wall values of each row
+            output - the binary file or bytearray the packed bits are added to
+
+        Returns:
+            maze_width - the number of columns in the maze
+            maze_height - the number of rows in the maze
+            start - the cell of the start, -1 if the top row has no opening
+            end - the cell of the end, -1 if the bottom row has no opening
+    """
+    write = output.extend if isinstance(output, bytearray) else output.write
+    rows = iter(rows)
+    previous = next(rows, None)
+    if previous is None:
+        raise ValueError("the maze file does not contain a maze")
+    maze_width = len(previous)
+    maze_height = 1
+    start = previous.rfind(0)
+    pending = 0
+    pending_bits = 0
+    while previous is not None:
+        row = next(rows, None)
+        if row is not None:
+            if len(row) != maze_width:
+                raise ValueError("the rows of the maze are not all the same length")
+            #only the top and bottom rows may have openings in the outer columns
+            if maze_height > 1:
+                previous = b"\x01" + previous[1:-1] + b"\x01" if maze_width > 1 else b"\x01"
+        else:
+            opening = previous.rfind(0)
+            end = (maze_height - 1) * maze_width + opening if maze_height > 1 and opening != -1 else -1
+        pending |= int(previous.translate(BINARY_DIGITS)[::-1], 2) << pending_bits
+        pending_bits += maze_width
+        if pending_bits >= 8 * CHUNK_BYTES:
+            full = pending_bits // 8
+            write((pending & ((1 << 8 * full) - 1)).to_bytes(full, "little"))
+            pending >>= 8 * full
+            pending_bits -= 8 * full
+        if row is not None:
+            maze_height += 1
+        previous = row
+    write(pending.to_bytes((pending_bits + 7) // 8, "little"))
+    return maze_width, maze_height, start, end
+
+def load_packed(file_name:str, packed_file:str=None)->PackedGrid:
+    """
+        Method used to read a maze file row by row into a packed grid
+
+        Parameters:
+            file_name - the name of the maze file
+            packed_file - a file the packed bits are written to and memory mapped from, they are kept in memory if None
+
+        Returns:
+            The packed grid for the maze
+    """
+    with open(file_name, "rb") as maze_file:
+        if packed_file is None:
+            bits = bytearray()
+            width, height, start, end = pack_rows(stream_rows(maze_file), bits)
+            return PackedGrid(width, height, bits, start, end)
+        with open(packed_file, "wb") as bits_file:
+            width, height, start, end = pack_rows(stream_rows(maze_file), bits_file)
+    with open(packed_file, "rb") as bits_file:
+        bits = mmap.mmap(bits_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return PackedGrid(width, height, bits, start, end)
@@ -0,0 +1,321 @@
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import signal
+import sys
+import time
+from collections import defaultdict
+from timeit import default_timer as timer
+
+#the profilers that can run a solve, sample only works where signal.setitimer exists
+PROFILERS = ("cprofile", "sample")
+#seconds of processor time asked for between the stacks taken by the sampling profiler, the kernel may round it up
+SAMPLE_INTERVAL = 0.001
+#the stacks of the cProfile call graph are cut at this depth and below this many microseconds
+MAX_DEPTH = 64
+MIN_MICROSECONDS = 1
+#the number of functions listed in the summary
+TOP_FUNCTIONS = 20
+
+def frame_label(file_name:str, line:int, name:str)->str:
+    """
+        Method used to name a function in the collapsed stacks
+
+        Parameters:
+            file_name - the file the function is defined in, ~ for built in functions
+            line - the line the function starts on
+            name - the name of the function
+
+        Returns:
+            The name followed by the file and line, with no semicolons so the stacks can be split
+    """
+    if file_name == "~":
+        label = name
+    else:
+        label = "%s (%s:%d)" %(name, os.path.basename(file_name), line)
+    return label.replace(";", ",")
+
+class SamplingProfiler:
+    """
+    This is a class designed to sample the Python stack of the running process at a fixed interval of processor time
+
+    The stacks are taken in a signal handler, so the code being profiled runs at full speed between samples and
+    never has to call into the profiler. Only the main thread is sampled, and time spent inside compiled kernels is
+    counted against the Python function that called them. The kernel rounds the interval up to its own timer tick,
+    so the times given for the samples are their share of the processor time used by the call
+
+    Atributes:
+        self.interval - the seconds of processor time between samples
+        self.stacks - a dictionary linking each stack, a tuple of labels from the outermost call, to its samples
+        self.samples - the number of samples taken
+        self.cpu_time - the seconds of processor time used by the last call
+        self.base - the frame of the running runcall, whose callers are not sampled
+    """
+
+    def __init__(self, interval:float=SAMPLE_INTERVAL)->None:
+        """
+        Method used to initialise the profiler
+
+        Parameters:
+            self - the current profiler
+            interval - the seconds of processor time between samples
+
+        Returns:
+            No return values
+        """
+        if not hasattr(signal, "setitimer"):
+            raise ValueError("the sampling profiler needs signal.setitimer, which this platform does not have")
+        self.interval = interval
+        self.stacks = defaultdict(int)
+        self.samples = 0
+        self.cpu_time = 0.0
+        self.base = None
+
+    def sample(self, signum:int, frame)->None:
+        """
+        Method used as the signal handler, adding the stack of the interrupted frame
+
+        Parameters:
+            self - the current profiler
+            signum - the number of the signal
+            frame - the frame that was running when the signal arrived
+
+        Returns:
+            No return values
+        """
+        stack = []
+        #the frames outside the profiled call are left out, as cProfile leaves them out
+        while frame is not None and frame is not self.base:
+            code = frame.f_code
+            stack.append(frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def runcall(self, function, *args, **kwargs):
+        """
+        Method used to call a function while sampling its stack
+
+        Parameters:
+            self - the current profiler
+            function - the function to call
+            args - the positional arguments of the function
+            kwargs - the keyword arguments of the function
+
+        Returns:
+            The value returned by the function
+        """
+        self.base = sys._getframe()
+        previous = signal.signal(signal.SIGPROF, self.sample)
+        start = time.process_time()
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, previous)
+            self.cpu_time = time.process_time() - start
+
+    def collapsed(self)->dict:
+        """
+        Method used to find the collapsed stacks of the samples
+
+        Parameters:
+            self - the current profiler
+
+        Returns:
+            A dictionary linking each stack, written as labels joined by semicolons, to its number of samples
+        """
+        return {";".join(stack): count for stack, count in self.stacks.items()}
+
+    def top(self, count:int=TOP_FUNCTIONS)->list:
+        """
+        Method used to find the functions that the most samples were taken in
+
+        Parameters:
+            self - the current profiler
+            count - the number of functions to list
+
+        Returns:
+            A list of dictionaries holding the function, its own and total samples and their seconds, largest first
+        """
+        own = defaultdict(int)
+        total = defaultdict(int)
+        for stack, samples in self.stacks.items():
+            own[stack[-1]] += samples
+            #a recursive function is only counted once in each stack
+            for label in set(stack):
+                total[label] += samples
+        ranked = sorted(own, key=lambda label: (-own[label], label))[:count]
+        seconds = self.cpu_time / self.samples if self.samples else 0.0
+        return [{"function": label, "samples": own[label], "cumulative_samples": total[label],
+                 "time": own[label] * seconds, "cumulative_time": total[label] * seconds} for label in ranked]
+
+def call_graph_stacks(stats:pstats.Stats)->dict:
+    """
+        Method used to build collapsed stacks from the call graph recorded by cProfile
+
+        cProfile only keeps the time between each caller and callee, not whole stacks, so the time of a function
+        called from several places is shared between its stacks in proportion to the time spent in it from each
+        caller. Recursive calls end the stack they appear in
+
+        Parameters:
+            stats - the statistics of a cProfile run
+
+        Returns:
+            A dictionary linking each stack, written as labels joined by semicolons, to its own time in microseconds
+    """
+    entries = stats.stats
+    callees = defaultdict(list)
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge[3]))
+    stacks = defaultdict(int)
+
+    def walk(function:tuple, path:tuple, labels:tuple, share:float)->None:
+        _, _, own_time, total_time, _ = entries[function]
+        if total_time * share * 1e6 < MIN_MICROSECONDS:
+            return
+        stacks[";".join(labels)] += int(round(own_time * share * 1e6))
+        if len(path) >= MAX_DEPTH:
+            return
+        for callee, edge_time in callees.get(function, ()):
+            callee_time = entries[callee][3]
+            if callee in path or not callee_time:
+                continue
+            walk(callee, path + (callee,), labels + (frame_label(*callee),), share * edge_time / callee_time)
+
+    #the functions with no recorded caller are where the profiled call started
+    for function, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(function, (function,), (frame_label(*function),), 1.0)
+    return {stack: count for stack, count in stacks.items() if count > 0}
+
+def call_graph_top(stats:pstats.Stats, count:int=TOP_FUNCTIONS)->list:
+    """
+        Method used to find the functions that cProfile spent the most time in
+
+        Parameters:
+            stats - the statistics of a cProfile run
+            count - the number of functions to list
+
+        Returns:
+            A list of dictionaries holding the function, its calls, own time and cumulative time, largest first
+    """
+    ranked = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:count]
+    return [{"function": frame_label(*function), "calls": calls, "time": own_time, "cumulative_time": total_time}
+            for function, (_, calls, own_time, total_time, _) in ranked]
+
+def profile_call(prefix:str, profiler:str, function, *args, **kwargs)->tuple:
+    """
+        Method used to call a function under a profiler and write what it found
+
+        Three files are written next to each other. prefix.collapsed holds one stack per line followed by its weight,
+        ready for flamegraph.pl or speedscope, the weight being microseconds for cprofile and samples for sample.
+        prefix.json holds the summary given back by this method. prefix.pstats holds the cProfile statistics for pstats
+        and snakeviz, and is only written by cprofile
+
+        Parameters:
+            prefix - the path the output files are named from
+            profiler - the profiler to use (cprofile/sample)
+            function - the function to call
+            args - the positional arguments of the function
+            kwargs - the keyword arguments of the function
+
+        Returns:
+            value - the value returned by the function
+            summary - a dictionary holding the profiler, the wall time of the call and its busiest functions
+    """
+    if profiler not in PROFILERS:
+        raise ValueError("the profiler must be one of %s, not %r" %(", ".join(PROFILERS), profiler))
+    runner = cProfile.Profile() if profiler == "cprofile" else SamplingProfiler()
+    start = timer()
+    value = runner.runcall(function, *args, **kwargs)
+    elapsed = timer() - start
+    summary = {"profiler": profiler, "wall_time": elapsed}
+    if profiler == "cprofile":
+        runner.create_stats()
+        stats = pstats.Stats(runner)
+        stats.dump_stats(prefix + ".pstats")
+        stacks = call_graph_stacks(stats)
+        summary["top"] = call_graph_top(stats)
+    else:
+        stacks = runner.collapsed()
+        summary["samples"] = runner.samples
+        summary["cpu_time"] = runner.cpu_time
+        summary["top"] = runner.top()
+    with open(prefix + ".collapsed", "w") as stacks_file:
+        for stack, weight in sorted(stacks.items()):
+            stacks_file.write("%s %d\n" %(stack, weight))
+    return value, summary
+
+def write_summary(prefix:str, summary:dict)->None:
+    """
+        Method used to write the summary of a profiled solve
+
+        Parameters:
+            prefix - the path the output files are named from
+            summary - the summary of the solve, with its phase timings
+
+        Returns:
+            No return values
+    """
+    with open(prefix + ".json", "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+
+def compare_phases(summaries:list)->list:
+    """
+        Method used to line up the phase timings of several profiled solves
+
+        Parameters:
+            summaries - the summaries written by profiled solves, such as one for each maze size
+
+        Returns:
+            phases - the names of the phases in the order they first appear
+            rows - a list of (maze, cells, timings) tuples, the timings holding None for phases a solve did not run
+    """
+    phases = []
+    for summary in summaries:
+        for phase in summary["phases"]:
+            if phase not in phases:
+                phases.append(phase)
+    rows = []
+    for summary in summaries:
+        rows.append((os.path.basename(summary["maze"]), summary.get("width", 0) * summary.get("height", 0),
+                     [summary["phases"].get(phase) for phase in phases]))
+    return phases, rows
+
+def main(argv:list=None)->int:
+    """
+        Method used to compare the phase timings of profiled solves from the command line
+
+        Parameters:
+            argv - the command line arguments, the arguments of the process are used if None
+
+        Returns:
+            The exit status
+    """
+    parser = argparse.ArgumentParser(prog="maze_solver.profiling", description="Compare the phase timings written by python -m maze_solver MAZE --profile PREFIX.")
+    parser.add_argument("summaries", nargs="+", metavar="SUMMARY", help="the PREFIX.json files written by --profile")
+    args = parser.parse_args(argv)
+    summaries = []
+    try:
+        for file_name in args.summaries:
+            with open(file_name) as summary_file:
+                summaries.append(json.load(summary_file))
+        phases, rows = compare_phases(summaries)
+    except (OSError, ValueError, KeyError) as error:
+        print("The summary file entered was not valid: %s" %error, file=sys.stderr)
+        return 1
+    #sorted by the number of cells so the growth of each phase with the maze reads down the columns
+    rows.sort(key=lambda row: row[1])
+    print(("%-24s %12s" + " %12s" * len(phases)) %(("maze", "cells") + tuple(phases)))
+    for maze, cells, timings in rows:
+        print(("%-24s %12d" + " %12s" * len(phases)) %((maze, cells) + tuple("-" if timing is None else "%.6f" %timing for timing in timings)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+from .grid import Grid, QueryState, load_maze, point_cell
+from .a_star import A_star_explore, HEURISTICS
+from .dfs import dfs_explore
+from .metrics import SearchMetrics
+from .open_set import HeapOpenSet
+
+#the search algorithms that can answer repeated queries
+QUERY_ALGORITHMS = ("astar", "dfs")
+
+class MazeQueries:
+    """
+    This is a class designed to answer many start and goal queries on the same maze
+
+    The maze is loaded once and a single query state and open set are shared by every search, which run on them
+    through A_star_explore and dfs_explore, so a query only touches the cells it explores
+
+    Atributes:
+        self.grid - the grid of the maze
+        self.algorithm - the name of the search algorithm used
+        self.heuristic - the heuristic used by the A* search
+        self.state - the query state reused by every search
+        self.open_set - the open set reused by every A* search, None for dfs
+        self.queries - the number of queries answered so far
+    """
+
+    def __init__(self, maze, algorithm:str="astar", heuristic:str="manhattan", cache=None)->None:
+        """
+        Method used to initialise the queries for a maze
+
+        Parameters:
+            self - the current queries
+            maze - either a grid or the file name of a maze
+            algorithm - the search algorithm to use (astar/dfs)
+            heuristic - the heuristic used by the A* search (manhattan/euclidean/alt)
+            cache - a MazeCache used to load the maze file, it is parsed if None
+
+        Returns:
+            No return values
+        """
+        algorithm = algorithm.lower()
+        if algorithm not in QUERY_ALGORITHMS:
+            raise ValueError("unknown query algorithm %r, expected one of %s" %(algorithm, ", ".join(QUERY_ALGORITHMS)))
+        heuristic = heuristic.lower()
+        if heuristic not in HEURISTICS:
+            raise ValueError("unknown heuristic %r, expected one of %s" %(heuristic, ", ".join(HEURISTICS)))
+        if isinstance(maze, Grid):
+            self.grid = maze
+        elif cache is not None:
+            self.grid = cache.load(maze)[0]
+        else:
+            self.grid = load_maze(maze)
+        self.algorithm = algorithm
+        self.heuristic = heuristic
+        self.state = QueryState(self.grid.size)
+        self.open_set = None
+        if algorithm == "astar":
+            #the same open set A_star_explore makes for itself
+            self.open_set = HeapOpenSet(self.grid.size)
+        self.queries = 0
+
+    def cell(self, point)->int:
+        """
+        Method used to find the cell for a point of a query
+
+        Parameters:
+            self - the current queries
+            point - either a cell index or a tuple of the row and column of the cell
+
+        Returns:
+            The index of the cell
+        """
+        return point_cell(self.grid, point)
+
+    def query(self, start=None, goal=None, metrics:SearchMetrics=None)->tuple:
+        """
+        Method used to find a path between two cells
+
+        Parameters:
+            self - the current queries
+            start - the cell index or row and column the path starts at, the start of the maze if None
+            goal - the cell index or row and column the path ends at, the end of the maze if None
+            metrics - the metrics the work of the search is added to, None to skip counting
+
+        Returns:
+            path - the list of cells from the start cell to the goal cell, empty if there is no path
+            nodes_explored - the number of nodes explored by the search
+        """
+        start_cell = self.cell(start if start is not None else self.grid.start)
+        goal_cell = self.cell(goal if goal is not None else self.grid.end)
+        if self.algorithm == "astar":
+            nodes_explored, state = A_star_explore(self.grid, start_cell, goal_cell, self.heuristic, metrics, self.state, self.open_set)
+        else:
+            nodes_explored, state = dfs_explore(self.grid, start_cell, goal_cell, metrics, self.state)
+        self.queries += 1
+        if state.visited[goal_cell] != state.generation:
+            return [], nodes_explored
+        return state.path_to(goal_cell), nodes_explored
+
+    def query_many(self, queries:list, metrics:SearchMetrics=None)->list:
+        """
+        Method used to answer a list of queries
+
+        Parameters:
+            self - the current queries
+            queries - a list of start and goal pairs, each a cell index or row and column
+            metrics - the metrics the work of every search is added to, None to skip counting
+
+        Returns:
+            A list holding the path and nodes explored for each query, in the order they were given
+        """
+        return [self.query(start, goal, metrics) for start, goal in queries]
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used by the grid and the query state
+
+        Parameters:
+            self - the current queries
+
+        Returns:
+            The combined size of the grid and query state buffers in bytes
+        """
+        return self.grid.memory_usage() + self.state.memory_usage()
@@ -0,0 +1,312 @@
+import re
+import struct
+import sys
+import zlib
+from .grid import Grid
+
+#ANSI colour codes used to show visited cells in red and the path in green
+VISITED = "\033[1;91m-\033[0m"
+PATH_START = "\033[1;32mS\033[0m"
+PATH = "\033[1;32mP\033[0m"
+PATH_END = "\033[1;32mE\033[0m"
+RED = "\033[1;91m"
+GREEN = "\033[1;32m"
+RESET = "\033[0m"
+
+#the class of every cell of a solved maze, used as palette indices for images
+CELL_OPEN = 0
+CELL_WALL = 1
+CELL_VISITED = 2
+CELL_PATH = 3
+CELL_PATH_START = 4
+CELL_PATH_END = 5
+CELL_START = 6
+CELL_END = 7
+#characters of the cell classes, visited cells and the start and end off the path use placeholders until the colour
+#codes have been added
+CLASS_CHARS = bytes.maketrans(bytes(range(8)), b"-#rPSEse")
+PLACEHOLDERS = bytes.maketrans(b"rse", b"-SE")
+#runs of path cells within a row, the cells of a row are separated by single spaces
+PATH_RUNS = re.compile(b"[PSE](?: [PSE])*")
+PATH_TEMPLATE = (GREEN + "\\g<0>" + RESET).encode("ascii")
+#RGB colours of the cell classes: open, wall, visited, path, path start, path end, start, end
+PALETTE = ((255, 255, 255), (0, 0, 0), (230, 60, 60), (40, 170, 60), (20, 110, 40), (20, 110, 40),
+           (40, 90, 220), (40, 90, 220))
+
+def cell_classes(grid:Grid, path:list, visited:bytearray)->bytearray:
+    """
+        Method used to find the class of every cell of a solved maze
+
+        Parameters:
+            grid - the grid of the maze
+            path - the list of cells in the path, may be empty
+            visited - holds 1 for every cell visited by the search
+
+        Returns:
+            A bytearray holding one of the CELL_ constants for every cell of the grid
+    """
+    #walls and visited cells never overlap, so both can be combined in one shift and or
+    classes = (int.from_bytes(bytes(grid.walls), "little") | int.from_bytes(visited, "little") << 1).to_bytes(grid.size, "little")
+    classes = bytearray(classes)
+    if grid.start != -1 and not classes[grid.start]:
+        classes[grid.start] = CELL_START
+    if grid.end != -1 and not classes[grid.end]:
+        classes[grid.end] = CELL_END
+    if path:
+        for cell in path:
+            classes[cell] = CELL_PATH
+        classes[path[0]] = CELL_PATH_START
+        classes[path[-1]] = CELL_PATH_END
+    return classes
+
+def render_text(grid:Grid, path:list, visited:bytearray, colour:bool=True)->str:
+    """
+        Method used to draw a solved maze as a single string
+
+        Neighbouring cells of the same colour share one pair of colour codes, so the string is far shorter than one
+        with a code around every cell
+
+        Parameters:
+            grid - the grid of the maze
+            path - the list of cells in the path, may be empty
+            visited - holds 1 for every cell visited by the search
+            colour - whether visited cells and the path are coloured with ANSI codes
+
+        Returns:
+            The maze with one line per row, cells separated by spaces and a trailing newline
+    """
+    classes = cell_classes(grid, path, visited)
+    width = grid.width
+    text = bytearray(b" " * (2 * grid.size))
+    text[0::2] = classes.translate(CLASS_CHARS)
+    #the newline ending each row stops a run of colour from carrying on into the next row
+    text[2 * width - 1::2 * width] = b"\n" * grid.height
+    text = bytes(text)
+    if colour:
+        text = colour_runs(text, b"r", RED)
+        #the path is short, so its few runs are found with a regular expression
+        text = PATH_RUNS.sub(PATH_TEMPLATE, text)
+    return text.translate(PLACEHOLDERS).decode("ascii")
+
+def colour_runs(text:bytes, char:bytes, code:str)->bytes:
+    """
+        Method used to put colour codes around every run of one character within the rows of a drawn maze
+
+        Only bytes.replace is used, so the whole text is scanned a few times in C rather than once per run in Python
+
+        Parameters:
+            text - the drawn maze, cells separated by single spaces and rows ended by newlines
+            char - the single character of the cells to colour
+            code - the ANSI colour code for the cells
+
+        Returns:
+            The drawn maze with the code before every run and a reset after it
+    """
+    start = code.encode("ascii") + char
+    end = char + RESET.encode("ascii")
+    #joining the cells inside a run with a null byte, twice as replace does not look at overlapping pairs, leaves a
+    #space or a newline only at the ends of the runs
+    pair = char + b" " + char
+    joined = char + b"\x00" + char
+    text = text.replace(pair, joined).replace(pair, joined)
+    text = text.replace(b" " + char, b" " + start).replace(b"\n" + char, b"\n" + start)
+    if text.startswith(char):
+        text = code.encode("ascii") + text
+    text = text.replace(char + b" ", end + b" ").replace(char + b"\n", end + b"\n")
+    return text.replace(b"\x00", b" ")
+
+def render_maze(grid:Grid, path:list, visited:bytearray)->list:
+    """
+        Method used to build the display matrix of a solved maze
+
+        Parameters:
+            grid - the grid of the maze
+            path - the list of cells in the path, may be empty
+            visited - holds 1 for every cell visited by the search
+
+        Returns:
+            A 2D array of the maze with visited cells in red and the path in green
+    """
+    display_matrix = grid.display_matrix()
+    width = grid.width
+    cell = visited.find(1)
+    while cell != -1:
+        display_matrix[cell // width][cell % width] = VISITED
+        cell = visited.find(1, cell + 1)
+    if path:
+        for cell in path[1:-1]:
+            display_matrix[cell // width][cell % width] = PATH
+        display_matrix[path[0] // width][path[0] % width] = PATH_START
+        display_matrix[path[-1] // width][path[-1] % width] = PATH_END
+    return display_matrix
+
+def display_maze(maze)->None:
+    """
+        Method used to display a maze
+
+        Parameters:
+            maze - the string from render_text, or a 2D array representing the maze to be displayed
+
+        Returns:
+            No return values
+    """
+    if not isinstance(maze, str):
+        maze = "".join(" ".join(line) + "\n" for line in maze)
+    sys.stdout.write(maze)
+
+def format_path(grid:Grid, path:list, node_format:str="Node (%d, %d)", separator:str="->")->str:
+    """
+        Method used to write the cells of a path as a single string
+
+        Parameters:
+            grid - the grid of the maze
+            path - the list of cells in the path
+            node_format - the format used to write the coordinates of each cell
+            separator - the string written between the cells
+
+        Returns:
+            The coordinates of the cells of the path joined by the separator
+    """
+    width = grid.width
+    return separator.join([node_format %divmod(cell, width) for cell in path])
+
+def display_path(grid:Grid, path:list, node_format:str="Node (%d, %d)")->None:
+    """
+        Method used to display the cells of a path
+
+        Parameters:
+            grid - the grid of the maze
+            path - the list of cells in the path
+            node_format - the format used to print the coordinates of each cell
+
+        Returns:
+            No return values
+    """
+    if not path:
+        print("No path found")
+        return
+    sys.stdout.write(format_path(grid, path, node_format) + "\n")
+
+def write_path_file(file_name:str, grid:Grid, path:list)->None:
+    """
+        Method used to write the cells of a path to a text file, one row and column pair per line
+
+        Parameters:
+            file_name - the name of the file to write
+            grid - the grid of the maze
+            path - the list of cells in the path, an empty file is written if it is empty
+
+        Returns:
+            No return values
+    """
+    text = format_path(grid, path, "%d %d", "\n")
+    with open(file_name, "w") as path_file:
+        path_file.write(text + "\n" if text else "")
+
+def scale_rows(classes:bytearray, width:int, height:int, scale:int)->list:
+    """
+        Method used to enlarge every cell to a square of pixels
+
+        Parameters:
+            classes - the class of every cell of the grid
+            width - the width of the grid
+            height - the height of the grid
+            scale - the number of pixels along each side of a cell
+
+        Returns:
+            The list of rows of the image, each holding one class per pixel
+    """
+    if scale > 1:
+        wide = bytearray(len(classes) * scale)
+        for offset in range(scale):
+            wide[offset::scale] = classes
+        classes = wide
+        width *= scale
+    rows = []
+    for offset in range(0, width * height, width):
+        rows.extend([bytes(classes[offset:offset + width])] * scale)
+    return rows
+
+def png_chunk(tag:bytes, data:bytes)->bytes:
+    """
+        Method used to build a PNG chunk
+
+        Parameters:
+            tag - the four byte type of the chunk
+            data - the contents of the chunk
+
+        Returns:
+            The chunk with its length and CRC
+    """
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+def write_png(file_name:str, grid:Grid, path:list, visited:bytearray, scale:int=1)->None:
+    """
+        Method used to write a solved maze to a PNG image
+
+        The cell classes are used directly as indices into a palette, so every row of the image is a slice of the
+        class buffer
+
+        Parameters:
+            file_name - the name of the image file
+            grid - the grid of the maze
+            path - the list of cells in the path, may be empty
+            visited - holds 1 for every cell visited by the search
+            scale - the number of pixels along each side of a cell
+
+        Returns:
+            No return values
+    """
+    rows = scale_rows(cell_classes(grid, path, visited), grid.width, grid.height, scale)
+    #every row starts with filter type 0, meaning no filter
+    raw = b"\x00" + b"\x00".join(rows)
+    header = struct.pack(">IIBBBBB", grid.width * scale, grid.height * scale, 8, 3, 0, 0, 0)
+    palette = bytes(value for colour in PALETTE for value in colour)
+    with open(file_name, "wb") as image_file:
+        image_file.write(b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", header) + png_chunk(b"PLTE", palette) +
+                         png_chunk(b"IDAT", zlib.compress(raw, 6)) + png_chunk(b"IEND", b""))
+
+def write_ppm(file_name:str, grid:Grid, path:list, visited:bytearray, scale:int=1)->None:
+    """
+        Method used to write a solved maze to a binary PPM image
+
+        Parameters:
+            file_name - the name of the image file
+            grid - the grid of the maze
+            path - the list of cells in the path, may be empty
+            visited - holds 1 for every cell visited by the search
+            scale - the number of pixels along each side of a cell
+
+        Returns:
+            No return values
+    """
+    classes = b"".join(scale_rows(cell_classes(grid, path, visited), grid.width, grid.height, scale))
+    pixels = bytearray(3 * len(classes))
+    for channel in range(3):
+        table = bytes(PALETTE[index][channel] if index < len(PALETTE) else 0 for index in range(256))
+        pixels[channel::3] = classes.translate(table)
+    with open(file_name, "wb") as image_file:
+        image_file.write(b"P6\n%d %d\n255\n" %(grid.width * scale, grid.height * scale))
+        image_file.write(pixels)
+
+def write_image(file_name:str, grid:Grid, path:list, visited:bytearray, scale:int=1)->None:
+    """
+        Method used to write a solved maze to an image, choosing the format from the file extension
+
+        Parameters:
+            file_name - the name of the image file, ending in .png or .ppm
+            grid - the grid of the maze
+            path - the list of cells in the path, may be empty
+            visited - holds 1 for every cell visited by the search
+            scale - the number of pixels along each side of a cell
+
+        Returns:
+            No return values
+    """
+    extension = file_name.rsplit(".", 1)[-1].lower()
+    if extension == "png":
+        write_png(file_name, grid, path, visited, scale)
+    elif extension == "ppm":
+        write_ppm(file_name, grid, path, visited, scale)
+    else:
+        raise ValueError("Unknown image format %r, use .png or .ppm" %file_name)
@@ -0,0 +1,276 @@
+from array import array
+from heapq import heappush, heappop
+from .grid import Grid
+from .metrics import SearchMetrics
+
+#the g and rhs value of cells with no known path to the goal, small enough that adding a move cannot overflow
+INFINITY = 2**30
+
+class DStarLite:
+    """
+    This is a class designed to keep a shortest path up to date while cells of the maze are opened and closed
+
+    The search runs backwards from the goal, so g and rhs hold the distance from each cell to the goal and the path is
+    read off by stepping to the neighbour with the lowest g value. When cells change only the cells whose distance
+    is affected are expanded again, rather than searching the whole maze from scratch. The agent may move along the
+    path between changes, the key modifier keeps the keys already in the open set valid as the start moves
+
+    Atributes:
+        self.grid - the grid of the maze, changed in place as cells are toggled
+        self.start - the cell the agent is at
+        self.goal - the goal cell
+        self.g - the distance to the goal of every cell as of its last expansion
+        self.rhs - the distance to the goal of every cell worked out from the g values of its neighbours
+        self.open_set - the heap of (estimate, distance to the goal, cell) entries of the inconsistent cells, may hold stale entries
+        self.key_modifier - the manhattan distance moved by the agent since the search started
+        self.last - the cell the agent was at when the keys were last brought up to date
+        self.metrics - the metrics the work of the searches is added to, None to skip counting
+        self.pushes - the number of entries added to the open set since the distances were last brought up to date
+        self.nodes_explored - the number of cells expanded by the last call to plan or update_cells
+    """
+
+    def __init__(self, grid:Grid, start_cell:int, goal_cell:int, metrics:SearchMetrics=None)->None:
+        """
+        Method used to initialise the planner, the first path is found by plan
+
+        Parameters:
+            self - the current planner
+            grid - the grid of the maze
+            start_cell - the cell the agent starts at
+            goal_cell - the goal cell
+            metrics - the metrics the work of the searches is added to, None to skip counting
+
+        Returns:
+            No return values
+        """
+        self.grid = grid
+        self.start = start_cell
+        self.goal = goal_cell
+        self.g = array("i", [INFINITY]) * grid.size
+        self.rhs = array("i", [INFINITY]) * grid.size
+        self.rhs[goal_cell] = 0
+        self.key_modifier = 0
+        self.open_set = [self.key(goal_cell) + (goal_cell,)]
+        self.last = start_cell
+        self.metrics = metrics
+        self.pushes = 1
+        self.nodes_explored = 0
+
+    def heuristic(self, cell:int)->int:
+        """
+        Method used to find the manhattan distance from the agent to a cell
+
+        Parameters:
+            self - the current planner
+            cell - the index of the cell
+
+        Returns:
+            The manhattan distance between the agent and the cell
+        """
+        width = self.grid.width
+        start_x, start_y = divmod(self.start, width)
+        x, y = divmod(cell, width)
+        return abs(x - start_x) + abs(y - start_y)
+
+    def key(self, cell:int)->tuple:
+        """
+        Method used to find the priority of a cell in the open set
+
+        Parameters:
+            self - the current planner
+            cell - the index of the cell
+
+        Returns:
+            A tuple of the estimated length of the path through the cell and the distance from the cell to the goal
+        """
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self.heuristic(cell) + self.key_modifier, best)
+
+    def push(self, cell:int)->None:
+        """
+        Method used to add a cell to the open set with its current key
+
+        Parameters:
+            self - the current planner
+            cell - the index of the cell
+
+        Returns:
+            No return values
+        """
+        heappush(self.open_set, self.key(cell) + (cell,))
+        self.pushes += 1
+
+    def update_cell(self, cell:int)->None:
+        """
+        Method used to work out the rhs value of a cell again and add it to the open set if it is inconsistent
+
+        Parameters:
+            self - the current planner
+            cell - the index of the cell
+
+        Returns:
+            No return values
+        """
+        if cell != self.goal:
+            g_values = self.g
+            best = INFINITY
+            for neighbour in self.grid.neighbours(cell):
+                if g_values[neighbour] + 1 < best:
+                    best = g_values[neighbour] + 1
+            self.rhs[cell] = best
+        if self.g[cell] != self.rhs[cell]:
+            self.push(cell)
+
+    def compute_shortest_path(self)->int:
+        """
+        Method used to expand inconsistent cells until the distance of the agent is known
+
+        Entries are never removed from the open set, so entries for cells that have become consistent are skipped
+        and entries whose key is out of date are put back with their new key
+
+        Parameters:
+            self - the current planner
+
+        Returns:
+            The number of cells expanded
+        """
+        open_set = self.open_set
+        g_values = self.g
+        rhs = self.rhs
+        grid = self.grid
+        start = self.start
+        metrics = self.metrics
+        nodes_explored = 0
+        pops = 0
+        stale = 0
+        while open_set:
+            top_key = open_set[0][:2]
+            cell = open_set[0][2]
+            if g_values[cell] == rhs[cell]:
+                #the cell was made consistent after this entry was added
+                heappop(open_set)
+                pops += 1
+                stale += 1
+                continue
+            if top_key >= self.key(start) and rhs[start] == g_values[start]:
+                break
+            heappop(open_set)
+            pops += 1
+            new_key = self.key(cell)
+            if top_key < new_key:
+                heappush(open_set, new_key + (cell,))
+                self.pushes += 1
+                continue
+            nodes_explored += 1
+            if metrics is not None:
+                metrics.expanded(cell, rhs[cell], len(open_set) + 1)
+            if g_values[cell] > rhs[cell]:
+                #the cell got closer to the goal, which can only lower the rhs values of its neighbours
+                g_values[cell] = rhs[cell]
+                for neighbour in grid.neighbours(cell):
+                    if neighbour != self.goal and g_values[cell] + 1 < rhs[neighbour]:
+                        rhs[neighbour] = g_values[cell] + 1
+                        self.push(neighbour)
+            else:
+                #the cell got further from the goal, so it and every neighbour may have lost their best move
+                g_values[cell] = INFINITY
+                self.update_cell(cell)
+                for neighbour in grid.neighbours(cell):
+                    self.update_cell(neighbour)
+        if metrics is not None:
+            metrics.record(nodes_explored, self.pushes, pops, stale)
+        self.pushes = 0
+        self.nodes_explored = nodes_explored
+        return nodes_explored
+
+    def plan(self)->list:
+        """
+        Method used to bring the distances up to date and read off the path from the agent to the goal
+
+        Parameters:
+            self - the current planner
+
+        Returns:
+            The list of cells from the agent to the goal, empty if the goal cannot be reached
+        """
+        self.compute_shortest_path()
+        return self.path()
+
+    def path(self)->list:
+        """
+        Method used to read off the path from the agent to the goal by stepping to the neighbour closest to the goal
+
+        Parameters:
+            self - the current planner
+
+        Returns:
+            The list of cells from the agent to the goal, empty if the goal cannot be reached
+        """
+        g_values = self.g
+        cell = self.start
+        if min(g_values[cell], self.rhs[cell]) >= INFINITY or self.grid.walls[cell]:
+            return []
+        path = [cell]
+        while cell != self.goal:
+            best = INFINITY
+            step = -1
+            for neighbour in self.grid.neighbours(cell):
+                if g_values[neighbour] < best:
+                    best = g_values[neighbour]
+                    step = neighbour
+            #every step lowers g by one, so the path cannot loop while the distances are consistent
+            if step == -1 or len(path) > self.grid.size:
+                return []
+            cell = step
+            path.append(cell)
+        return path
+
+    def move_to(self, cell:int)->None:
+        """
+        Method used to move the agent, usually to a cell further along its path
+
+        Parameters:
+            self - the current planner
+            cell - the cell the agent moves to
+
+        Returns:
+            No return values
+        """
+        self.start = cell
+
+    def update_cells(self, cells:list)->list:
+        """
+        Method used to toggle cells between wall and open and repair the path
+
+        Only the toggled cells and their neighbours have their rhs values worked out again, the expansion that follows
+        only reaches the cells whose distance to the goal has changed
+
+        Parameters:
+            self - the current planner
+            cells - the cells to toggle, each wall becomes open and each open cell becomes a wall
+
+        Returns:
+            The repaired list of cells from the agent to the goal, empty if the goal cannot be reached
+        """
+        grid = self.grid
+        #the keys already in the open set were worked out from the old position of the agent
+        self.key_modifier += self.heuristic(self.last)
+        self.last = self.start
+        width = grid.width
+        affected = set()
+        for cell in cells:
+            grid.set_wall(cell, not grid.walls[cell])
+            affected.add(cell)
+            column = cell % width
+            if cell >= width:
+                affected.add(cell - width)
+            if cell + width < grid.size:
+                affected.add(cell + width)
+            if column:
+                affected.add(cell - 1)
+            if column != width - 1:
+                affected.add(cell + 1)
+        #walls have no neighbours, so their rhs values become infinite here
+        for cell in affected:
+            self.update_cell(cell)
+        return self.plan()
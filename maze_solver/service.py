@@ -0,0 +1,532 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+from .a_star import HEURISTICS
+from .cache import content_key
+from .grid import parse_maze
+from .query import MazeQueries, QUERY_ALGORITHMS
+from .solver import ALGORITHMS, solve, uses_heuristic
+
+DEFAULT_PORT = 8765
+#the number of results kept by the server and the number of parsed mazes kept by each worker
+DEFAULT_CACHE_SIZE = 1024
+WORKER_MAZES = 8
+#the number of solves that may be waiting or running before new ones are turned away
+DEFAULT_MAX_PENDING = 64
+#the number of requests from one connection handled at once, further lines are not read until one finishes
+CONNECTION_LIMIT = 16
+#the longest request line accepted, large enough for an uploaded maze
+LINE_LIMIT = 64 * 1024 * 1024
+
+#the parsed mazes of the current worker process, keyed by the hash of the maze file
+worker_mazes = OrderedDict()
+
+def worker_maze(key:str, data:bytes)->dict:
+    """
+        Method used to find a parsed maze inside a worker process, parsing it the first time it is seen
+
+        Parameters:
+            key - the hash of the maze file
+            data - the raw bytes of the maze file, None if only a maze this worker already holds may be used
+
+        Returns:
+            A dictionary holding the grid of the maze and the MazeQueries made for it so far, None if the worker does
+            not hold the maze and was not sent it
+    """
+    entry = worker_mazes.get(key)
+    if entry is None:
+        if data is None:
+            return None
+        entry = {"grid": parse_maze(data), "queries": {}}
+        worker_mazes[key] = entry
+        if len(worker_mazes) > WORKER_MAZES:
+            worker_mazes.popitem(last=False)
+    else:
+        worker_mazes.move_to_end(key)
+    return entry
+
+def solve_task(key:str, data:bytes, algorithm:str, heuristic:str, start:tuple, goal:tuple)->dict:
+    """
+        Method used to solve a maze inside a worker process
+
+        Mazes are kept parsed between tasks, and queries on the same maze share one MazeQueries so its search state
+        is reused. The algorithms MazeQueries cannot run answer queries with a single solve between the two cells
+
+        Parameters:
+            key - the hash of the maze file
+            data - the raw bytes of the maze file, None to only use a maze the worker already holds
+            algorithm - the search algorithm to use
+            heuristic - the heuristic used by the searches that need one, None for the others
+            start - the row and column the path starts at, the start of the maze if None
+            goal - the row and column the path ends at, the end of the maze if None
+
+        Returns:
+            A dictionary holding the path, its length, the nodes explored and the seconds spent searching, None if
+            no data was sent and the worker does not hold the maze
+    """
+    entry = worker_maze(key, data)
+    if entry is None:
+        return None
+    grid = entry["grid"]
+    heuristic = heuristic or HEURISTICS[0]
+    began = timer()
+    if (start is None and goal is None) or algorithm not in QUERY_ALGORITHMS:
+        result = solve(grid, algorithm=algorithm, heuristic=heuristic, start=start, goal=goal)
+        path, nodes_explored = result.path, result.nodes_explored
+    else:
+        queries = entry["queries"].get((algorithm, heuristic))
+        if queries is None:
+            queries = MazeQueries(grid, algorithm, heuristic)
+            entry["queries"][(algorithm, heuristic)] = queries
+        path, nodes_explored = queries.query(start, goal)
+    return {
+        "found": len(path) > 0,
+        "path_length": len(path),
+        "nodes_explored": nodes_explored,
+        "path": [list(grid.coords(cell)) for cell in path],
+        "solve": timer() - began,
+    }
+
+def read_file(file_name:str)->bytes:
+    """
+        Method used to read a maze file, run in a thread so the event loop is not blocked
+
+        Parameters:
+            file_name - the name of the maze file
+
+        Returns:
+            The raw bytes of the maze file
+    """
+    with open(file_name, "rb") as maze_file:
+        return maze_file.read()
+
+class ResultCache:
+    """
+    This is a class designed to keep the most recently used solve results
+
+    Atributes:
+        self.max_entries - the largest number of results kept
+        self.entries - the results in order of use, least recently used first
+        self.hits - the number of lookups that found a result
+        self.misses - the number of lookups that did not
+    """
+
+    def __init__(self, max_entries:int=DEFAULT_CACHE_SIZE)->None:
+        """
+        Method used to initialise the cache
+
+        Parameters:
+            self - the current cache
+            max_entries - the largest number of results kept, 0 turns the cache off
+
+        Returns:
+            No return values
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key:tuple):
+        """
+        Method used to look up a result, marking it as recently used
+
+        Parameters:
+            self - the current cache
+            key - the (maze hash, start, goal, algorithm, heuristic) of the solve
+
+        Returns:
+            The result, None if it is not in the cache
+        """
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key:tuple, result:dict)->None:
+        """
+        Method used to store a result, removing the least recently used result if the cache is full
+
+        Parameters:
+            self - the current cache
+            key - the (maze hash, start, goal, algorithm, heuristic) of the solve
+            result - the result of the solve
+
+        Returns:
+            No return values
+        """
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+class SolveService:
+    """
+    This is a class designed to answer solve requests sent as lines of JSON over a socket
+
+    Every request is a JSON object on its own line, holding either the name of a maze file ("maze") or its text
+    ("maze_text"), and optionally "algorithm", "heuristic", "start" and "goal" ([row, col]), "path" (whether to send
+    the cells back) and "id" (echoed in the response). A line of {"op": "stats"} returns the counters of the server.
+    Solves run in a pool of worker processes, so the event loop only reads, hashes and answers requests.
+    Identical solves share one result, both while they are running and afterwards through the result cache.
+    Once max_pending solves are waiting or running, new ones are answered with a busy error straight away
+
+    Atributes:
+        self.workers - the number of worker processes
+        self.max_pending - the largest number of solves waiting or running at once
+        self.cache - the ResultCache of finished solves
+        self.executor - the pool of worker processes, None until the server starts
+        self.slots - the semaphore limiting the solves handed to the pool to the number of workers
+        self.running - the solves currently waiting or running, keyed like the cache
+        self.sent - the hashes of the mazes recently sent to the worker pool, least recently used first
+        self.connections - the tasks answering the open connections
+        self.pending - the number of solves waiting or running
+        self.completed - the number of requests answered
+        self.rejected - the number of requests turned away because the server was busy
+    """
+
+    def __init__(self, workers:int=None, cache_size:int=DEFAULT_CACHE_SIZE, max_pending:int=DEFAULT_MAX_PENDING)->None:
+        """
+        Method used to initialise the service
+
+        Parameters:
+            self - the current service
+            workers - the number of worker processes, the number of cores if None
+            cache_size - the largest number of results kept in the cache
+            max_pending - the largest number of solves waiting or running at once
+
+        Returns:
+            No return values
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.cache = ResultCache(cache_size)
+        self.executor = None
+        self.slots = None
+        self.running = {}
+        self.sent = OrderedDict()
+        self.connections = set()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def start(self, host:str="127.0.0.1", port:int=DEFAULT_PORT)->asyncio.AbstractServer:
+        """
+        Method used to start the worker pool and listen for connections
+
+        Parameters:
+            self - the current service
+            host - the address to listen on
+            port - the port to listen on, 0 to pick a free port
+
+        Returns:
+            The asyncio server, its sockets hold the address it is listening on
+        """
+        #workers forked on demand would hold copies of the open sockets and keep closed connections from ending
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+        self.slots = asyncio.Semaphore(self.workers)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=LINE_LIMIT)
+
+    def close(self)->None:
+        """
+        Method used to shut down the worker pool
+
+        Parameters:
+            self - the current service
+
+        Returns:
+            No return values
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def handle_connection(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter)->None:
+        """
+        Method used to answer the requests sent over one connection
+
+        Up to CONNECTION_LIMIT requests are handled at once and answered as they finish, so responses may come back
+        out of order and carry the id of their request. No more lines are read while the limit is reached, which
+        pushes back on the client through the socket
+
+        Parameters:
+            self - the current service
+            reader - the stream the requests are read from
+            writer - the stream the responses are written to
+
+        Returns:
+            No return values
+        """
+        limit = asyncio.Semaphore(CONNECTION_LIMIT)
+        write_lock = asyncio.Lock()
+        tasks = set()
+        connection = asyncio.current_task()
+        self.connections.add(connection)
+
+        async def answer(line:bytes)->None:
+            try:
+                response = await self.handle_line(line)
+                async with write_lock:
+                    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                limit.release()
+
+        try:
+            while True:
+                await limit.acquire()
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    limit.release()
+                    break
+                if not line:
+                    limit.release()
+                    break
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            self.connections.discard(connection)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def handle_line(self, line:bytes)->dict:
+        """
+        Method used to answer a single request line
+
+        Parameters:
+            self - the current service
+            line - the JSON request
+
+        Returns:
+            The response, holding "ok" and either the result or an "error"
+        """
+        received = timer()
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("the request must be a JSON object")
+            request_id = request.get("id")
+            if request.get("op") == "stats":
+                response = {"ok": True, "stats": self.stats()}
+            else:
+                response = await self.handle_solve(request, received)
+        except (OSError, ValueError, RuntimeError) as error:
+            #a worker process dying breaks the pool, which is reported as a RuntimeError
+            response = {"ok": False, "error": str(error)}
+        if request_id is not None:
+            response["id"] = request_id
+        self.completed += 1
+        return response
+
+    async def handle_solve(self, request:dict, received:float)->dict:
+        """
+        Method used to answer a solve request from the cache or the worker pool
+
+        Parameters:
+            self - the current service
+            request - the parsed request
+            received - the time the request was read
+
+        Returns:
+            The response holding the result of the solve and the time spent in each step
+        """
+        algorithm = str(request.get("algorithm", "astar")).lower()
+        heuristic = str(request.get("heuristic", "manhattan")).lower()
+        if algorithm not in ALGORITHMS:
+            raise ValueError("unknown algorithm %r, expected one of %s" %(algorithm, ", ".join(ALGORITHMS)))
+        if heuristic not in HEURISTICS:
+            raise ValueError("unknown heuristic %r, expected one of %s" %(heuristic, ", ".join(HEURISTICS)))
+        if not uses_heuristic(algorithm):
+            #the heuristic makes no difference, so it is left out of the key to let equal solves share a result
+            heuristic = None
+        start = parse_point(request.get("start"))
+        goal = parse_point(request.get("goal"))
+        loop = asyncio.get_running_loop()
+        if "maze_text" in request:
+            data = str(request["maze_text"]).encode("utf-8")
+        elif "maze" in request:
+            data = await loop.run_in_executor(None, read_file, str(request["maze"]))
+        else:
+            raise ValueError("the request needs a maze file name or maze_text")
+        #hashing a large upload takes long enough to hold up the other connections
+        key = (await loop.run_in_executor(None, content_key, data), start, goal, algorithm, heuristic)
+        loaded = timer()
+
+        cached = True
+        result = self.cache.get(key)
+        if result is None:
+            running = self.running.get(key)
+            if running is None:
+                if self.pending >= self.max_pending:
+                    self.rejected += 1
+                    return {"ok": False, "error": "busy", "pending": self.pending}
+                #counted before anything is awaited, so requests arriving together cannot all pass the check
+                self.pending += 1
+                running = asyncio.ensure_future(self.run_solve(key, data))
+                self.running[key] = running
+                cached = False
+            #the result is shared, so one cancelled waiter must not cancel the solve for the others
+            result = await asyncio.shield(running)
+        finished = timer()
+
+        response = {"ok": True, "cached": cached}
+        response.update(result)
+        if not request.get("path", True):
+            response.pop("path")
+        response["timings"] = {
+            "load": loaded - received,
+            "wait": result["wait"] if not cached else 0.0,
+            "solve": result["solve"] if not cached else 0.0,
+            "total": finished - received,
+        }
+        response.pop("wait")
+        response.pop("solve")
+        return response
+
+    async def run_solve(self, key:tuple, data:bytes)->dict:
+        """
+        Method used to run a solve in the worker pool once a worker is free and store its result
+
+        Once a maze has been sent to the pool only its hash is sent, and the maze itself is only sent again to a
+        worker that does not hold it. The caller counts the solve as pending, and it stops counting once it ends
+
+        Parameters:
+            self - the current service
+            key - the (maze hash, start, goal, algorithm, heuristic) of the solve
+            data - the raw bytes of the maze file
+
+        Returns:
+            The result of the solve, including the seconds spent waiting for a worker
+        """
+        queued = timer()
+        try:
+            async with self.slots:
+                waited = timer() - queued
+                loop = asyncio.get_running_loop()
+                result = None
+                if key[0] in self.sent:
+                    result = await loop.run_in_executor(self.executor, solve_task, key[0], None, key[3], key[4], key[1], key[2])
+                if result is None:
+                    result = await loop.run_in_executor(self.executor, solve_task, key[0], data, key[3], key[4], key[1], key[2])
+                    #a worker that dropped the maze simply asks for it again, so only the recent hashes are kept
+                    self.sent[key[0]] = True
+                    if len(self.sent) > WORKER_MAZES * self.workers:
+                        self.sent.popitem(last=False)
+                else:
+                    self.sent.move_to_end(key[0])
+            result["wait"] = waited
+            self.cache.put(key, result)
+            return result
+        finally:
+            self.pending -= 1
+            del self.running[key]
+
+    def stats(self)->dict:
+        """
+        Method used to gather the counters of the server
+
+        Parameters:
+            self - the current service
+
+        Returns:
+            A dictionary of the counters
+        """
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "cache_entries": len(self.cache.entries),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
+
+def parse_point(point)->tuple:
+    """
+        Method used to read a start or goal from a request
+
+        Parameters:
+            point - a list of the row and column, or None
+
+        Returns:
+            A tuple of the row and column, None if no point was given
+    """
+    if point is None:
+        return None
+    try:
+        x_coord, y_coord = point
+        return int(x_coord), int(y_coord)
+    except (TypeError, ValueError):
+        raise ValueError("points are written as [row, col], not %r" %(point,))
+
+async def serve(host:str, port:int, workers:int=None, cache_size:int=DEFAULT_CACHE_SIZE, max_pending:int=DEFAULT_MAX_PENDING)->None:
+    """
+        Method used to run the service until it is interrupted
+
+        Parameters:
+            host - the address to listen on
+            port - the port to listen on
+            workers - the number of worker processes, the number of cores if None
+            cache_size - the largest number of results kept in the cache
+            max_pending - the largest number of solves waiting or running at once
+
+        Returns:
+            No return values
+    """
+    service = SolveService(workers, cache_size, max_pending)
+    server = await service.start(host, port)
+    address = server.sockets[0].getsockname()
+    print("Listening on %s:%d with %d workers" %(address[0], address[1], service.workers), file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv:list=None)->int:
+    """
+        Method used to run the service from the command line
+
+        Parameters:
+            argv - the command line arguments, the arguments of the process are used if None
+
+        Returns:
+            The exit status
+    """
+    parser = argparse.ArgumentParser(prog="maze_solver.service", description="Answer maze solve requests sent as lines of JSON over TCP.")
+    parser.add_argument("--host", default="127.0.0.1", help="the address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="the port to listen on (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="the number of worker processes (default: number of cores)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="the number of results kept (default: %(default)s)")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="the number of solves waiting or running before new ones are turned away (default: %(default)s)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
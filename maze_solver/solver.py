@@ -0,0 +1,319 @@
+from timeit import default_timer as timer
+from .grid import Grid, load_maze, point_cell
+from .dfs import dfs_explore
+from .bfs import bfs_explore
+from .dijkstra import dijkstra_explore
+from .a_star import A_star_explore, HEURISTICS
+from .bidirectional import bidirectional_A_star_search, bidirectional_bfs_search
+from .jps import jump_point_search
+from .contract import JunctionGraph, contracted_search
+from .landmarks import LandmarkIndex
+from .packed import PackedGrid
+from .metrics import SearchMetrics
+from .multi import multi_source_search
+from .components import label_components
+from .native import A_star_explore_native, bfs_explore_native, dfs_explore_native, native_supported, prepare_kernels
+
+#the search algorithms that can be used by solve
+ALGORITHMS = ("dfs", "bfs", "astar", "bidirectional-astar", "bidirectional-bfs", "jps", "contracted", "dijkstra", "cost-astar")
+#the searches that follow the cell costs of weighted mazes, the others treat every open cell as costing 1
+COST_ALGORITHMS = ("dijkstra", "cost-astar")
+#the searches that have a compiled kernel
+NATIVE_ALGORITHMS = ("dfs", "bfs", "astar")
+#the number of component sizes reported by the reachability check
+COMPONENT_SIZES = 5
+
+def uses_heuristic(algorithm:str)->bool:
+    """
+        Method used to check if a search algorithm is guided by a heuristic
+
+        Parameters:
+            algorithm - the lower case name of the search algorithm
+
+        Returns:
+            True for the A*, jump point and contracted searches
+    """
+    return algorithm.endswith("astar") or algorithm in ("jps", "contracted")
+
+class SolveResult:
+    """
+    This is a class designed to hold the result of solving a maze
+
+    Atributes:
+        self.grid - the grid of the maze that was solved
+        self.algorithm - the name of the search algorithm used
+        self.heuristic - the heuristic used by the search, None if the search does not use one
+        self.path - the list of cells from the start to the end, empty if there is no path
+        self.nodes_explored - the number of nodes explored by the search
+        self.states - the list of search states left behind by the search, one for each direction searched
+        self.timings - a dictionary linking the name of each phase to the seconds it took
+        self.stats - a dictionary of extra counts reported by the search
+        self.visited_cells - the visited cells of the grid when the states are not indexed by cell, otherwise None
+        self.metrics - the SearchMetrics counted during the search, None if the search was not counted
+    """
+
+    def __init__(self, grid:Grid, algorithm:str, heuristic:str, path:list, nodes_explored:int, states:list, timings:dict, stats:dict=None, visited_cells:bytearray=None, metrics:SearchMetrics=None)->None:
+        """
+        Method used to initialise a solve result
+
+        Parameters:
+            self - the current result
+            grid - the grid of the maze that was solved
+            algorithm - the name of the search algorithm used
+            heuristic - the heuristic used by the search, None if the search does not use one
+            path - the list of cells from the start to the end
+            nodes_explored - the number of nodes explored by the search
+            states - the list of search states left behind by the search
+            timings - a dictionary linking the name of each phase to the seconds it took
+            stats - a dictionary of extra counts reported by the search
+            visited_cells - the visited cells of the grid when the states are not indexed by cell
+            metrics - the SearchMetrics counted during the search
+
+        Returns:
+            No return values
+        """
+        self.grid = grid
+        self.algorithm = algorithm
+        self.heuristic = heuristic
+        self.path = path
+        self.nodes_explored = nodes_explored
+        self.states = states
+        self.timings = timings
+        self.stats = stats if stats is not None else {}
+        self.visited_cells = visited_cells
+        self.metrics = metrics
+
+    def found(self)->bool:
+        """
+        Method used to check if a path was found
+
+        Parameters:
+            self - the current result
+
+        Returns:
+            Whether or not the search found a path
+        """
+        return len(self.path) > 0
+
+    def visited(self)->bytearray:
+        """
+        Method used to find every cell visited by the search
+
+        Parameters:
+            self - the current result
+
+        Returns:
+            A bytearray holding 1 for every cell visited in any direction of the search
+        """
+        if self.visited_cells is not None:
+            return self.visited_cells
+        if len(self.states) == 1:
+            return self.states[0].visited
+        merged = 0
+        for state in self.states:
+            merged |= int.from_bytes(state.visited, "little")
+        return bytearray(merged.to_bytes(self.grid.size, "little"))
+
+    def path_coords(self)->list:
+        """
+        Method used to find the coordinates of every cell in the path
+
+        Parameters:
+            self - the current result
+
+        Returns:
+            A list of x, y coordinate tuples from the start to the end
+        """
+        return [self.grid.coords(cell) for cell in self.path]
+
+    def memory_usage(self)->int:
+        """
+        Method used to find the number of bytes used by the grid and the search state
+
+        Parameters:
+            self - the current result
+
+        Returns:
+            The combined size of the grid and search state buffers in bytes
+        """
+        return self.grid.memory_usage() + sum(state.memory_usage() for state in self.states)
+
+    def to_dict(self)->dict:
+        """
+        Method used to turn the result into a dictionary that can be written as JSON
+
+        Parameters:
+            self - the current result
+
+        Returns:
+            A dictionary holding the summary of the result
+        """
+        summary = {
+            "algorithm": self.algorithm,
+            "heuristic": self.heuristic,
+            "width": self.grid.width,
+            "height": self.grid.height,
+            "found": self.found(),
+            "path_length": len(self.path),
+            "nodes_explored": self.nodes_explored,
+            "timings": self.timings,
+            "stats": self.stats,
+            "memory_usage": self.memory_usage(),
+            "path": [list(coords) for coords in self.path_coords()],
+        }
+        if self.metrics is not None:
+            summary["metrics"] = self.metrics.to_dict()
+        return summary
+
+def solve(maze, algorithm:str="astar", heuristic:str="manhattan", cache=None, metrics:SearchMetrics=None, all_openings:bool=False, check_reachable:bool=False, workers:int=1, native:bool=True, start=None, goal=None)->SolveResult:
+    """
+        Method used to solve a maze from its start to its end, or between two other cells
+
+        Parameters:
+            maze - either a grid or the file name of a maze
+            algorithm - the search algorithm to use (dfs/bfs/astar/bidirectional-astar/bidirectional-bfs/jps/contracted/
+                        dijkstra/cost-astar), dijkstra and cost-astar follow the cell costs of weighted mazes
+            heuristic - the heuristic used by the A*, jump point, contracted and cost A* searches (manhattan/euclidean/alt)
+            cache - a MazeCache used to load maze files and their junction graphs, maze files are parsed every time if None
+            metrics - the SearchMetrics the work of the search is added to, None to skip counting
+            all_openings - search from every opening on the top row at once and stop at the nearest opening on the
+                           bottom row, rather than from the start to the end (astar only)
+            check_reachable - label the connected regions of the maze first and skip the search if the start and end
+                              are not in the same region
+            workers - the number of processes used to label the regions of large mazes, the number of cores if None
+            native - run dfs, bfs and A* in the compiled kernels when numba is installed, the search runs in Python when the
+                     kernels cannot be used, with metrics, the alt heuristic or a packed grid
+            start - the cell index or row and column the path starts at, the start of the maze if None
+            goal - the cell index or row and column the path ends at, the end of the maze if None
+
+        Returns:
+            The result of the search
+    """
+    algorithm = algorithm.lower()
+    if algorithm not in ALGORITHMS:
+        raise ValueError("unknown algorithm %r, expected one of %s" %(algorithm, ", ".join(ALGORITHMS)))
+    heuristic = heuristic.lower()
+    guided = uses_heuristic(algorithm)
+    if guided and heuristic not in HEURISTICS:
+        raise ValueError("unknown heuristic %r, expected one of %s" %(heuristic, ", ".join(HEURISTICS)))
+    if all_openings and algorithm != "astar":
+        raise ValueError("searching from every opening is only supported by astar, not %s" %algorithm)
+    if all_openings and (start is not None or goal is not None):
+        raise ValueError("searching from every opening cannot be given a start or goal")
+
+    timings = {}
+    stats = {}
+    graph = None
+    if isinstance(maze, Grid):
+        grid = maze
+    elif cache is not None:
+        began = timer()
+        grid, graph, hit = cache.load(maze, with_graph=algorithm == "contracted")
+        timings["parse"] = timer() - began
+        stats["cache"] = "hit" if hit else "miss"
+    else:
+        began = timer()
+        grid = load_maze(maze)
+        timings["parse"] = timer() - began
+    if (start is None and grid.start == -1) or (goal is None and grid.end == -1):
+        raise ValueError("the maze needs an opening on its top and bottom rows")
+    start_cell = point_cell(grid, start) if start is not None else grid.start
+    goal_cell = point_cell(grid, goal) if goal is not None else grid.end
+    if algorithm == "contracted" and isinstance(grid, PackedGrid):
+        raise ValueError("the contracted search needs a grid with a byte per cell, not a packed grid")
+
+    if check_reachable:
+        began = timer()
+        components = label_components(grid, workers)
+        timings["components"] = timer() - began
+        stats["components"] = components.count()
+        stats["component_sizes"] = components.largest(COMPONENT_SIZES)
+        stats["unreachable_cells"] = components.unreachable_from(start_cell)
+        sources = grid.entrances() if all_openings else [start_cell]
+        targets = grid.exits() if all_openings else [goal_cell]
+        labels = {components.component_of(cell) for cell in sources}
+        stats["reachable"] = any(components.component_of(cell) in labels for cell in targets)
+        if not stats["reachable"]:
+            #no search can find a path, so the preprocessing and search are skipped
+            timings["search"] = 0.0
+            return SolveResult(grid, algorithm, heuristic if guided else None, [], 0, [], timings, stats, None, metrics)
+
+    visited_cells = None
+    if guided and heuristic == "alt":
+        if grid.landmarks is None:
+            began = timer()
+            grid.landmarks = LandmarkIndex(grid)
+            timings["landmarks"] = timer() - began
+        stats["landmarks"] = len(grid.landmarks.landmarks)
+        stats["landmark_memory"] = grid.landmarks.memory_usage()
+    if algorithm == "contracted":
+        #a cached graph only keeps the start and end of the maze as nodes
+        if graph is None or (start_cell, goal_cell) != (grid.start, grid.end):
+            began = timer()
+            graph = JunctionGraph(grid, (start_cell, goal_cell))
+            timings["contract"] = timer() - began
+        stats["junction_nodes"] = graph.node_count()
+        stats["compression_ratio"] = graph.compression_ratio()
+        stats["graph_memory"] = graph.memory_usage()
+
+    if algorithm in NATIVE_ALGORITHMS and not all_openings:
+        stats["native"] = native and native_supported(grid, heuristic if algorithm == "astar" else None, metrics)
+        began = timer()
+        if stats["native"] and prepare_kernels():
+            timings["compile"] = timer() - began
+
+    began = timer()
+    if all_openings:
+        entrances = grid.entrances()
+        exits = grid.exits()
+        path, nodes_explored, state = multi_source_search(grid, entrances, exits, heuristic, metrics)
+        states = [state]
+        stats["entrances"] = len(entrances)
+        stats["exits"] = len(exits)
+    elif algorithm in NATIVE_ALGORITHMS + COST_ALGORITHMS:
+        if algorithm == "dfs":
+            if stats["native"]:
+                nodes_explored, state = dfs_explore_native(grid, start_cell, goal_cell)
+            else:
+                nodes_explored, state = dfs_explore(grid, start_cell, goal_cell, metrics)
+        elif algorithm == "bfs":
+            if stats["native"]:
+                nodes_explored, state = bfs_explore_native(grid, start_cell, goal_cell)
+            else:
+                nodes_explored, state = bfs_explore(grid, start_cell, goal_cell, metrics)
+        elif algorithm in COST_ALGORITHMS:
+            nodes_explored, state = dijkstra_explore(grid, start_cell, goal_cell, heuristic if algorithm == "cost-astar" else None, metrics)
+            if state.visited[goal_cell]:
+                stats["path_cost"] = state.g[goal_cell]
+        elif stats["native"]:
+            nodes_explored, state = A_star_explore_native(grid, start_cell, goal_cell, heuristic)
+        else:
+            nodes_explored, state = A_star_explore(grid, start_cell, goal_cell, heuristic, metrics)
+        states = [state]
+        #following the parents back is timed as its own phase
+        timings["search"] = timer() - began
+        began = timer()
+        path = state.path_to(goal_cell) if state.visited[goal_cell] else []
+    elif algorithm == "jps":
+        path, nodes_explored, state = jump_point_search(grid, start_cell, goal_cell, heuristic, metrics)
+        states = [state]
+    elif algorithm == "contracted":
+        path, nodes_explored, state = contracted_search(graph, start_cell, goal_cell, heuristic, metrics)
+        states = [state]
+        visited_cells = bytearray(grid.size)
+        for node, cell in enumerate(graph.nodes):
+            if state.visited[node]:
+                visited_cells[cell] = 1
+    else:
+        if algorithm == "bidirectional-astar":
+            path, explored, states = bidirectional_A_star_search(grid, start_cell, goal_cell, heuristic, metrics)
+        else:
+            path, explored, states = bidirectional_bfs_search(grid, start_cell, goal_cell, metrics)
+        nodes_explored = sum(explored)
+        stats["nodes_explored_forward"], stats["nodes_explored_backward"] = explored
+        states = list(states)
+    #these searches have already recorded their search time, so the time left is spent following the parents
+    timings["path" if "search" in timings else "search"] = timer() - began
+    if not guided:
+        heuristic = None
+    return SolveResult(grid, algorithm, heuristic, path, nodes_explored, states, timings, stats, visited_cells, metrics)
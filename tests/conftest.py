@@ -0,0 +1,102 @@
+import os
+import sys
+from collections import deque
+import pytest
+
+#the package is not installed, so it is imported from the root of the repository
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maze_solver.grid import load_maze, parse_maze
+
+#the shipped mazes small enough to solve with every algorithm in Python, with the length of their shortest path
+SHORTEST_PATHS = {"maze-Easy.txt": 27, "maze-Medium.txt": 321, "maze-Large.txt": 974}
+
+def maze_path(name:str)->str:
+    """
+        Method used to find a shipped maze file
+
+        Parameters:
+            name - the file name of the maze
+
+        Returns:
+            The path of the maze file in the root of the repository
+    """
+    return os.path.join(ROOT, name)
+
+@pytest.fixture(scope="session")
+def grids()->dict:
+    """
+        Method used to parse each shipped maze once for the whole test session
+
+        Parameters:
+            No parameters
+
+        Returns:
+            A dictionary linking the file name of each maze in SHORTEST_PATHS to its grid
+    """
+    return {name: load_maze(maze_path(name)) for name in SHORTEST_PATHS}
+
+def check_path(grid, path:list, start_cell:int, goal_cell:int)->None:
+    """
+        Method used to check that a path joins two cells through open neighbouring cells
+
+        Parameters:
+            grid - the grid of the maze
+            path - the list of cells of the path
+            start_cell - the cell the path has to start at
+            goal_cell - the cell the path has to end at
+
+        Returns:
+            No return values
+    """
+    assert path[0] == start_cell and path[-1] == goal_cell
+    assert all(not grid.walls[cell] for cell in path)
+    for cell, following in zip(path, path[1:]):
+        assert following in grid.neighbours(cell)
+
+def bfs_distances(grid, source:int)->list:
+    """
+        Method used to find the number of steps from a cell to every other cell, the oracle the searches are checked on
+
+        Parameters:
+            grid - the grid of the maze
+            source - the cell the steps are counted from
+
+        Returns:
+            A list holding the steps to each cell, -1 for the cells that cannot be reached
+    """
+    distances = [-1] * (grid.width * grid.height)
+    distances[source] = 0
+    frontier = deque([source])
+    while frontier:
+        cell = frontier.popleft()
+        for neighbour in grid.neighbours(cell):
+            if distances[neighbour] == -1:
+                distances[neighbour] = distances[cell] + 1
+                frontier.append(neighbour)
+    return distances
+
+def open_cells(grid)->list:
+    """
+        Method used to list the open cells of a maze
+
+        Parameters:
+            grid - the grid of the maze
+
+        Returns:
+            The list of the indexes of the open cells
+    """
+    return [cell for cell in range(grid.width * grid.height) if not grid.walls[cell]]
+
+def small_maze(rows:list):
+    """
+        Method used to build a grid from rows written with # for walls and . for open cells
+
+        Parameters:
+            rows - the list of rows of the maze
+
+        Returns:
+            The grid for the maze
+    """
+    return parse_maze("\n".join(" ".join(row.replace(".", "-")) for row in rows).encode())
@@ -0,0 +1,38 @@
+import random
+import pytest
+from conftest import bfs_distances, check_path, open_cells
+from maze_solver.a_star import HEURISTICS
+from maze_solver.bidirectional import bidirectional_A_star_search, bidirectional_bfs_search
+
+SEARCHES = {
+    "bidirectional-astar": lambda grid, start_cell, goal_cell, heuristic: bidirectional_A_star_search(grid, start_cell, goal_cell, heuristic),
+    "bidirectional-bfs": lambda grid, start_cell, goal_cell, heuristic: bidirectional_bfs_search(grid, start_cell, goal_cell),
+}
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+@pytest.mark.parametrize("search", SEARCHES)
+def test_random_pairs_match_oracle(grids, search, heuristic):
+    rng = random.Random(5)
+    for name in ("maze-Medium.txt", "maze-Large.txt"):
+        grid = grids[name]
+        cells = open_cells(grid)
+        for _ in range(8):
+            start_cell, goal_cell = rng.choice(cells), rng.choice(cells)
+            distances = bfs_distances(grid, start_cell)
+            path = SEARCHES[search](grid, start_cell, goal_cell, heuristic)[0]
+            check_path(grid, path, start_cell, goal_cell)
+            assert len(path) - 1 == distances[goal_cell]
+
+@pytest.mark.parametrize("search", SEARCHES)
+def test_neighbouring_and_equal_cells(grids, search):
+    grid = grids["maze-Easy.txt"]
+    cell = grid.start
+    assert SEARCHES[search](grid, cell, cell, "manhattan")[0] == [cell]
+    neighbour = grid.neighbours(cell)[0]
+    assert SEARCHES[search](grid, cell, neighbour, "manhattan")[0] == [cell, neighbour]
+
+@pytest.mark.parametrize("search", SEARCHES)
+def test_both_sides_explore(grids, search):
+    grid = grids["maze-Large.txt"]
+    explored = SEARCHES[search](grid, grid.start, grid.end, "manhattan")[1]
+    assert explored[0] > 0 and explored[1] > 0
@@ -0,0 +1,73 @@
+import shutil
+from conftest import SHORTEST_PATHS, maze_path
+from maze_solver.cache import MazeCache
+from maze_solver.grid import load_maze
+from maze_solver.solver import ALGORITHMS, solve
+
+def test_round_trip(tmp_path):
+    cache = MazeCache(str(tmp_path))
+    for name in SHORTEST_PATHS:
+        parsed = load_maze(maze_path(name))
+        assert not cache.load(maze_path(name))[2]
+        grid, graph, hit = cache.load(maze_path(name))
+        assert hit and graph is None
+        assert (grid.width, grid.height, grid.start, grid.end) == (parsed.width, parsed.height, parsed.start, parsed.end)
+        assert bytes(grid.walls) == bytes(parsed.walls)
+        assert bytes(grid.masks) == bytes(parsed.masks)
+        #an entry stored without its junction graph is made again with it the first time the graph is asked for
+        assert not cache.load(maze_path(name), with_graph=True)[2]
+        grid, graph, hit = cache.load(maze_path(name), with_graph=True)
+        assert hit and graph.node_count() > 0
+        assert bytes(grid.walls) == bytes(parsed.walls)
+    assert cache.hits == cache.misses == 2 * len(SHORTEST_PATHS)
+
+def test_solves_match_without_cache(tmp_path, grids):
+    cache = MazeCache(str(tmp_path))
+    name = "maze-Medium.txt"
+    for algorithm in ALGORITHMS:
+        cached = solve(maze_path(name), algorithm=algorithm, cache=cache, native=False)
+        assert cached.path == solve(grids[name], algorithm=algorithm, native=False).path
+    #the only miss after the first is the contracted search asking for the junction graph
+    assert cache.misses == 2
+
+def test_costs_are_stored(tmp_path):
+    #a weighted copy of the easy maze, every open cell of its second row costs 5
+    lines = open(maze_path("maze-Easy.txt")).read().splitlines()
+    lines[1] = lines[1].replace("-", "5")
+    weighted = tmp_path / "weighted.txt"
+    weighted.write_text("\n".join(lines) + "\n")
+    cache = MazeCache(str(tmp_path / "cache"))
+    missed = solve(str(weighted), algorithm="dijkstra", cache=cache)
+    hit = solve(str(weighted), algorithm="dijkstra", cache=cache)
+    assert (missed.stats["cache"], hit.stats["cache"]) == ("miss", "hit")
+    assert hit.stats["path_cost"] == missed.stats["path_cost"] > len(missed.path) - 1
+    assert bytes(hit.grid.costs) == bytes(missed.grid.costs)
+
+def test_changed_file_is_a_miss(tmp_path):
+    cache = MazeCache(str(tmp_path / "cache"))
+    copy = tmp_path / "maze.txt"
+    shutil.copy(maze_path("maze-Easy.txt"), copy)
+    assert not cache.load(str(copy))[2]
+    assert cache.load(str(copy))[2]
+    #closing the start replaces the entry of the file
+    text = copy.read_text()
+    copy.write_text(text.replace("-", "#", 1))
+    grid, _, hit = cache.load(str(copy))
+    assert not hit
+    assert len(cache.entries()) == 1
+
+def test_changing_a_cell_keeps_the_entry(tmp_path, grids):
+    cache = MazeCache(str(tmp_path))
+    name = "maze-Easy.txt"
+    cache.load(maze_path(name))
+    grid, _, hit = cache.load(maze_path(name))
+    assert hit
+    start = grid.start
+    grid.set_wall(start, True)
+    assert grid.walls[start] and grid.start != start and grid.masks[start] == 0
+    #the entry is mapped copy on write, so a later load still sees the maze as it was stored
+    stored, _, hit = cache.load(maze_path(name))
+    assert hit and bytes(stored.walls) == bytes(grids[name].walls)
+    grid.set_wall(start, False)
+    assert grid.start == start
+    assert bytes(grid.masks) == bytes(grids[name].masks)
@@ -0,0 +1,67 @@
+import random
+import pytest
+from conftest import bfs_distances, open_cells, small_maze
+from maze_solver import components
+from maze_solver.components import label_components
+
+def oracle_labels(grid)->list:
+    """
+        Method used to label the connected regions of a maze one breadth first search at a time
+
+        Parameters:
+            grid - the grid of the maze
+
+        Returns:
+            A list holding the region of every cell, numbered in the order their first cells appear, -1 for walls
+    """
+    labels = [-1] * grid.size
+    count = 0
+    for cell in open_cells(grid):
+        if labels[cell] == -1:
+            for reached, distance in enumerate(bfs_distances(grid, cell)):
+                if distance != -1:
+                    labels[reached] = count
+            count += 1
+    return labels
+
+def random_maze(rows:int, columns:int, seed:int):
+    """
+        Method used to build a maze of randomly placed walls, which splits into many regions
+
+        Parameters:
+            rows - the number of rows
+            columns - the number of columns
+            seed - the seed of the random numbers
+
+        Returns:
+            The grid of the maze
+    """
+    rng = random.Random(seed)
+    return small_maze(["".join("#" if rng.random() < 0.45 else "." for _ in range(columns)) for _ in range(rows)])
+
+@pytest.mark.parametrize("band_rows", (1, 3, 7, 1000))
+@pytest.mark.parametrize("workers", (1, 2))
+def test_labels_match_oracle(monkeypatch, grids, band_rows, workers):
+    monkeypatch.setattr(components, "BAND_ROWS", band_rows)
+    monkeypatch.setattr(components, "PARALLEL_CELLS", 0)
+    for grid in (random_maze(23, 31, band_rows), grids["maze-Medium.txt"]):
+        found = label_components(grid, workers)
+        expected = oracle_labels(grid)
+        #the regions are numbered in the same order, so the labels must match exactly
+        assert list(found.labels()) == expected
+        assert found.count() == max(expected) + 1
+        assert sum(found.sizes) == len(open_cells(grid))
+
+def test_queries():
+    grid = random_maze(15, 20, 5)
+    found = label_components(grid)
+    expected = oracle_labels(grid)
+    cells = open_cells(grid)
+    rng = random.Random(18)
+    for _ in range(50):
+        first, second = rng.choice(cells), rng.choice(cells)
+        assert found.connected(first, second) == (expected[first] == expected[second])
+        assert found.unreachable_from(first) == sum(1 for label in expected if label not in (-1, expected[first]))
+    wall = next(cell for cell in range(grid.size) if grid.walls[cell])
+    assert found.component_of(wall) == -1 and not found.connected(wall, wall)
+    assert found.largest(1) == [max(found.sizes)]
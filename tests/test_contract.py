@@ -0,0 +1,52 @@
+import random
+import pytest
+from conftest import SHORTEST_PATHS, bfs_distances, check_path, open_cells, small_maze
+from maze_solver.a_star import HEURISTICS
+from maze_solver.contract import JunctionGraph, contracted_search
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_shipped_mazes_give_shortest_paths(grids, heuristic):
+    for name, length in SHORTEST_PATHS.items():
+        grid = grids[name]
+        graph = JunctionGraph(grid, (grid.start, grid.end))
+        path = contracted_search(graph, grid.start, grid.end, heuristic)[0]
+        check_path(grid, path, grid.start, grid.end)
+        assert len(path) == length
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_random_pairs_match_oracle(grids, heuristic):
+    rng = random.Random(9)
+    for name in ("maze-Medium.txt", "maze-Large.txt"):
+        grid = grids[name]
+        cells = open_cells(grid)
+        for _ in range(8):
+            start_cell, goal_cell = rng.choice(cells), rng.choice(cells)
+            distances = bfs_distances(grid, start_cell)
+            graph = JunctionGraph(grid, (start_cell, goal_cell))
+            path = contracted_search(graph, start_cell, goal_cell, heuristic)[0]
+            check_path(grid, path, start_cell, goal_cell)
+            assert len(path) - 1 == distances[goal_cell]
+
+def test_edges_are_corridors(grids):
+    grid = grids["maze-Large.txt"]
+    graph = JunctionGraph(grid, (grid.start, grid.end))
+    assert graph.compression_ratio() > 1
+    for node in range(graph.node_count()):
+        for edge in range(graph.edge_offsets[node], graph.edge_offsets[node + 1]):
+            #the corridor holds the cells strictly between the two nodes
+            inside = list(graph.corridor(graph.edge_corridors[edge]))
+            cells = [graph.nodes[node]] + inside + [graph.nodes[graph.edge_targets[edge]]]
+            assert len(cells) - 1 == graph.edge_weights[edge]
+            check_path(grid, cells, cells[0], cells[-1])
+
+def test_cells_that_are_not_nodes_are_rejected():
+    grid = small_maze([
+        "#####",
+        "#...#",
+        "#####",
+    ])
+    graph = JunctionGraph(grid)
+    middle = grid.width + 2
+    assert graph.node_index[middle] == -1
+    with pytest.raises(ValueError):
+        contracted_search(graph, middle, grid.width + 1, "manhattan")
@@ -0,0 +1,97 @@
+import random
+from heapq import heappush, heappop
+import pytest
+from conftest import SHORTEST_PATHS, bfs_distances, check_path, open_cells, small_maze
+from maze_solver.a_star import HEURISTICS
+from maze_solver.bfs import bfs_explore
+from maze_solver.dijkstra import dijkstra_search
+from maze_solver.generate import carve
+
+#Dijkstra and A* over the costs with each heuristic
+CHOICES = (None,) + HEURISTICS
+
+def heap_costs(grid, source:int)->list:
+    """
+        Method used to find the cost of the cheapest path from a cell to every other cell with a heap
+
+        Parameters:
+            grid - the grid of the maze
+            source - the cell the costs are counted from
+
+        Returns:
+            A list holding the cost of reaching each cell, -1 for the cells that cannot be reached
+    """
+    totals = [-1] * grid.size
+    totals[source] = 0
+    open_set = [(0, source)]
+    while open_set:
+        total, cell = heappop(open_set)
+        if total > totals[cell]:
+            continue
+        for neighbour in grid.neighbours(cell):
+            new_total = total + grid.costs[neighbour]
+            if totals[neighbour] == -1 or new_total < totals[neighbour]:
+                totals[neighbour] = new_total
+                heappush(open_set, (new_total, neighbour))
+    return totals
+
+def weighted_maze(height:int, width:int, seed:int, top:int=9):
+    """
+        Method used to build a braided maze where every open cell costs a random amount to step onto
+
+        Parameters:
+            height - the number of rows in the maze
+            width - the number of columns in the maze
+            seed - the seed of the random numbers
+            top - the dearest cost of a cell
+
+        Returns:
+            The grid of the maze
+    """
+    rng = random.Random(seed)
+    walls = carve(height, width, seed, "kruskal", 0.5)
+    cells = "".join("#" if wall else str(rng.randint(1, top)) for wall in walls)
+    return small_maze([cells[x * width:(x + 1) * width] for x in range(height)])
+
+@pytest.mark.parametrize("heuristic", CHOICES)
+def test_costs_match_heap_oracle(heuristic):
+    for seed in range(6):
+        grid = weighted_maze(31, 41, seed, top=2 + seed)
+        totals = heap_costs(grid, grid.start)
+        path = dijkstra_search(grid, grid.start, grid.end, heuristic)[0]
+        check_path(grid, path, grid.start, grid.end)
+        cost = sum(grid.costs[cell] for cell in path[1:])
+        assert cost == totals[grid.end]
+        #the path costs many times more than the ring has buckets, so the keys wrap around the ring
+        assert cost > 10 * (max(grid.costs) + 1 + 2)
+
+@pytest.mark.parametrize("heuristic", CHOICES)
+def test_unit_costs_match_bfs(grids, heuristic):
+    #every open cell costs 1, which gives the smallest ring, wrapped around once every few keys
+    grid = grids["maze-Large.txt"]
+    cells = open_cells(grid)
+    rng = random.Random(23)
+    for _ in range(6):
+        start_cell, goal_cell = rng.choice(cells), rng.choice(cells)
+        path = dijkstra_search(grid, start_cell, goal_cell, heuristic)[0]
+        check_path(grid, path, start_cell, goal_cell)
+        assert len(path) - 1 == bfs_distances(grid, start_cell)[goal_cell]
+
+def test_unreachable_goal():
+    grid = small_maze([
+        "#.###",
+        "#2#1#",
+        "###.#",
+    ])
+    assert dijkstra_search(grid, grid.start, grid.end)[0] == []
+
+def test_bfs_matches_oracle(grids):
+    for name, length in SHORTEST_PATHS.items():
+        grid = grids[name]
+        distances = bfs_distances(grid, grid.start)
+        nodes_explored, state = bfs_explore(grid, grid.start, grid.end)
+        path = state.path_to(grid.end)
+        check_path(grid, path, grid.start, grid.end)
+        assert len(path) == length
+        #every cell labelled by the search is at its breadth first distance
+        assert all(state.g[cell] in (-1, distances[cell]) for cell in range(grid.size))
@@ -0,0 +1,93 @@
+import pytest
+from conftest import bfs_distances, open_cells
+from maze_solver.generate import (GENERATORS, braid_rows, carve, carve_rows, generate_maze, maze_to_text,
+                                  write_maze)
+from maze_solver.grid import load_maze
+
+#odd and even sizes, the even ones leave an extra wall row and column after the last rooms
+SIZES = ((3, 3), (9, 14), (20, 31), (41, 40))
+
+def open_edges(grid)->int:
+    """
+        Method used to count the pairs of neighbouring open cells
+
+        Parameters:
+            grid - the grid of the maze
+
+        Returns:
+            The number of moves between open cells, counting each pair once
+    """
+    return sum(len(grid.neighbours(cell)) for cell in open_cells(grid)) // 2
+
+def dead_ends(grid)->int:
+    """
+        Method used to count the open cells with a single open neighbour
+
+        Parameters:
+            grid - the grid of the maze
+
+        Returns:
+            The number of dead ends
+    """
+    return sum(1 for cell in open_cells(grid) if len(grid.neighbours(cell)) == 1)
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("algorithm", GENERATORS)
+def test_mazes_are_perfect_and_connected(algorithm, size):
+    height, width = size
+    for seed in range(3):
+        grid = generate_maze(height, width, seed, algorithm)
+        cells = open_cells(grid)
+        assert 0 <= grid.start < width and grid.size - width <= grid.end < grid.size
+        distances = bfs_distances(grid, grid.start)
+        #every open cell is reached and there is one edge fewer than cells, so the open cells form a tree
+        assert all(distances[cell] != -1 for cell in cells)
+        assert open_edges(grid) == len(cells) - 1
+
+@pytest.mark.parametrize("algorithm", GENERATORS)
+def test_braided_mazes(algorithm):
+    height, width = 41, 40
+    perfect = generate_maze(height, width, 5, algorithm)
+    braided = generate_maze(height, width, 5, algorithm, loops=1.0)
+    cells = open_cells(braided)
+    distances = bfs_distances(braided, braided.start)
+    assert all(distances[cell] != -1 for cell in cells)
+    assert open_edges(braided) > len(cells) - 1
+    #only the start and end are left as dead ends
+    assert dead_ends(braided) <= 2 < dead_ends(perfect)
+    #loops only open walls, so the path between the openings can only get shorter
+    assert distances[braided.end] <= bfs_distances(perfect, perfect.start)[perfect.end]
+    assert generate_maze(height, width, 5, algorithm, loops=0.0).walls == perfect.walls
+
+@pytest.mark.parametrize("loops", (0.0, 0.3, 1.0))
+@pytest.mark.parametrize("algorithm", GENERATORS)
+def test_rows_match_whole_maze(algorithm, loops):
+    for height, width in SIZES:
+        walls = carve(height, width, 11, algorithm, loops)
+        assert bytearray().join(carve_rows(height, width, 11, algorithm, loops)) == walls
+        assert carve(height, width, 11, algorithm, loops) == walls
+
+def test_braid_rows_leaves_perfect_rows():
+    walls = carve(21, 21, 2, "kruskal")
+    rows = [walls[x * 21:(x + 1) * 21] for x in range(21)]
+    assert bytearray().join(braid_rows(iter(rows), 21, 21, 0.0, 3)) == walls
+
+def test_written_maze_loads(tmp_path):
+    file_name = str(tmp_path / "maze.txt")
+    write_maze(file_name, 15, 22, 9, "eller", 0.2)
+    loaded = load_maze(file_name)
+    assert (loaded.height, loaded.width) == (15, 22)
+    assert bytes(loaded.walls) == bytes(carve(15, 22, 9, "eller", 0.2))
+    with open(file_name, "rb") as maze_file:
+        lines = maze_file.read().split(b"\n")
+    assert lines[-1] == b"" and not any(line.endswith(b" ") for line in lines)
+
+def test_text_format():
+    walls = bytearray([1, 0, 1, 1, 0, 1])
+    assert maze_to_text(3, 2, walls) == b"# - #\n# - #\n"
+
+@pytest.mark.parametrize("arguments", ({"height": 2, "width": 5}, {"height": 5, "width": 5, "loops": 1.5},
+                                       {"height": 5, "width": 5, "algorithm": "prim"}))
+def test_bad_arguments(arguments):
+    with pytest.raises(ValueError):
+        carve(**arguments)
@@ -0,0 +1,54 @@
+import random
+import pytest
+from conftest import SHORTEST_PATHS, bfs_distances, check_path, open_cells, small_maze
+from maze_solver.a_star import HEURISTICS
+from maze_solver.grid import RIGHT, DOWN
+from maze_solver.jps import expand_path, jump, jump_point_search
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_shipped_mazes_give_shortest_paths(grids, heuristic):
+    for name, length in SHORTEST_PATHS.items():
+        grid = grids[name]
+        path = jump_point_search(grid, grid.start, grid.end, heuristic)[0]
+        check_path(grid, path, grid.start, grid.end)
+        assert len(path) == length
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_random_pairs_match_oracle(grids, heuristic):
+    rng = random.Random(8)
+    for name in ("maze-Medium.txt", "maze-Large.txt"):
+        grid = grids[name]
+        cells = open_cells(grid)
+        for _ in range(8):
+            start_cell, goal_cell = rng.choice(cells), rng.choice(cells)
+            distances = bfs_distances(grid, start_cell)
+            path = jump_point_search(grid, start_cell, goal_cell, heuristic)[0]
+            check_path(grid, path, start_cell, goal_cell)
+            assert len(path) - 1 == distances[goal_cell]
+
+def test_jump_stops_at_turns_and_walls():
+    grid = small_maze([
+        "#####",
+        "#...#",
+        "###.#",
+        "#####",
+    ])
+    width = grid.width
+    #moving right along the top corridor stops where it turns down
+    assert jump(grid, width + 1, RIGHT, 1, -1) == width + 3
+    #moving down out of the corner runs into a wall with nowhere to turn
+    assert jump(grid, width + 3, DOWN, width, -1) == -1
+    #the goal always stops a jump
+    assert jump(grid, width + 1, RIGHT, 1, width + 2) == width + 2
+
+def test_expand_path_fills_rows_and_columns():
+    grid = small_maze([
+        "#####",
+        "#...#",
+        "###.#",
+        "###.#",
+        "#####",
+    ])
+    width = grid.width
+    corner = width + 3
+    assert expand_path(grid, [width + 1, corner, 3 * width + 3]) == [width + 1, width + 2, corner, 2 * width + 3, 3 * width + 3]
@@ -0,0 +1,37 @@
+import random
+from conftest import bfs_distances, open_cells, small_maze
+from maze_solver.grid import Grid
+from maze_solver.landmarks import LandmarkIndex
+
+def test_distances_match_oracle(grids):
+    grid = grids["maze-Large.txt"]
+    index = LandmarkIndex(grid)
+    assert len(index.landmarks) > 0
+    for landmark, distances, unreachable in zip(index.landmarks, index.distances, index.unreachable):
+        expected = bfs_distances(grid, landmark)
+        assert [unreachable if distance == -1 else distance for distance in expected] == list(distances)
+
+def test_estimates_never_overshoot(grids):
+    grid = grids["maze-Medium.txt"]
+    index = LandmarkIndex(grid)
+    cells = open_cells(grid)
+    rng = random.Random(14)
+    for _ in range(10):
+        goal_cell = rng.choice(cells)
+        distances = bfs_distances(grid, goal_cell)
+        for cell in rng.sample(cells, 50):
+            assert 0 <= index.estimate(cell, goal_cell) <= distances[cell]
+
+def test_seed_without_a_start():
+    rows = small_maze([
+        "#####",
+        "#..##",
+        "##..#",
+        "#####",
+    ])
+    #the walls of a cached grid are a memoryview, which has no find of its own
+    grid = Grid(rows.width, rows.height, memoryview(bytearray(rows.walls)), rows.masks)
+    assert grid.start == -1
+    index = LandmarkIndex(grid, count=2)
+    #the first landmark is the cell furthest from the first open cell
+    assert index.landmarks[0] == 2 * rows.width + 3
@@ -0,0 +1,99 @@
+import random
+import pytest
+from conftest import bfs_distances, check_path, open_cells, small_maze
+from maze_solver.a_star import HEURISTICS
+from maze_solver.multi import all_pairs_paths, multi_source_search
+
+def perfect_maze(rows:int, columns:int, seed:int):
+    """
+        Method used to carve a maze with no loops, a random spanning tree of its rooms
+
+        Parameters:
+            rows - the number of rows of rooms
+            columns - the number of columns of rooms
+            seed - the seed of the random numbers
+
+        Returns:
+            The grid of the maze, with rooms on the odd rows and columns
+    """
+    rng = random.Random(seed)
+    cells = [["#"] * (2 * columns + 1) for _ in range(2 * rows + 1)]
+    cells[1][1] = "."
+    stack = [(0, 0)]
+    while stack:
+        row, column = stack[-1]
+        moves = [(row + d_row, column + d_column) for d_row, d_column in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                 if 0 <= row + d_row < rows and 0 <= column + d_column < columns
+                 and cells[2 * (row + d_row) + 1][2 * (column + d_column) + 1] == "#"]
+        if not moves:
+            stack.pop()
+            continue
+        next_row, next_column = rng.choice(moves)
+        cells[row + next_row + 1][column + next_column + 1] = "."
+        cells[2 * next_row + 1][2 * next_column + 1] = "."
+        stack.append((next_row, next_column))
+    return small_maze(["".join(row) for row in cells])
+
+def nearest_distance(grid, sources:list, targets:list)->int:
+    """
+        Method used to find the distance between the closest source and target with the oracle
+
+        Parameters:
+            grid - the grid of the maze
+            sources - the cells the paths may start from
+            targets - the cells the paths may end at
+
+        Returns:
+            The fewest steps from any source to any target, -1 if none can be reached
+    """
+    best = -1
+    for source in sources:
+        distances = bfs_distances(grid, source)
+        for target in targets:
+            if distances[target] != -1 and (best == -1 or distances[target] < best):
+                best = distances[target]
+    return best
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_multi_source_matches_oracle(grids, heuristic):
+    rng = random.Random(17)
+    for name in ("maze-Medium.txt", "maze-Large.txt"):
+        grid = grids[name]
+        cells = open_cells(grid)
+        for _ in range(4):
+            sources = rng.sample(cells, 5)
+            targets = rng.sample(cells, 5)
+            path = multi_source_search(grid, sources, targets, heuristic)[0]
+            assert path[0] in sources and path[-1] in targets
+            check_path(grid, path, path[0], path[-1])
+            assert len(path) - 1 == nearest_distance(grid, sources, targets)
+
+def test_multi_source_without_targets(grids):
+    grid = grids["maze-Easy.txt"]
+    assert multi_source_search(grid, [grid.start], [])[0] == []
+
+@pytest.mark.parametrize("loops", (True, False))
+def test_all_pairs_match_oracle(grids, loops):
+    grid = grids["maze-Medium.txt"] if loops else perfect_maze(20, 30, 4)
+    rng = random.Random(21)
+    cells = open_cells(grid)
+    sources = rng.sample(cells, 6)
+    targets = rng.sample(cells, 4)
+    paths, _, searches = all_pairs_paths(grid, sources, targets)
+    assert set(paths) == {(source, target) for source in sources for target in targets}
+    for source in sources:
+        distances = bfs_distances(grid, source)
+        for target in targets:
+            check_path(grid, paths[(source, target)], source, target)
+            assert len(paths[(source, target)]) - 1 == distances[target]
+    #a maze with no loops needs one search, a maze with loops one for every cell on the smaller side
+    assert searches == (len(targets) if loops else 1)
+
+def test_all_pairs_search_limit(grids):
+    grid = grids["maze-Medium.txt"]
+    cells = open_cells(grid)
+    sources = cells[:4]
+    targets = cells[-4:]
+    with pytest.raises(ValueError):
+        all_pairs_paths(grid, sources, targets, max_searches=3)
+    assert all_pairs_paths(grid, sources, targets, max_searches=None)[2] == 4
@@ -0,0 +1,46 @@
+import pytest
+from conftest import SHORTEST_PATHS, bfs_distances, maze_path
+from maze_solver.a_star import A_star_explore
+from maze_solver.bfs import bfs_explore
+from maze_solver.dfs import dfs_explore
+from maze_solver.grid import load_maze
+from maze_solver.solver import solve
+
+pytest.importorskip("numba")
+from maze_solver.native import NATIVE_HEURISTICS, A_star_explore_native, bfs_explore_native, dfs_explore_native
+
+#each search in Python with its compiled kernel, the heuristic is None for the searches without one
+SEARCHES = [(dfs_explore, dfs_explore_native, None), (bfs_explore, bfs_explore_native, None)]
+SEARCHES += [(A_star_explore, A_star_explore_native, heuristic) for heuristic in NATIVE_HEURISTICS]
+
+@pytest.fixture(scope="module")
+def shipped(grids)->dict:
+    """
+        Method used to add the very large maze, which only the compiled kernels are checked on, to the shipped grids
+
+        Parameters:
+            grids - the grids of the shipped mazes small enough for every algorithm
+
+        Returns:
+            A dictionary linking the file name of every shipped maze to its grid
+    """
+    return dict(grids, **{"maze-VLarge.txt": load_maze(maze_path("maze-VLarge.txt"))})
+
+@pytest.mark.parametrize("name", list(SHORTEST_PATHS) + ["maze-VLarge.txt"])
+@pytest.mark.parametrize("python_search, native_search, heuristic", SEARCHES)
+def test_kernels_match_python(shipped, name, python_search, native_search, heuristic):
+    grid = shipped[name]
+    arguments = (grid, grid.start, grid.end) + ((heuristic,) if heuristic else ())
+    python_explored, python_state = python_search(*arguments)
+    native_explored, native_state = native_search(*arguments)
+    assert native_explored == python_explored
+    assert native_state.parent == python_state.parent
+    assert native_state.visited == python_state.visited
+    assert native_state.path_to(grid.end) == python_state.path_to(grid.end)
+
+@pytest.mark.parametrize("heuristic", NATIVE_HEURISTICS)
+def test_native_solves_match_oracle(grids, heuristic):
+    for name, length in SHORTEST_PATHS.items():
+        grid = grids[name]
+        assert len(solve(grid, heuristic=heuristic, native=True).path) == length
+        assert bfs_distances(grid, grid.start)[grid.end] + 1 == length
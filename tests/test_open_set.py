@@ -0,0 +1,60 @@
+import random
+import pytest
+from maze_solver.a_star import A_star_explore
+from maze_solver.open_set import BucketOpenSet, HeapOpenSet
+
+OPEN_SETS = (HeapOpenSet, BucketOpenSet)
+
+@pytest.mark.parametrize("kind", OPEN_SETS)
+def test_pops_in_key_order(kind):
+    rng = random.Random(24)
+    size = 200
+    open_set = kind(size)
+    #the live key of every cell in the open set, checked against a plain dictionary
+    expected = {}
+    closed = set()
+    low = 0
+    for _ in range(3000):
+        if expected and rng.random() < 0.4:
+            smallest = min((f, h, cell) for cell, (f, h) in expected.items())
+            assert open_set.pop() == smallest[2]
+            del expected[smallest[2]]
+            closed.add(smallest[2])
+            low = smallest[0]
+            continue
+        cell = rng.randrange(size)
+        #as in A*, a popped cell is never pushed again, its h never changes and no key is below the last one popped
+        if cell in closed:
+            continue
+        f = low + rng.randrange(6)
+        h = cell % 4
+        lowered = cell not in expected or f < expected[cell][0]
+        assert open_set.push(cell, f, h) == lowered
+        if lowered:
+            expected[cell] = (f, h)
+        assert open_set.contains(cell) and open_set.key(cell) == expected[cell][0]
+        assert len(open_set) == len(expected)
+    while expected:
+        smallest = min((f, h, cell) for cell, (f, h) in expected.items())
+        assert open_set.pop() == smallest[2]
+        del expected[smallest[2]]
+    assert open_set.pop() == -1 and len(open_set) == 0
+
+@pytest.mark.parametrize("kind", OPEN_SETS)
+def test_clear(kind):
+    open_set = kind(10)
+    for cell in range(5):
+        open_set.push(cell, 10 - cell, 0)
+    open_set.clear()
+    assert len(open_set) == 0 and not open_set.contains(3) and open_set.pop() == -1
+    open_set.push(7, 2, 1)
+    assert open_set.pop() == 7
+
+def test_bucket_queue_explores_like_the_heap(grids):
+    for name in ("maze-Medium.txt", "maze-Large.txt"):
+        grid = grids[name]
+        heap_explored, heap_state = A_star_explore(grid, grid.start, grid.end, "manhattan")
+        bucket_explored, bucket_state = A_star_explore(grid, grid.start, grid.end, "manhattan",
+                                                       open_set=BucketOpenSet(grid.size))
+        assert bucket_explored == heap_explored
+        assert bucket_state.path_to(grid.end) == heap_state.path_to(grid.end)
@@ -0,0 +1,44 @@
+import pytest
+from conftest import SHORTEST_PATHS, maze_path
+from maze_solver.packed import load_packed
+from maze_solver.solver import ALGORITHMS, solve
+
+@pytest.mark.parametrize("name", SHORTEST_PATHS)
+def test_packed_grid_matches(grids, name):
+    grid = grids[name]
+    packed = load_packed(maze_path(name))
+    assert (packed.width, packed.height, packed.start, packed.end) == (grid.width, grid.height, grid.start, grid.end)
+    assert bytes(packed.walls) == bytes(grid.walls)
+    assert all(packed.masks[cell] == grid.masks[cell] for cell in range(grid.size))
+    walls = bytes(grid.walls)
+    for value in (0, 1):
+        for start, end in ((0, grid.size), (3, grid.width + 5), (grid.size - 9, grid.size)):
+            assert packed.walls.find(value, start, end) == walls.find(value, start, end)
+            assert packed.walls.rfind(value, start, end) == walls.rfind(value, start, end)
+
+@pytest.mark.parametrize("algorithm", [algorithm for algorithm in ALGORITHMS if algorithm != "contracted"])
+def test_packed_solves_match(grids, algorithm):
+    name = "maze-Medium.txt"
+    packed = solve(load_packed(maze_path(name)), algorithm=algorithm)
+    plain = solve(grids[name], algorithm=algorithm, native=False)
+    assert packed.path == plain.path
+    assert packed.nodes_explored == plain.nodes_explored
+
+def test_packed_file(tmp_path, grids):
+    name = "maze-Easy.txt"
+    packed = load_packed(maze_path(name), str(tmp_path / "maze.bits"))
+    try:
+        assert bytes(packed.walls) == bytes(grids[name].walls)
+        with pytest.raises(ValueError):
+            packed.set_wall(packed.start, True)
+    finally:
+        packed.close()
+
+def test_packed_set_wall(grids):
+    packed = load_packed(maze_path("maze-Easy.txt"))
+    start = packed.start
+    packed.set_wall(start, True)
+    assert packed.walls[start] and packed.start != start
+    packed.set_wall(start, False)
+    assert packed.start == start
+    assert bytes(packed.walls) == bytes(grids["maze-Easy.txt"].walls)
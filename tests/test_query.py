@@ -0,0 +1,72 @@
+import random
+import pytest
+from conftest import bfs_distances, check_path, maze_path, open_cells
+from maze_solver.a_star import A_star_search
+from maze_solver.dfs import dfs_search
+from maze_solver.query import MazeQueries
+
+def random_queries(grid, count:int, seed:int)->list:
+    """
+        Method used to pick random pairs of open cells
+
+        Parameters:
+            grid - the grid of the maze
+            count - the number of pairs
+            seed - the seed of the random numbers
+
+        Returns:
+            The list of start and goal cell pairs
+    """
+    rng = random.Random(seed)
+    cells = open_cells(grid)
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+
+def test_astar_queries_match_oracle_and_search(grids):
+    grid = grids["maze-Large.txt"]
+    queries = MazeQueries(grid)
+    pairs = random_queries(grid, 20, 13)
+    for (start_cell, goal_cell), (path, nodes_explored) in zip(pairs, queries.query_many(pairs)):
+        check_path(grid, path, start_cell, goal_cell)
+        assert len(path) - 1 == bfs_distances(grid, start_cell)[goal_cell]
+        expected_path, expected_explored = A_star_search(grid, start_cell, goal_cell, "manhattan")[:2]
+        assert (path, nodes_explored) == (expected_path, expected_explored)
+    assert queries.queries == 20
+
+def test_dfs_queries_reuse_state(grids):
+    grid = grids["maze-Medium.txt"]
+    queries = MazeQueries(grid, algorithm="dfs")
+    state = queries.state
+    for start_cell, goal_cell in random_queries(grid, 20, 17):
+        path, nodes_explored = queries.query(start_cell, goal_cell)
+        check_path(grid, path, start_cell, goal_cell)
+        assert (path, nodes_explored) == dfs_search(grid, start_cell, goal_cell)[:2]
+    assert queries.state is state and state.generation == 20
+
+def test_generation_wrap(grids):
+    grid = grids["maze-Medium.txt"]
+    queries = MazeQueries(grid)
+    pairs = random_queries(grid, 6, 19)
+    expected = queries.query_many(pairs)
+    #the next searches run up to the last generation and then clear the stamps
+    state = queries.state
+    state.generation = state.MAX_GENERATION - 3
+    state.base = (state.generation - 1) * grid.size
+    assert queries.query_many(pairs) == expected
+    assert state.generation == 3
+
+def test_points(grids):
+    grid = grids["maze-Easy.txt"]
+    queries = MazeQueries(maze_path("maze-Easy.txt"))
+    default = queries.query()[0]
+    assert default[0] == grid.start and default[-1] == grid.end
+    start = divmod(grid.start, grid.width)
+    end = divmod(grid.end, grid.width)
+    assert queries.query(start, end)[0] == default
+    with pytest.raises(ValueError):
+        queries.query((0, 0), end)
+    with pytest.raises(ValueError):
+        queries.query((grid.height, 0), end)
+
+def test_unknown_algorithm_is_rejected(grids):
+    with pytest.raises(ValueError):
+        MazeQueries(grids["maze-Easy.txt"], algorithm="jps")
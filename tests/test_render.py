@@ -0,0 +1,135 @@
+import re
+import struct
+import zlib
+import pytest
+from maze_solver.a_star import A_star_search
+from maze_solver.render import (PALETTE, RESET, cell_classes, format_path, render_maze, render_text, write_image,
+                                write_path_file)
+
+#a colour code, a cell character or the end of a row
+TOKENS = re.compile("\033\\[[0-9;]*m|[^ \n]|\n")
+
+def coloured_cells(text:str)->list:
+    """
+        Method used to find the colour every cell of a drawn maze is shown in
+
+        Parameters:
+            text - the drawn maze, with or without colour codes
+
+        Returns:
+            The list of (colour code, character) pairs of the cells in order, with an empty code for uncoloured cells
+    """
+    cells = []
+    colour = ""
+    for token in TOKENS.findall(text):
+        if token.startswith("\033"):
+            colour = "" if token == RESET else token
+        elif token != "\n":
+            cells.append((colour, token))
+    return cells
+
+@pytest.fixture(scope="module")
+def solved(grids):
+    grid = grids["maze-Medium.txt"]
+    path, _, state = A_star_search(grid, grid.start, grid.end, "manhattan")
+    return grid, path, state.visited
+
+def test_text_matches_display_matrix(solved):
+    grid, path, visited = solved
+    matrix = render_maze(grid, path, visited)
+    expected = "".join(" ".join(row) + "\n" for row in matrix)
+    text = render_text(grid, path, visited)
+    assert coloured_cells(text) == coloured_cells(expected)
+    #rows never end inside a run of colour
+    assert all(line.endswith(("-", "#", "S", "E", "P", RESET)) for line in text.splitlines())
+
+def test_text_without_colour(solved):
+    grid, path, visited = solved
+    text = render_text(grid, path, visited, colour=False)
+    assert "\033" not in text
+    coloured = render_text(grid, path, visited)
+    assert [char for _, char in coloured_cells(coloured)] == [char for _, char in coloured_cells(text)]
+    assert len(text.splitlines()) == grid.height
+
+def test_unsolved_maze_keeps_start_and_end(grids):
+    grid = grids["maze-Easy.txt"]
+    text = render_text(grid, [], bytearray(grid.size))
+    assert text == "".join(" ".join(row) + "\n" for row in grid.display_matrix())
+
+def test_path_file(tmp_path, solved):
+    grid, path, _ = solved
+    path_file = tmp_path / "path.txt"
+    write_path_file(str(path_file), grid, path)
+    lines = path_file.read_text().splitlines()
+    assert [tuple(map(int, line.split())) for line in lines] == [divmod(cell, grid.width) for cell in path]
+    first, second = divmod(path[0], grid.width), divmod(path[1], grid.width)
+    assert format_path(grid, path[:2]) == "Node (%d, %d)->Node (%d, %d)" %(first + second)
+
+def read_png(file_name:str)->tuple:
+    """
+        Method used to read back the size and palette indices of a PNG written by write_png
+
+        Parameters:
+            file_name - the name of the image file
+
+        Returns:
+            width - the width of the image
+            height - the height of the image
+            rows - the list of rows of palette indices
+    """
+    with open(file_name, "rb") as image_file:
+        data = image_file.read()
+    assert data.startswith(b"\x89PNG\r\n\x1a\n")
+    offset = 8
+    chunks = {}
+    while offset < len(data):
+        (length,) = struct.unpack_from(">I", data, offset)
+        tag = data[offset + 4:offset + 8]
+        chunk = data[offset + 8:offset + 8 + length]
+        assert struct.unpack_from(">I", data, offset + 8 + length)[0] == zlib.crc32(tag + chunk)
+        chunks[tag] = chunk
+        offset += 12 + length
+    width, height = struct.unpack_from(">II", chunks[b"IHDR"])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    rows = [raw[row * (width + 1) + 1:(row + 1) * (width + 1)] for row in range(height)]
+    return width, height, rows
+
+def write_image_file(image_path, grid, path:list, visited:bytearray, scale:int)->str:
+    """
+        Method used to write an image and give back its file name
+
+        Parameters:
+            image_path - the path of the image file
+            grid - the grid of the maze
+            path - the list of cells in the path
+            visited - holds 1 for every cell visited by the search
+            scale - the number of pixels along each side of a cell
+
+        Returns:
+            The name of the image file
+    """
+    write_image(str(image_path), grid, path, visited, scale)
+    return str(image_path)
+
+@pytest.mark.parametrize("scale", (1, 3))
+def test_images(tmp_path, solved, scale):
+    grid, path, visited = solved
+    classes = cell_classes(grid, path, visited)
+    width, height, rows = read_png(write_image_file(tmp_path / "maze.png", grid, path, visited, scale))
+    assert (width, height) == (grid.width * scale, grid.height * scale)
+    for row, pixels in enumerate(rows):
+        cells = classes[(row // scale) * grid.width:(row // scale + 1) * grid.width]
+        assert pixels == bytes(cell for cell in cells for _ in range(scale))
+
+    with open(write_image_file(tmp_path / "maze.ppm", grid, path, visited, scale), "rb") as image_file:
+        data = image_file.read()
+    header = b"P6\n%d %d\n255\n" %(width, height)
+    assert data.startswith(header)
+    pixels = data[len(header):]
+    assert len(pixels) == 3 * width * height
+    assert tuple(pixels[:3]) == PALETTE[classes[0]]
+
+def test_unknown_image_format(tmp_path, solved):
+    grid, path, visited = solved
+    with pytest.raises(ValueError):
+        write_image(str(tmp_path / "maze.gif"), grid, path, visited)
@@ -0,0 +1,34 @@
+import random
+import pytest
+from conftest import bfs_distances, check_path
+from maze_solver.a_star import A_star_search
+from maze_solver.grid import Grid
+from maze_solver.replan import DStarLite
+
+@pytest.mark.parametrize("name", ["maze-Medium.txt", "maze-Large.txt"])
+def test_repairs_match_a_star(grids, name):
+    grid = grids[name]
+    width = grid.width
+    #the planner changes its grid in place, so it gets a copy and a second copy is solved from scratch
+    planned = Grid(width, grid.height, bytearray(grid.walls))
+    reference = Grid(width, grid.height, bytearray(grid.walls))
+    planner = DStarLite(planned, planned.start, planned.end)
+    path = planner.plan()
+    assert len(path) == len(A_star_search(reference, reference.start, reference.end, "manhattan")[0])
+    rng = random.Random(7)
+    for _ in range(25):
+        if len(path) > 4:
+            planner.move_to(path[rng.randint(1, 3)])
+        cells = {rng.randrange(width + 1, grid.size - width - 1) for _ in range(rng.randint(1, 3))}
+        #closing a cell on the path forces a detour
+        if len(path) > 8:
+            cells.add(path[rng.randint(5, len(path) - 2)])
+        cells = [cell for cell in cells if 0 < cell % width < width - 1 and cell not in (planner.start, planner.goal)]
+        for cell in cells:
+            reference.set_wall(cell, not reference.walls[cell])
+        path = planner.update_cells(cells)
+        solved = A_star_search(reference, planner.start, planner.goal, "manhattan")[0]
+        assert len(path) == len(solved) == bfs_distances(reference, planner.start)[planner.goal] + 1
+        if path:
+            check_path(reference, path, planner.start, planner.goal)
+        assert bytes(planned.walls) == bytes(reference.walls)
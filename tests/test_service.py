@@ -0,0 +1,81 @@
+import asyncio
+import json
+from conftest import SHORTEST_PATHS, maze_path, open_cells
+from maze_solver.service import SolveService
+
+async def send(port:int, requests:list)->list:
+    """
+        Method used to send requests over one connection and read a response for each
+
+        Parameters:
+            port - the port of the service on this machine
+            requests - the requests to send
+
+        Returns:
+            The responses in the order they arrived
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"".join(json.dumps(request).encode("utf-8") + b"\n" for request in requests))
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in requests]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+async def with_service(test, max_pending:int=64):
+    """
+        Method used to run a test against a service listening on a free port
+
+        Parameters:
+            test - a coroutine function taking the service and its port
+            max_pending - the largest number of solves waiting or running at once
+
+        Returns:
+            The result of the test
+    """
+    service = SolveService(workers=1, max_pending=max_pending)
+    server = await service.start("127.0.0.1", 0)
+    try:
+        return await test(service, server.sockets[0].getsockname()[1])
+    finally:
+        server.close()
+        await asyncio.gather(*service.connections, return_exceptions=True)
+        await server.wait_closed()
+        service.close()
+
+def test_solves_are_cached():
+    async def test(service, port):
+        request = {"maze": maze_path("maze-Medium.txt"), "algorithm": "bidirectional-bfs"}
+        return await send(port, [request]), await send(port, [request])
+
+    (first,), (second,) = asyncio.run(with_service(test))
+    assert first["ok"] and not first["cached"]
+    assert second["ok"] and second["cached"]
+    assert len(first["path"]) == len(second["path"]) == SHORTEST_PATHS["maze-Medium.txt"]
+
+def test_requests_past_max_pending_are_busy(grids):
+    max_pending = 3
+    extra = 4
+    grid = grids["maze-Easy.txt"]
+    text = open(maze_path("maze-Easy.txt")).read()
+    cells = open_cells(grid)
+    #every request has its own goal, so no two of them share a solve
+    requests = [{"id": number, "maze_text": text, "goal": list(grid.coords(cell))}
+                for number, cell in enumerate(cells[:max_pending + extra])]
+
+    async def test(service, port):
+        #no worker slot is free until every request has been checked against the limit
+        service.slots = asyncio.Semaphore(0)
+        answers = asyncio.ensure_future(asyncio.gather(*(send(port, [request]) for request in requests)))
+        while service.rejected + service.pending < len(requests):
+            await asyncio.sleep(0.01)
+        pending = service.pending
+        for _ in range(service.workers):
+            service.slots.release()
+        return pending, [response for responses in await answers for response in responses]
+
+    pending, responses = asyncio.run(with_service(test, max_pending))
+    assert pending == max_pending
+    busy = [response for response in responses if response.get("error") == "busy"]
+    assert len(busy) == extra
+    assert sum(1 for response in responses if response["ok"]) == max_pending
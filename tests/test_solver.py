@@ -0,0 +1,73 @@
+import random
+import pytest
+from conftest import SHORTEST_PATHS, bfs_distances, check_path, maze_path, open_cells
+from maze_solver.a_star import HEURISTICS, A_star_search
+from maze_solver.grid import load_maze
+from maze_solver.solver import ALGORITHMS, solve
+
+#dfs finds a path but not the shortest one, these are the lengths it gives on the shipped mazes
+DFS_PATHS = {"maze-Easy.txt": 27, "maze-Medium.txt": 509, "maze-Large.txt": 1120}
+
+@pytest.mark.parametrize("name", SHORTEST_PATHS)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_shortest_path_lengths(grids, name, algorithm):
+    grid = grids[name]
+    #the Python searches are checked here, the compiled kernels are checked against them in test_native
+    result = solve(grid, algorithm=algorithm, native=False)
+    check_path(grid, result.path, grid.start, grid.end)
+    expected = DFS_PATHS[name] if algorithm == "dfs" else SHORTEST_PATHS[name]
+    assert len(result.path) == expected
+
+def test_oracle_agrees_with_shipped_lengths(grids):
+    for name, length in SHORTEST_PATHS.items():
+        grid = grids[name]
+        assert bfs_distances(grid, grid.start)[grid.end] + 1 == length
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_heuristics_give_shortest_paths(grids, heuristic):
+    for name, length in SHORTEST_PATHS.items():
+        assert len(solve(grids[name], algorithm="astar", heuristic=heuristic, native=False).path) == length
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_a_star_between_cells_matches_oracle(grids, heuristic):
+    grid = grids["maze-Medium.txt"]
+    cells = open_cells(grid)
+    rng = random.Random(3)
+    for _ in range(10):
+        start_cell, goal_cell = rng.choice(cells), rng.choice(cells)
+        distances = bfs_distances(grid, start_cell)
+        path = A_star_search(grid, start_cell, goal_cell, heuristic)[0]
+        check_path(grid, path, start_cell, goal_cell)
+        assert len(path) - 1 == distances[goal_cell]
+
+def test_solve_from_file():
+    result = solve(maze_path("maze-Easy.txt"))
+    assert len(result.path) == SHORTEST_PATHS["maze-Easy.txt"]
+    assert result.timings["parse"] >= 0
+
+def test_unknown_algorithm_is_rejected(grids):
+    with pytest.raises(ValueError):
+        solve(grids["maze-Easy.txt"], algorithm="greedy")
+
+def test_points_match_oracle(grids):
+    grid = grids["maze-Medium.txt"]
+    cells = open_cells(grid)
+    rng = random.Random(20)
+    for _ in range(4):
+        start_cell, goal_cell = rng.choice(cells), rng.choice(cells)
+        distance = bfs_distances(grid, start_cell)[goal_cell]
+        for algorithm in ALGORITHMS:
+            result = solve(grid, algorithm=algorithm, start=grid.coords(start_cell), goal=grid.coords(goal_cell))
+            check_path(grid, result.path, start_cell, goal_cell)
+            if algorithm != "dfs":
+                assert len(result.path) - 1 == distance
+
+def test_points_from_file():
+    grid = load_maze(maze_path("maze-Easy.txt"))
+    result = solve(maze_path("maze-Easy.txt"), start=grid.coords(grid.end), goal=grid.coords(grid.start))
+    assert result.path[0] == grid.end and len(result.path) == SHORTEST_PATHS["maze-Easy.txt"]
+
+def test_wall_point_is_rejected(grids):
+    grid = grids["maze-Easy.txt"]
+    with pytest.raises(ValueError):
+        solve(grid, start=(0, 0))